@@ -0,0 +1,143 @@
+from typing import List, Any
+
+import numpy
+
+from memory import wrap
+from bytecode import Bytecode, OP_LOOP, OP_MOVE, OP_ADD, OP_STORE, OP_XYSELECT, OP_AYSELECT, OP_BYSELECT, OP_RIGHT, OP_LEFT, OP_UP, OP_DOWN, OP_BA, OP_AB, OP_START, OP_SELECT, OP_ZL, OP_LB, OP_RB, OP_AX, OP_XA, OP_XB, OP_XY, OP_AY, OP_BY, OP_YA, OP_YB, OP_YX, OP_BX
+
+#This dictionary contains the NumPy comparison of every conditional (super)instruction.
+comparisonDict = {
+	OP_XY : numpy.equal,
+	OP_AY : numpy.greater,
+	OP_BY : numpy.less,
+	OP_XYSELECT : numpy.equal,
+	OP_AYSELECT : numpy.greater,
+	OP_BYSELECT : numpy.less,
+	OP_LOOP : numpy.equal
+}
+
+class BatchResult:
+	"""This class contains the results of running a program for a batch of inputs, every input is called a lane.
+	- outputs: For every lane a list of the values printed by `RB`.
+	- values: For every lane the value the memory pointer points to at `BX`, the same value the compiled code returns in R0.
+	- memory: The memory of every lane when it reached `BX`, one row per lane.
+	- memory_pointers: The memory pointer of every lane when it reached `BX`.
+	"""
+	def __init__(self, outputs : List[List[int]], values : Any, memory : Any, memory_pointers : Any):
+		self.outputs = outputs
+		self.values = values
+		self.memory = memory
+		self.memory_pointers = memory_pointers
+
+	def __str__(self):
+		return "BatchResult({outputs},\n{values})".format(
+			outputs = self.outputs,
+			values = self.values.tolist()
+		)
+
+class BatchEngine:
+	"""The BatchEngine class executes one Bytecode program for many inputs at the same time.
+	The memory of every lane is a row in one 2-D NumPy array and all lanes that are at the same instruction execute it together.
+	Every step the lanes at the lowest instruction pointer are selected with a mask, lanes that took a different branch at `XY`, `AY` or `BY` wait until the others catch up.
+	Lanes that have reached `BX` get a instruction pointer past the end of the program so they are never selected again.
+	"""
+	def __init__(self, bytecode : Bytecode, memory_size : int = 128, cell_width : int = 32):
+		self.bytecode = bytecode
+		self.memory_size = memory_size
+		self.cell_width = cell_width
+
+	def run(self, inputs : Any) -> BatchResult:
+		"""This function runs the program for every row of the input matrix.
+		Counted loops are executed iteration by iteration here, all lanes in a loop still share every step.
+
+		Args:
+			inputs (Any): A N x 2 matrix, a list of lists or NumPy array, every row contains the input of one lane.
+
+		Returns:
+			BatchResult: The outputs and final values of every lane.
+		"""
+		half = 1 << (self.cell_width - 1)
+		dtype = "int"+str(self.cell_width)
+		inputs = ((numpy.asarray(inputs, dtype = numpy.int64).reshape(len(inputs), -1) + half) & ((1 << self.cell_width) - 1)) - half
+		inputs = inputs.astype(dtype)
+		lane_count = len(inputs)
+		finished = len(self.bytecode)
+		opcodes = self.bytecode.opcodes
+		operands_a = self.bytecode.operands_a
+		operands_b = self.bytecode.operands_b
+		jumps = self.bytecode.jumps
+		memory = numpy.zeros((lane_count, self.memory_size), dtype = dtype)
+		ips = numpy.zeros(lane_count, dtype = numpy.int64)
+		mps = numpy.ones(lane_count, dtype = numpy.int64)
+		stack = numpy.zeros((lane_count, 16), dtype = numpy.int64)
+		depths = numpy.zeros(lane_count, dtype = numpy.int64)
+		values = numpy.zeros(lane_count, dtype = dtype)
+		printed = []
+		while lane_count:
+			ip = int(ips.min())
+			if ip == finished:
+				break
+			lanes = numpy.flatnonzero(ips == ip)
+			opcode = opcodes[ip]
+			a = operands_a[ip]
+			b = operands_b[ip]
+			jump = jumps[ip]
+			if opcode in comparisonDict:
+				condition = comparisonDict[opcode](memory[lanes, a], memory[lanes, b])
+				if opcode in (OP_XY, OP_AY, OP_BY):
+					ips[lanes] = numpy.where(condition, ip + 1, jump)
+				else:
+					ips[lanes] = numpy.where(condition, jump, ip + 2)
+				continue
+			ips[lanes] = jump
+			if opcode in (OP_SELECT, OP_BA):
+				pass
+			elif opcode == OP_UP:
+				memory[lanes, mps[lanes]] += 1
+			elif opcode == OP_DOWN:
+				memory[lanes, mps[lanes]] -= 1
+			elif opcode == OP_ADD:
+				memory[lanes, mps[lanes]] += wrap(a, self.cell_width)
+			elif opcode == OP_YB:
+				memory[lanes, a] += memory[lanes, b]
+			elif opcode == OP_YX:
+				memory[lanes, a] -= memory[lanes, b]
+			elif opcode == OP_YA:
+				memory[lanes, a] *= memory[lanes, b]
+			elif opcode == OP_RIGHT:
+				mps[lanes] += 1
+			elif opcode == OP_LEFT:
+				mps[lanes] -= 1
+			elif opcode == OP_MOVE:
+				mps[lanes] += a
+			elif opcode == OP_LB:
+				mps[lanes] = a
+			elif opcode == OP_STORE:
+				mps[lanes] = a
+				memory[lanes, a] = wrap(b, self.cell_width)
+			elif opcode == OP_AX:
+				memory[lanes, mps[lanes]] = wrap(a, self.cell_width)
+			elif opcode == OP_XA:
+				memory[lanes, mps[lanes]] = memory[lanes, a]
+			elif opcode == OP_XB:
+				memory[lanes, a] = memory[lanes, mps[lanes]]
+			elif opcode == OP_ZL:
+				memory[lanes, b] = inputs[lanes, a-1]
+			elif opcode == OP_START:
+				if depths[lanes].max() == stack.shape[1]:
+					stack = numpy.concatenate([stack, numpy.zeros_like(stack)], axis = 1)
+				stack[lanes, depths[lanes]] = ip + 1
+				depths[lanes] += 1
+			elif opcode == OP_AB:
+				depths[lanes] -= 1
+				ips[lanes] = stack[lanes, depths[lanes]]
+			elif opcode == OP_RB:
+				printed.append((lanes, memory[lanes, mps[lanes]]))
+			elif opcode == OP_BX:
+				values[lanes] = memory[lanes, mps[lanes]]
+				ips[lanes] = finished
+		outputs = list(map(lambda _ : [], range(lane_count)))
+		for lanes, printed_values in printed:
+			for lane, value in zip(lanes.tolist(), printed_values.tolist()):
+				outputs[lane].append(value)
+		return BatchResult(outputs, values, memory, mps)
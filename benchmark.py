@@ -0,0 +1,350 @@
+import sys, time, json, getopt, tracemalloc
+from typing import List, Tuple, Union, Dict, Callable, Any
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter, RunResult
+from compiler import Compiler
+from simulator import Simulator
+from peephole import instruction_size
+from linker import Linker
+from bytecode import Encoder
+from support import readFile, printb, cError
+
+def token_size(parsed_list : List[List[Union[str,int]]]) -> int:
+	"""Returns the amount of bytes the parsed tokens take in memory.
+	The strings of the instructions are shared between all instructions so they are not counted.
+
+	Args:
+		parsed_list (List[List[Union[str,int]]]): The parsed tokens.
+
+	Returns:
+		int: The amount of bytes of the outer list, every instruction list and every integer parameter.
+	"""
+	return sys.getsizeof(parsed_list) + sum(map(lambda instruction : sys.getsizeof(instruction) + sum(map(sys.getsizeof, instruction[1:])), parsed_list))
+
+def generate_program(repeats : int) -> List[str]:
+	"""Generates a straight line Controller Code program, the same 4 lines are repeated and the program ends with `BX`.
+
+	Args:
+		repeats (int): The amount of times the 4 lines are repeated.
+
+	Returns:
+		List[str]: The raw code, a single string for each line.
+	"""
+	return ["RIGHT", "UP", "YB 2 1", "LEFT"] * repeats + ["BX"]
+
+def generate_recursion(depth : int) -> List[str]:
+	"""Generates a program in the style of `even.coco` that calls itself depth times, function 1 decreases memory address 1 and calls itself again until it is 0.
+
+	Args:
+		depth (int): The amount of nested calls.
+
+	Returns:
+		List[str]: The raw code, a single string for each line.
+	"""
+	return ["BA 1", "XY 1 2", "SELECT 6", "DOWN", "START 1", "AB", "AX "+str(depth), "START 1", "RB", "BX"]
+
+def generate_loop(iterations : int) -> List[str]:
+	"""Generates a program in the style of `loopysum.coco` that adds every integer from iterations down to 1 to memory address 2.
+
+	Args:
+		iterations (int): The amount of iterations of the loop.
+
+	Returns:
+		List[str]: The raw code, a single string for each line.
+	"""
+	return ["RIGHT", "AX 0", "RIGHT", "AX 0", "LB 1", "AX "+str(iterations), "XY 1 3", "SELECT 12", "YB 2 1", "DOWN", "SELECT 7", "XA 2", "RB", "BX"]
+
+def generate_functions(count : int) -> List[str]:
+	"""Generates a program with count `BA` functions that each increase memory address 1, the main code calls every function once.
+
+	Args:
+		count (int): The amount of functions.
+
+	Returns:
+		List[str]: The raw code, a single string for each line.
+	"""
+	functions = sum(map(lambda identifier : ["BA "+str(identifier), "UP", "AB"], range(1, count + 1)), [])
+	return functions + list(map(lambda identifier : "START "+str(identifier), range(1, count + 1))) + ["RB", "BX"]
+
+#This dictionary contains the generator of every workload of the benchmark suite.
+#Every generator receives the size of the workload: the amount of repeated lines, the depth of the recursion, the iterations of the loop or the amount of functions.
+workloadDict = {
+	"straight" : generate_program,
+	"recursion" : generate_recursion,
+	"loop" : generate_loop,
+	"functions" : generate_functions
+}
+
+#This dictionary contains the stages whose work grows with the size of every workload, the scaling is only calculated for these stages.
+#The recursion and the loop only change the `AX` constant with the size, so the Lexer, Parser and Compiler get the same lines at every size and only the Interpreter executes more instructions.
+scaledStagesDict = {
+	"straight" : ["lexer", "parser", "interpreter", "compiler"],
+	"recursion" : ["interpreter"],
+	"loop" : ["interpreter"],
+	"functions" : ["lexer", "parser", "interpreter", "compiler"]
+}
+
+#The least amount of seconds a stage is measured, a faster stage is run again and the fastest run is used.
+minimumTime = 0.2
+
+def measure(stage : Callable[[], Any]) -> Tuple[float, int, Any]:
+	"""Runs a stage of the pipeline until it took at least minimumTime seconds to measure the time of its fastest run, afterwards it runs once more with tracemalloc to measure the peak of the memory it allocates.
+	The time is measured without tracemalloc since tracing every allocation slows the stage down.
+
+	Args:
+		stage (Callable[[], Any]): The stage to run.
+
+	Returns:
+		Tuple[float, int, Any]: The time in seconds, the peak memory in bytes and the result of the stage.
+	"""
+	seconds = float("inf")
+	total = 0
+	while total < minimumTime:
+		start = time.perf_counter()
+		result = stage()
+		elapsed = time.perf_counter() - start
+		seconds = min(seconds, elapsed)
+		total += elapsed
+	tracemalloc.start()
+	try:
+		stage()
+		peak = tracemalloc.get_traced_memory()[1]
+	finally:
+		tracemalloc.stop()
+	return seconds, peak, result
+
+def benchmark_stages(raw_code : List[str]) -> Dict[str, Dict[str, Union[int, float, str]]]:
+	"""Runs every stage of the pipeline on a program: `Lexer.tokenize`, `Parser.parse`, `Interpreter.run` and `Compiler.compile`.
+	The Lexer, Parser and Compiler are measured in lines per second, the Interpreter in executed instructions per second including the time to create it.
+
+	Args:
+		raw_code (List[str]): The raw code, a single string for each line.
+
+	Returns:
+		Dict[str, Dict[str, Union[int, float, str]]]: For every stage the amount of work, its unit, the time in seconds, the throughput and the peak memory in bytes.
+	"""
+	results = {}
+	seconds, peak, tokens = measure(lambda : Lexer(raw_code).tokenize([]))
+	results["lexer"] = (len(raw_code), "lines", seconds, peak)
+	seconds, peak, parsed_list = measure(lambda : Parser(tokens).parse())
+	results["parser"] = (len(raw_code), "lines", seconds, peak)
+	seconds, peak, result = measure(lambda : Interpreter(parsed_list).run())
+	results["interpreter"] = (result.steps, "steps", seconds, peak)
+	seconds, peak, _ = measure(lambda : Compiler(parsed_list, "benchmark.asm", 64).compile())
+	results["compiler"] = (len(raw_code), "lines", seconds, peak)
+	return dict(map(lambda item : (item[0], {
+		"work" : item[1][0],
+		"unit" : item[1][1],
+		"seconds" : item[1][2],
+		"throughput" : item[1][0] / max(item[1][2], 1e-9),
+		"peak_memory" : item[1][3]
+	}), results.items()))
+
+def benchmark_suite(sizes : List[int]) -> Dict[str, Dict[str, Dict[str, Dict[str, Union[int, float, str]]]]]:
+	"""Runs every stage on every workload of the workloadDict with every size.
+
+	Args:
+		sizes (List[int]): The sizes of the workloads, every size should be larger than the one before to see how the stages scale.
+
+	Returns:
+		Dict[str, Dict[str, Dict[str, Dict[str, Union[int, float, str]]]]]: The results of benchmark_stages() for every workload and size, the sizes are strings so the results can be written as JSON.
+	"""
+	return dict(map(lambda workload : (workload, dict(map(lambda size : (str(size), benchmark_stages(workloadDict[workload](size))), sizes))), workloadDict))
+
+def scaling(results : Dict[str, Dict[str, Dict[str, Dict[str, Union[int, float, str]]]]]) -> Dict[str, Dict[str, float]]:
+	"""Calculates how the time per unit of work of every stage changes from the smallest to the largest size of every workload.
+	A stage that takes linear time has a scaling close to 1, a stage that takes quadratic time grows with the ratio between the sizes.
+	Only the stages in the scaledStagesDict are included, the other stages do the same work at every size.
+
+	Args:
+		results (Dict[str, Dict[str, Dict[str, Dict[str, Union[int, float, str]]]]]): The results of benchmark_suite().
+
+	Returns:
+		Dict[str, Dict[str, float]]: The scaling of every stage for every workload.
+	"""
+	scales = {}
+	for workload, sizes in results.items():
+		smallest, largest = sizes[min(sizes, key = int)], sizes[max(sizes, key = int)]
+		scales[workload] = dict(map(lambda stage : (stage, smallest[stage]["throughput"] / max(largest[stage]["throughput"], 1e-9)), filter(lambda stage : stage in scaledStagesDict.get(workload, smallest), smallest)))
+	return scales
+
+def compare(results : Dict[str, Dict[str, Dict[str, Dict[str, Union[int, float, str]]]]], baseline : Dict[str, Dict[str, Dict[str, Dict[str, Union[int, float, str]]]]], tolerance : float) -> List[str]:
+	"""Compares the results with a stored baseline and returns every stage that became slower or uses more memory than the tolerance allows.
+	Only the workloads, sizes and stages that are in both are compared.
+
+	Args:
+		results (Dict[str, Dict[str, Dict[str, Dict[str, Union[int, float, str]]]]]): The results of benchmark_suite().
+		baseline (Dict[str, Dict[str, Dict[str, Dict[str, Union[int, float, str]]]]]): The results of an earlier run.
+		tolerance (float): The fraction the throughput may drop and the peak memory may grow, 0.2 allows 20%.
+
+	Returns:
+		List[str]: A description of every regression.
+	"""
+	regressions = []
+	for workload, sizes in results.items():
+		for size, stages in sizes.items():
+			for stage, result in stages.items():
+				old = baseline.get(workload, {}).get(size, {}).get(stage)
+				if not old:
+					continue
+				if result["throughput"] < old["throughput"] * (1 - tolerance):
+					regressions.append("{workload} {size} {stage}: {new:.0f} {unit}/s, was {old:.0f} {unit}/s".format(workload = workload, size = size, stage = stage, new = result["throughput"], old = old["throughput"], unit = result["unit"]))
+				if result["peak_memory"] > old["peak_memory"] * (1 + tolerance):
+					regressions.append("{workload} {size} {stage}: {new} bytes peak memory, was {old} bytes".format(workload = workload, size = size, stage = stage, new = result["peak_memory"], old = old["peak_memory"]))
+	return regressions
+
+def suite_report(results : Dict[str, Dict[str, Dict[str, Dict[str, Union[int, float, str]]]]]) -> str:
+	"""Creates a readable report with the throughput and peak memory of every stage and the scaling of every workload.
+
+	Args:
+		results (Dict[str, Dict[str, Dict[str, Dict[str, Union[int, float, str]]]]]): The results of benchmark_suite().
+
+	Returns:
+		str: The report.
+	"""
+	report = "{:>10} {:>8} {:>12} {:>10} {:>14} {:>12}\n".format("workload", "size", "stage", "seconds", "throughput", "peak memory")
+	for workload, sizes in results.items():
+		for size, stages in sizes.items():
+			report += "".join(map(lambda item : "{workload:>10} {size:>8} {stage:>12} {seconds:>10.4f} {throughput:>10.0f} {unit:<7} {peak:>8}\n".format(
+				workload = workload,
+				size = size,
+				stage = item[0],
+				seconds = item[1]["seconds"],
+				throughput = item[1]["throughput"],
+				unit = item[1]["unit"]+"/s",
+				peak = item[1]["peak_memory"]
+			), stages.items()))
+	report += "\nScaling from the smallest to the largest size of the stages that do more work for a larger size, close to 1 is linear:\n"
+	report += "".join(map(lambda item : "{workload:>10} {stages}\n".format(workload = item[0], stages = "  ".join(map(lambda stage : "{}: {:.2f}".format(*stage), item[1].items()))), scaling(results).items()))
+	return report
+
+def benchmark_interpreter(code_file : str, input_list : List[int], use_bytecode : bool = True, optimize : bool = True) -> Tuple[float, RunResult]:
+	"""Runs the Interpreter once on the supplied file and measures how long it takes.
+
+	Args:
+		code_file (str): The Controller Code file to run.
+		input_list (List[int]): The input of the Controller Code.
+		use_bytecode (bool, optional): Run the Bytecode instead of the parsed tokens. Defaults to True.
+		optimize (bool, optional): Use superinstructions and execute counted loops at once. Defaults to True.
+
+	Returns:
+		Tuple[float, RunResult]: The time in seconds the execution took and the result with the printed values and the executed steps.
+	"""
+	parsed_list = Parser(Lexer(readFile(code_file)).tokenize(input_list)).parse()
+	interpreter = Interpreter(parsed_list, use_bytecode = use_bytecode, optimize = optimize)
+	start = time.perf_counter()
+	result = interpreter.run(input_list)
+	return time.perf_counter() - start, result
+
+def benchmark_loopysum(inputs : List[int]):
+	"""Benchmarks the Interpreter with `loopysum.coco`, every supplied integer is used as input for a single run with the parsed tokens, the Bytecode and the optimized Bytecode.
+	Every run reports the steps of its RunResult. The optimized Bytecode calculates the loop of `loopysum.coco` at once, its steps are the equivalent steps the iterations would have taken, so they are reported apart from the throughput of the other runs.
+	Afterwards the memory usage of the parsed tokens and the Bytecode of a large generated program is compared.
+
+	Args:
+		inputs (List[int]): The inputs to benchmark with.
+	"""
+	for n in inputs:
+		for engine, use_bytecode, optimize in [("tokens", False, False), ("bytecode", True, False), ("optimized bytecode", True, True)]:
+			seconds, result = benchmark_interpreter("loopysum.coco", [n], use_bytecode, optimize)
+			report = "{steps} equivalent steps in {seconds:.3f}s, the counted loop is calculated at once" if optimize else "{steps} steps in {seconds:.3f}s, {rate:.0f} steps/s"
+			printb(("loopysum({n}) = {output} ({engine})\n" + report).format(
+				n = n,
+				output = " ".join(map(str, result.outputs)),
+				engine = engine,
+				steps = result.steps,
+				seconds = seconds,
+				rate = result.steps / seconds
+			), "_", 40)
+	parsed_list = Parser(Lexer(generate_program(25000)).tokenize([])).parse()
+	bytecode = Encoder(parsed_list, Linker(parsed_list).link()).encode()
+	printb("{lines} lines\nparsed tokens: {tokens} bytes\nbytecode: {bytecode} bytes".format(
+		lines = len(parsed_list),
+		tokens = token_size(parsed_list),
+		bytecode = bytecode.size()
+	), "_", 40)
+
+def benchmark_compiled(inputs : List[int]):
+	"""Benchmarks the assembly code the Compiler creates of `loopysum.coco` with and without the RegisterCache, every supplied integer is used as input for a single run in the Simulator.
+	The code is compared in executed instructions, cycles on a Cortex-M3 and bytes, so the result does not depend on the machine it runs on.
+
+	Args:
+		inputs (List[int]): The inputs to benchmark with.
+	"""
+	for n in inputs:
+		parsed_list = Parser(Lexer(readFile("loopysum.coco")).tokenize([n])).parse()
+		simulations = []
+		for cache in [False, True]:
+			asm_lines = list(Compiler(parsed_list, "loopysum.asm", 64, cache = cache).lines())
+			simulation = Simulator(asm_lines).run([n])
+			simulations.append(simulation)
+			printb("loopysum({n}) = {output} ({engine})\n{instructions} instructions, {cycles} cycles, {size} bytes".format(
+				n = n,
+				output = " ".join(map(str, simulation.outputs)),
+				engine = "with RegisterCache" if cache else "without RegisterCache",
+				instructions = simulation.instructions,
+				cycles = simulation.cycles,
+				size = sum(map(instruction_size, asm_lines))
+			), "_", 40)
+		print("The RegisterCache saves {instructions:.0%} of the instructions and {cycles:.0%} of the cycles".format(
+			instructions = 1 - simulations[1].instructions / simulations[0].instructions,
+			cycles = 1 - simulations[1].cycles / simulations[0].cycles
+		))
+
+def main(argv : List[str]):
+	"""Benchmarks the Interpreter with `loopysum.coco` for every supplied integer, when no integers are supplied the inputs 10000, 100000 and 1000000 are used.
+	With the `--compiled` option the assembly code of `loopysum.coco` is run in the Simulator with and without the RegisterCache instead, see benchmark_compiled().
+	With the `--suite` option every stage of the pipeline is benchmarked with the generated workloads instead:
+	- --sizes <int,int,...>: The sizes of the workloads. Defaults to 1000,4000,16000.
+	- --json <file>: Write the results to this file, it can be used as baseline later.
+	- --baseline <file>: Compare the results with an earlier JSON file, the application exits with 1 when a stage became slower or uses more memory.
+	- --tolerance <float>: The fraction a stage may change before it counts as regression. Defaults to 0.2.
+
+	Args:
+		argv (List[str]): The command line arguments.
+	"""
+	try:
+		options, arguments = getopt.getopt(argv, "", ["suite","compiled","sizes=","json=","baseline=","tolerance="])
+	except getopt.GetoptError:
+		cError("GetoptError: The options are --suite, --compiled, --sizes, --json, --baseline and --tolerance.").throw()
+	suite = False
+	compiled = False
+	sizes = [1000, 4000, 16000]
+	json_file = None
+	baseline_file = None
+	tolerance = 0.2
+	for option, arg in options:
+		if option in ("--suite"):
+			suite = True
+		elif option in ("--compiled"):
+			compiled = True
+		elif option in ("--sizes"):
+			sizes = list(map(int, arg.split(",")))
+		elif option in ("--json"):
+			json_file = arg
+		elif option in ("--baseline"):
+			baseline_file = arg
+		elif option in ("--tolerance"):
+			tolerance = float(arg)
+	if compiled:
+		benchmark_compiled(list(map(int, arguments)) if arguments else [10, 1000, 100000])
+		return
+	if not suite:
+		benchmark_loopysum(list(map(int, arguments)) if arguments else [10000, 100000, 1000000])
+		return
+	results = benchmark_suite(sizes)
+	print(suite_report(results))
+	if json_file:
+		with open(json_file, "w") as file:
+			json.dump(results, file, indent = 4)
+	if baseline_file:
+		with open(baseline_file) as file:
+			regressions = compare(results, json.load(file), tolerance)
+		print("\n".join(regressions) if regressions else "No regressions compared to "+baseline_file)
+		if regressions:
+			exit(1)
+
+if __name__ == "__main__":
+	main(sys.argv[1:])
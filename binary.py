@@ -0,0 +1,178 @@
+import sys, zlib, struct
+from itertools import chain
+from mmap import mmap, ACCESS_READ
+from array import array
+from collections.abc import Mapping
+from typing import Union, Dict, Tuple, Iterable, Iterator, Any
+
+from lexer import Lexer
+from linker import LinkTable
+from loops import CountedLoop
+from bytecode import Bytecode, opcodeDict, opcodeNames, limit_operand
+from support import cError
+
+#Every `.cocob` file starts with these bytes.
+binaryMagic = b"COCOB"
+
+#The version of the format, a file of another version is not loaded.
+binaryVersion = 3
+
+#The header of a `.cocob` file: the magic bytes, the byte order of the integers, the version, the amount of instructions, functions, counted loops and instructions in the bodies of the loops, the amount of inputs the program needs and the checksum of everything after the header.
+headerStruct = struct.Struct("<5scHIIIIII")
+
+#This dictionary contains the byte that is stored for the byte order of the machine that wrote the file.
+byteOrderDict = {
+	"little" : b"l",
+	"big" : b"b"
+}
+
+def source_lines(raw_code : Union[Iterable[str], Any]) -> array:
+	"""Returns the line in the raw code every instruction starts on.
+	The code has already been checked, so every token that is not a integer is a instruction.
+
+	Args:
+		raw_code (Union[Iterable[str], Any]): The raw code, like a opened file.
+
+	Returns:
+		array: The line of every instruction.
+	"""
+	return array("i", map(lambda token : token.line, filter(lambda token : not isinstance(token.value, int), Lexer(raw_code).lex())))
+
+class FunctionTable(Mapping):
+	"""This class contains the functions of the LinkTable of a loaded program, the identifier of every `BA` with the instruction pointers of the `BA` and its `AB`.
+	The functions are stored as 3 integers each in the file, they are only turned into a dictionary when they are used for the first time, the Bytecode itself does not need them.
+	"""
+	def __init__(self, entries : memoryview):
+		self.entries = entries
+		self.functions : Dict[int, Tuple[int, int]] = None
+
+	def __getitem__(self, identifier : int) -> Tuple[int, int]:
+		return self.__table()[identifier]
+
+	def __iter__(self) -> Iterator[int]:
+		return iter(self.__table())
+
+	def __len__(self) -> int:
+		return len(self.entries) // 3
+
+	def __table(self) -> Dict[int, Tuple[int, int]]:
+		"""Returns the functions as dictionary, it is created the first time.
+
+		Returns:
+			Dict[int, Tuple[int, int]]: The instruction pointers of the `BA` and `AB` of every identifier.
+		"""
+		if self.functions is None:
+			entries = self.entries.tolist()
+			self.functions = dict(zip(entries[0::3], zip(entries[1::3], entries[2::3])))
+		return self.functions
+
+class BinaryProgram:
+	"""This class contains a program that was loaded from a `.cocob` file.
+	- bytecode: The Bytecode, its arrays are memoryviews of the file.
+	- link_table: The LinkTable, the jumps are the same memoryview as the jumps of the Bytecode.
+	- lines: The line in the raw code every instruction starts on, a memoryview of the file.
+	- loops: The counted loops with the index of their head as key.
+	- inputs: The amount of inputs the program needs, see Bytecode.inputs().
+	The file stays mapped in memory as long as the program is used.
+	"""
+	def __init__(self, mapped : mmap, bytecode : Bytecode, link_table : LinkTable, lines : memoryview, loops : Dict[int, CountedLoop], inputs : int):
+		self.mapped = mapped
+		self.bytecode = bytecode
+		self.link_table = link_table
+		self.lines = lines
+		self.loops = loops
+		self.inputs = inputs
+
+	def __str__(self):
+		return "BinaryProgram({bytecode},\n{functions},\n{loops})".format(
+			bytecode = self.bytecode,
+			functions = self.link_table.functions,
+			loops = self.loops
+		)
+
+class BinaryWriter:
+	"""The BinaryWriter class writes a program to a `.cocob` file, so it can be executed later without reading, lexing, checking, parsing, optimizing and linking the raw code again.
+	The file contains every part the Interpreter creates when it loads parsed tokens: the packed instructions of the Bytecode, the jumps and functions of the LinkTable and the counted loops, followed by the line in the raw code every instruction starts on.
+	Every part starts on a multiple of 4 bytes, so every part can be used straight from the file.
+	"""
+	def __init__(self, bytecode : Bytecode, link_table : LinkTable, loops : Dict[int, CountedLoop], lines : array):
+		"""The init function will ask the user to supply the parts the Interpreter created and the line of every instruction.
+
+		Args:
+			bytecode (Bytecode): The Bytecode of the Interpreter.
+			link_table (LinkTable): The LinkTable of the Interpreter.
+			loops (Dict[int, CountedLoop]): The counted loops of the Interpreter.
+			lines (array): The line of every instruction, see source_lines().
+		"""
+		self.bytecode = bytecode
+		self.link_table = link_table
+		self.loops = loops
+		self.lines = lines
+
+	def write(self, filename : str):
+		"""This function writes the header followed by every part of the program.
+		The identifiers of the functions and the memory addresses of the counted loops are limited to 32 bits like the operands of the Bytecode.
+
+		Args:
+			filename (str): The name of the `.cocob` file.
+		"""
+		functions = array("i", chain.from_iterable(map(lambda item : [limit_operand(item[0]), *item[1]], self.link_table.functions.items())))
+		loops = array("i", chain.from_iterable(map(lambda loop : [loop.head, *map(limit_operand, loop.compare), len(loop.body), loop.steps], self.loops.values())))
+		bodies = array("i", chain.from_iterable(map(lambda instruction : [opcodeDict[instruction[0]], *map(limit_operand, (instruction[1:] + [0, 0])[:2])], chain.from_iterable(map(lambda loop : loop.body, self.loops.values())))))
+		payload = b"".join([
+			self.bytecode.opcodes.tobytes() + bytes(-len(self.bytecode) % 4),
+			self.bytecode.operands_a.tobytes(),
+			self.bytecode.operands_b.tobytes(),
+			self.bytecode.jumps.tobytes(),
+			self.lines.tobytes(),
+			functions.tobytes(),
+			loops.tobytes(),
+			bodies.tobytes()
+		])
+		header = headerStruct.pack(binaryMagic, byteOrderDict[sys.byteorder], binaryVersion, len(self.bytecode), len(self.link_table.functions), len(self.loops), len(bodies) // 3, self.bytecode.inputs(), zlib.crc32(payload))
+		with open(filename, "wb") as file:
+			file.write(header)
+			file.write(payload)
+
+def load_binary(filename : str, verify : bool = True) -> BinaryProgram:
+	"""Maps a `.cocob` file in memory and creates memoryviews of its parts, the instructions are never copied.
+	Only the counted loops are turned into Python objects right away, there are only a few of them.
+
+	Args:
+		filename (str): The name of the `.cocob` file.
+		verify (bool, optional): Check the checksum, this reads the whole file once. Defaults to True.
+
+	Returns:
+		BinaryProgram: The loaded program.
+	"""
+	try:
+		with open(filename, "rb") as file:
+			mapped = mmap(file.fileno(), 0, access = ACCESS_READ)
+	except (OSError, ValueError):
+		cError("File Error: The supplied file `"+filename+"` can not be read.").throw()
+	if len(mapped) < headerStruct.size:
+		cError("File Error: The supplied file `"+filename+"` is not a `.cocob` file.").throw()
+	magic, byte_order, version, instruction_count, function_count, loop_count, body_count, inputs, checksum = headerStruct.unpack_from(mapped)
+	if magic != binaryMagic:
+		cError("File Error: The supplied file `"+filename+"` is not a `.cocob` file.").throw()
+	if version != binaryVersion or byte_order != byteOrderDict[sys.byteorder]:
+		cError("File Error: The supplied file `"+filename+"` was written by another version or on a machine with another byte order, create it again.").throw()
+	view = memoryview(mapped)
+	if verify and zlib.crc32(view[headerStruct.size:]) != checksum:
+		cError("File Error: The checksum of the supplied file `"+filename+"` does not match, the file is damaged.").throw()
+	offset = headerStruct.size
+	parts = []
+	for size, item_format in [(instruction_count + (-instruction_count % 4), "B"), (instruction_count * 4, "i"), (instruction_count * 4, "i"), (instruction_count * 4, "i"), (instruction_count * 4, "i"), (function_count * 12, "i"), (loop_count * 20, "i"), (body_count * 12, "i")]:
+		parts.append(view[offset:offset + size].cast(item_format))
+		offset += size
+	if offset != len(mapped):
+		cError("File Error: The supplied file `"+filename+"` does not have the size its header describes.").throw()
+	opcodes, operands_a, operands_b, jumps, lines, functions, loops, bodies = parts
+	counted_loops = {}
+	body = 0
+	for index in range(0, len(loops), 5):
+		head, compare_a, compare_b, length, steps = loops[index:index+5]
+		instructions = list(map(lambda entry : [opcodeNames[bodies[entry]]] + ([bodies[entry+1], bodies[entry+2]] if opcodeNames[bodies[entry]] in ["YB", "YX"] else []), range(body * 3, (body + length) * 3, 3)))
+		counted_loops[head] = CountedLoop(head, (compare_a, compare_b), instructions, steps)
+		body += length
+	return BinaryProgram(mapped, Bytecode(opcodes[:instruction_count], operands_a, operands_b, jumps), LinkTable(jumps, FunctionTable(functions)), lines, counted_loops, inputs)
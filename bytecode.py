@@ -0,0 +1,121 @@
+from array import array
+from typing import List, Union
+
+from support import syntaxParametersDict
+from linker import LinkTable
+from memory import wrap
+from optimizer import superinstructionParametersDict
+
+#Every instruction gets a integer opcode, they are numbered in the order of the syntaxParametersDict.
+OP_RIGHT, OP_LEFT, OP_UP, OP_DOWN, OP_BA, OP_AB, OP_START, OP_SELECT, OP_ZL, OP_LB, OP_RB, OP_AX, OP_XA, OP_XB, OP_XY, OP_AY, OP_BY, OP_YA, OP_YB, OP_YX, OP_BX = range(21)
+
+#The superinstructions of the Optimizer get the opcodes after them.
+OP_MOVE, OP_ADD, OP_STORE, OP_XYSELECT, OP_AYSELECT, OP_BYSELECT, OP_LOOP = range(21, 28)
+
+#This dictionary is used to find the opcode that belongs to a instruction.
+opcodeDict = dict(map(lambda instruction, opcode : (instruction, opcode), list(syntaxParametersDict) + list(superinstructionParametersDict), range(len(syntaxParametersDict) + len(superinstructionParametersDict))))
+
+#This list is used to find the instruction that belongs to a opcode.
+opcodeNames = list(opcodeDict)
+
+#The operands are stored as signed integers of 32 bits, the width of the largest memory cell.
+operandWidth = 32
+
+#This dictionary contains the operand of every instruction that is a value written to memory instead of a memory address, line, length or identifier: 1 for the first and 2 for the second operand.
+immediateOperandDict = {
+	"AX" : 1,
+	"ADD" : 1,
+	"STORE" : 2
+}
+
+def limit_operand(value : int) -> int:
+	"""Limits a memory address, line, length or identifier to the operands of 32 bits.
+	A value that does not fit is never a memory address that exists, so a instruction that uses it still fails when it is executed.
+
+	Args:
+		value (int): The operand.
+
+	Returns:
+		int: The operand, or the smallest or largest integer of 32 bits when it does not fit.
+	"""
+	return max(-(1 << (operandWidth - 1)), min(value, (1 << (operandWidth - 1)) - 1))
+
+def pack_operand(instruction : List[Union[str,int]], index : int) -> int:
+	"""Returns a operand of a instruction the way it is stored in the Bytecode, 0 when the instruction does not have it.
+	A value written to memory wraps around to 32 bits, the memory wraps it again to the width of its cells and since that is at most 32 bits the cell gets the same value as without packing. Every other operand is limited with limit_operand().
+
+	Args:
+		instruction (List[Union[str,int]]): A parsed instruction with its parameters.
+		index (int): The index of the operand in the instruction, 1 or 2.
+
+	Returns:
+		int: The operand as a integer of 32 bits.
+	"""
+	if len(instruction) <= index:
+		return 0
+	if immediateOperandDict.get(instruction[0]) == index:
+		return wrap(instruction[index], operandWidth)
+	return limit_operand(instruction[index])
+
+class Bytecode:
+	"""This class contains a Controller Code program in a packed format.
+	Every instruction is stored in 4 arrays that all have the same length:
+	- opcodes: The opcode of the instruction (1 byte).
+	- operands_a: The first parameter of the instruction or 0 (4 bytes).
+	- operands_b: The second parameter of the instruction or 0 (4 bytes).
+	- jumps: The instruction pointer the instruction jumps to, copied from the LinkTable (4 bytes).
+	"""
+	def __init__(self, opcodes : array, operands_a : array, operands_b : array, jumps : array):
+		self.opcodes = opcodes
+		self.operands_a = operands_a
+		self.operands_b = operands_b
+		self.jumps = jumps
+
+	def __len__(self):
+		return len(self.opcodes)
+
+	def __str__(self):
+		return "Bytecode({opcodes},\n{operands_a},\n{operands_b},\n{jumps})".format(
+			opcodes = self.opcodes.tolist(),
+			operands_a = self.operands_a.tolist(),
+			operands_b = self.operands_b.tolist(),
+			jumps = self.jumps.tolist()
+		)
+
+	def size(self) -> int:
+		"""Returns the amount of bytes the instructions take in memory.
+
+		Returns:
+			int: The amount of bytes of all 4 arrays combined.
+		"""
+		return sum(map(lambda values : values.itemsize * len(values), [self.opcodes, self.operands_a, self.operands_b, self.jumps]))
+
+	def inputs(self) -> int:
+		"""Returns the amount of inputs the program needs, the largest argument of its `ZL` instructions.
+
+		Returns:
+			int: The amount of inputs, 0 when the program does not contain `ZL`.
+		"""
+		return max(map(lambda index : self.operands_a[index], filter(lambda index : self.opcodes[index] == OP_ZL, range(len(self.opcodes)))), default = 0)
+
+class Encoder:
+	"""The Encoder class lowers parsed Controller Code to Bytecode.
+	"""
+	def __init__(self, parsed_tokens : List[List[Union[str,int]]], link_table : LinkTable):
+		self.tokens = parsed_tokens
+		self.link_table = link_table
+
+	def encode(self) -> Bytecode:
+		"""This function creates the Bytecode of the parsed tokens.
+		Instructions without parameters get 0 as operands, `BA` and `START` keep their identifier as first operand.
+		Every operand is packed in 32 bits with pack_operand(), so any valid program can be encoded.
+		The length of `MOVE` and `ADD` and the line of `XYSELECT`, `AYSELECT`, `BYSELECT` and `LOOP` are not stored as operands since they are already in the jumps.
+
+		Returns:
+			Bytecode: The packed program.
+		"""
+		opcodes = array("B", map(lambda instruction : opcodeDict[instruction[0]], self.tokens))
+		operands_a = array("i", map(lambda instruction : pack_operand(instruction, 1), self.tokens))
+		operands_b = array("i", map(lambda instruction : pack_operand(instruction, 2), self.tokens))
+		jumps = array("i", self.link_table.jumps)
+		return Bytecode(opcodes, operands_a, operands_b, jumps)
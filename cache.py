@@ -0,0 +1,190 @@
+import os, json, hashlib, tempfile
+from typing import List, Union, Optional
+
+from support import check_existance
+
+#These modules create the parsed tokens and the assembly code, a change in any of them changes the tool version and with it every key.
+toolModules = ["lexer.py", "validator.py", "parser.py", "support.py", "optimizer.py", "linker.py", "compiler.py", "registers.py", "peephole.py"]
+
+def tool_version() -> str:
+	"""Returns a hash of the source code of the toolModules, so cached results of an older version of the tool are never used.
+
+	Returns:
+		str: The hash as hexadecimal string.
+	"""
+	version = hashlib.sha256()
+	for module in toolModules:
+		with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), module), "rb") as file:
+			version.update(file.read())
+	return version.hexdigest()
+
+@check_existance
+def hash_file(filename : str) -> str:
+	"""Returns the hash of the contents of a file, the file is read in blocks so it is never in memory as a whole.
+
+	Note that this function is decorate to check the existance of a file.
+
+	Args:
+		filename (str): The file to hash.
+
+	Returns:
+		str: The hash as hexadecimal string.
+	"""
+	contents = hashlib.sha256()
+	with open(filename, "rb") as file:
+		for block in iter(lambda : file.read(1 << 16), b""):
+			contents.update(block)
+	return contents.hexdigest()
+
+class ArtifactCache:
+	"""The ArtifactCache class keeps the parsed tokens and the assembly code of Controller Code files in a directory, so the same file does not have to be lexed, parsed and compiled again.
+	Every result is stored under a key, the hash of the contents of the source file, the mode and its settings and the tool version, so a changed file or tool never uses an old result.
+	The directory is never larger than max_size bytes, when a new result does not fit the results that have not been used for the longest time are removed.
+	"""
+	def __init__(self, directory : str, max_size : int = 64 * 1024 * 1024):
+		"""The init function will ask the user to supply the directory of the cache, it is created when it does not exist.
+
+		Args:
+			directory (str): The directory of the cache.
+			max_size (int, optional): The largest amount of bytes the results may take together. Defaults to 64 MiB.
+		"""
+		self.directory = directory
+		self.max_size = max_size
+		self.version = tool_version()
+		os.makedirs(directory, exist_ok = True)
+
+	def __str__(self):
+		return "ArtifactCache({directory},\n{max_size})".format(
+			directory = self.directory,
+			max_size = self.max_size
+		)
+
+	def key(self, source_file : str, mode : str, *settings : Union[str, int]) -> str:
+		"""Creates the key of a result from the hash of the source file, the mode, the settings and the tool version.
+
+		Args:
+			source_file (str): The Controller Code file.
+			mode (str): The kind of result, like parse or compile.
+			settings (Union[str, int]): Everything else the result depends on, like the memory size.
+
+		Returns:
+			str: The key as hexadecimal string.
+		"""
+		return hashlib.sha256("\n".join(map(str, [self.version, hash_file(source_file), mode, *settings])).encode()).hexdigest()
+
+	def load_parsed(self, key : str) -> Optional[List[List[Union[str,int]]]]:
+		"""Returns the parsed tokens stored under a key.
+
+		Args:
+			key (str): The key.
+
+		Returns:
+			Optional[List[List[Union[str,int]]]]: The parsed tokens, None when they are not in the cache.
+		"""
+		path = self.__path(key, ".json")
+		if not self.__touch(path):
+			return None
+		with open(path) as file:
+			return json.load(file)
+
+	def store_parsed(self, key : str, parsed_tokens : List[List[Union[str,int]]]):
+		"""Stores the parsed tokens under a key.
+
+		Args:
+			key (str): The key.
+			parsed_tokens (List[List[Union[str,int]]]): The parsed tokens.
+		"""
+		self.__store(key, ".json", json.dumps(parsed_tokens, separators = (",", ":")).encode())
+
+	def load_asm(self, key : str, asm_file : str) -> bool:
+		"""Writes the assembly code stored under a key to the asm file.
+
+		Args:
+			key (str): The key.
+			asm_file (str): The file to write the assembly code to.
+
+		Returns:
+			bool: True when the assembly code was in the cache.
+		"""
+		path = self.__path(key, ".asm")
+		if not self.__touch(path):
+			return False
+		with open(path, "rb") as source, open(asm_file, "wb") as target:
+			for block in iter(lambda : source.read(1 << 16), b""):
+				target.write(block)
+		return True
+
+	def store_asm(self, key : str, asm_file : str):
+		"""Stores the assembly code of the asm file under a key.
+
+		Args:
+			key (str): The key.
+			asm_file (str): The file the Compiler wrote the assembly code to.
+		"""
+		with open(asm_file, "rb") as file:
+			self.__store(key, ".asm", file.read())
+
+	def __path(self, key : str, extension : str) -> str:
+		"""Returns the path of the file a result is stored in.
+
+		Args:
+			key (str): The key.
+			extension (str): The extension of the kind of result.
+
+		Returns:
+			str: The path.
+		"""
+		return os.path.join(self.directory, key + extension)
+
+	def __touch(self, path : str) -> bool:
+		"""Marks a result as just used, so it is the last to be removed.
+
+		Args:
+			path (str): The path of the result.
+
+		Returns:
+			bool: True when the result exists.
+		"""
+		try:
+			os.utime(path)
+			return True
+		except OSError:
+			return False
+
+	def __store(self, key : str, extension : str, data : bytes):
+		"""Writes a result to a temporary file that replaces the result at once, so another process never reads half a result, and removes the oldest results when the cache is too large.
+		A result that is larger than the whole cache is not stored.
+
+		Args:
+			key (str): The key.
+			extension (str): The extension of the kind of result.
+			data (bytes): The result.
+		"""
+		if len(data) > self.max_size:
+			return
+		self.__evict(self.max_size - len(data))
+		descriptor, temporary = tempfile.mkstemp(dir = self.directory, suffix = ".tmp")
+		with os.fdopen(descriptor, "wb") as file:
+			file.write(data)
+		os.replace(temporary, self.__path(key, extension))
+
+	def __evict(self, size : int):
+		"""Removes the results that have not been used for the longest time until the results take at most size bytes.
+
+		Args:
+			size (int): The amount of bytes the results may take.
+		"""
+		results = []
+		for entry in os.scandir(self.directory):
+			if entry.is_file() and entry.name.endswith((".json", ".asm")):
+				status = entry.stat()
+				results.append((status.st_mtime, status.st_size, entry.path))
+		total = sum(map(lambda result : result[1], results))
+		for _, result_size, path in sorted(results):
+			if total <= size:
+				break
+			try:
+				os.remove(path)
+			except OSError:
+				pass
+			total -= result_size
@@ -1,22 +1,63 @@
 import sys, getopt
+from typing import Any
 
 from lexer import Lexer
 from parser import Parser
 from interpreter import Interpreter
 from compiler import Compiler
-from support import printb, readFile, cError
+from transpiler import Transpiler
+from profiler import Profiler
+from cost import CostModel
+from simulator import Simulator
+from cache import ArtifactCache
+from binary import BinaryWriter, source_lines
+from runner import BatchRunner, read_jobs
+from sinks import OutputSink, PrintSink, TextSink, BinarySink
+from support import printb, readFile, openFile, cError, CocoError
+
+def create_sink(sink_type : str, results : Any, flush_size : int, cell_width : int) -> OutputSink:
+	"""Creates the output sink that receives every value `RB` prints.
+
+	Args:
+		sink_type (str): print, text or binary.
+		results (Any): The opened results file, None to use the standard output.
+		flush_size (int): The amount of values the text and binary sink collect before writing them.
+		cell_width (int): The width of a memory cell in bits, the size of every value the binary sink writes.
+
+	Returns:
+		OutputSink: The output sink.
+	"""
+	if sink_type == "print":
+		return PrintSink()
+	elif sink_type == "binary":
+		return BinarySink(results or sys.stdout.buffer, flush_size, cell_width)
+	return TextSink(results or sys.stdout, flush_size)
 
 def main(argv):
 	help_message = "Controller Code. cc.py\n"
-	help_message += "-h or --help | This help message\n -f or --file <code.coco> | A file with the .coco extension. Contains Controller Code\n -i or --input <int,int> | Give the Controller Code application input, maximum of 2 arguments\n -I | Use the application in Interpreter Mode (Default)\n -C | Use the application in Compiler Mode\n -v or --verbose | Print extra information\n -o or --output <coco.asm> | Used to specify the name of you compiled output file"
+	help_message += "-h or --help | This help message\n -f or --file <code.coco> | A file with the .coco extension. Contains Controller Code, or a .cocob file written with --binary to interpret\n -i or --input <int,int> | Give the Controller Code application input, maximum of 2 arguments\n -I | Use the application in Interpreter Mode (Default)\n -C | Use the application in Compiler Mode\n -T | Use the application in Transpiler Mode, the code is rewritten to Python and run by Python itself\n -v or --verbose | Print extra information\n -o or --output <coco.asm> | Used to specify the name of you compiled output file\n -w or --width <8|16|32> | The width of a memory cell in bits for the Interpreter and Transpiler, values wrap around when they overflow. Defaults to 32\n --batch <jobs.csv|jobs.jsonl> | Interpret every job in the file on all cores, a job is a input and optionally a .coco file, otherwise the -f file is used\n --workers <int> | The amount of processes used by --batch. Defaults to the amount of cores\n --unordered | Print the results of --batch as soon as they are finished instead of in the order of the jobs\n --budget <int> | The maximum amount of steps of every --batch job, a job that does not reach BX within it fails. Defaults to no maximum\n --sink <print|text|binary> | How the values printed by `RB` are written: one print per value, text written in blocks (Default) or signed integers of the cell width written in blocks\n --results <file> | Write the values printed by `RB` to this file instead of the standard output\n --flush <int> | The amount of values the text and binary sink collect before writing them. Defaults to 4096\n --profile <profile.folded> | Interpret the code while counting every line, instruction and function call, print the hot lines and write the collapsed stacks for flamegraph tools to the file\n --cost | Use the application in Compiler Mode and print the estimated size and cycles of every line, function and loop of the compiled code\n --simulate | Use the application in Compiler Mode, run the compiled code with the -i input in the Thumb Simulator, print the instructions and cycles it took and check the result against the Interpreter\n --cache <directory> | Keep the parsed code and the compiled assembly code in this directory, a unchanged file is not lexed, parsed or compiled again\n --cache-size <int> | The largest amount of megabytes the --cache directory may take, the results used the longest ago are removed first. Defaults to 64\n --binary <program.cocob> | Check, parse, optimize and link the code once and write it to a .cocob file, run it later with -f program.cocob without reading the Controller Code again"
 	code_file = "code.coco"
 	asm_file = "coco.asm"
-	app_mode = 1 # Mode 1 is Interpreter, Mode 0 is Compiler
+	app_mode = 1 # Mode 1 is Interpreter, Mode 0 is Compiler, Mode 2 is Transpiler, Mode 3 is Binary
 	verbose = False
+	cell_width = 32
 	input_list = []
+	jobs_file = None
+	workers = None
+	ordered = True
+	budget = None
+	sink_type = "text"
+	results_file = None
+	flush_size = 4096
+	profile_file = None
+	cost = False
+	simulate = False
+	cache_directory = None
+	cache_size = 64
+	binary_file = None
 	
 	try:
-		options, _ = getopt.getopt(argv, "hf:i:ICvo:", ["help","file=","input=","verbose","output="])
+		options, _ = getopt.getopt(argv, "hf:i:ICTvo:w:", ["help","file=","input=","verbose","output=","width=","batch=","workers=","unordered","budget=","sink=","results=","flush=","profile=","cost","simulate","cache=","cache-size=","binary="])
 	except getopt.GetoptError:
 		cError("GetoptError: Try cc.py -h or --help.").throw()
 	
@@ -29,8 +70,10 @@ def main(argv):
 				code_file = arg
 				if asm_file == "coco.asm":
 					asm_file = code_file.split(".")[-1] + ".asm"
+			elif arg.endswith(".cocob"):
+				code_file = arg
 			else:
-				cError("File Error: The supplied input file does not have the file extension `.coco`.").throw()
+				cError("File Error: The supplied input file does not have the file extension `.coco` or `.cocob`.").throw()
 		elif option in ("-i", "--input"):
 			try:
 				input_list = list(map(int,arg.split(',')))
@@ -42,6 +85,8 @@ def main(argv):
 		elif option in ("-C"):
 			app_mode = 0
 			input_list = [0,0]
+		elif option in ("-T"):
+			app_mode = 2
 		elif option in ("-v", "--verbose"):
 			verbose = True
 		elif option in ("-o", "--output"):
@@ -49,41 +94,160 @@ def main(argv):
 				asm_file = arg
 			else:
 				cError("File Error: The supplied output file name does not have the file extension `.asm`.").throw()
+		elif option in ("-w", "--width"):
+			if arg in ("8", "16", "32"):
+				cell_width = int(arg)
+			else:
+				cError("ValueError: The width of a memory cell can only be 8, 16 or 32 bits.").throw()
+		elif option in ("--batch"):
+			jobs_file = arg
+		elif option in ("--workers"):
+			if arg.isnumeric() and int(arg) > 0:
+				workers = int(arg)
+			else:
+				cError("ValueError: The amount of workers has to be a number greater than 0.").throw()
+		elif option in ("--unordered"):
+			ordered = False
+		elif option in ("--budget"):
+			if arg.isnumeric() and int(arg) > 0:
+				budget = int(arg)
+			else:
+				cError("ValueError: The budget has to be a number greater than 0.").throw()
+		elif option in ("--sink"):
+			if arg in ("print", "text", "binary"):
+				sink_type = arg
+			else:
+				cError("ValueError: The sink can only be print, text or binary.").throw()
+		elif option in ("--results"):
+			results_file = arg
+		elif option in ("--profile"):
+			profile_file = arg
+		elif option in ("--cost"):
+			app_mode = 0
+			input_list = [0,0]
+			cost = True
+		elif option in ("--simulate"):
+			app_mode = 0
+			simulate = True
+		elif option in ("--cache"):
+			cache_directory = arg
+		elif option in ("--cache-size"):
+			if arg.isnumeric() and int(arg) > 0:
+				cache_size = int(arg)
+			else:
+				cError("ValueError: The cache size has to be a number greater than 0.").throw()
+		elif option in ("--binary"):
+			if arg.endswith(".cocob"):
+				app_mode = 3
+				input_list = [0,0]
+				binary_file = arg
+			else:
+				cError("File Error: The supplied binary file name does not have the file extension `.cocob`.").throw()
+		elif option in ("--flush"):
+			if arg.isnumeric() and int(arg) > 0:
+				flush_size = int(arg)
+			else:
+				cError("ValueError: The flush size has to be a number greater than 0.").throw()
 	
+	if jobs_file:
+		for result in BatchRunner(read_jobs(jobs_file, code_file), cell_width, workers, ordered, budget).run():
+			print(result)
+		exit()
+
 	"""In the main function the following things happen in succession:
-	- Read a Controller Code file so we have a list of strings, the raw code, each line of code is 1 item in the list.
+	- A `.cocob` file is loaded by the Interpreter right away, all steps until the Interpreter are skipped.
+	- With the cache option the assembly code of a unchanged file is copied from the cache when compiling, otherwise the parsed code is taken from the cache and all steps until the selected mode are skipped.
+	- Open a Controller Code file, the raw code, so the Lexer can read it line by line.
 	- Supply the raw code to the Lexer which will make 1 large list of all the tokens, it will also recognize strings that are integers and cast them to integers.
 		This is also where the syntax checking takes place, if there are any problems in the syntax of the code the program will print them all and exit.
 	- Supply the lexed code, tokens list, to the Parser. The Parser wil gather instructions with their parameters. At then end there will be a list of lists with strings, instructions, and where applicable inttegers, paramters.
 	If the selected mode is Interpret:
 		- Supply the parsed code, parsed list, to the Interpreter. The Interpreter wil execute the code. Since the `BX` instruction will stop execution the application will exit when it encounters that instruction.
+	Elif the selected mode is Transpile:
+		- Supply the parsed code, parsed list, to the Transpiler. The Transpiler rewrites the code to Python source code which is then compiled and run by Python itself.
+	Elif the selected mode is Binary:
+		- The Interpreter optimizes, links and lowers the parsed code to Bytecode, the BinaryWriter writes it to the `.cocob` file together with the line of every instruction.
 	Elif the selected mode is Compile
-		- Supply the parsed code, parsed list, to the Compiler. The Compiler will rewrite the code in assembly and export it to the supplied file name. 
+		- Supply the parsed code, parsed list, to the Compiler. The Compiler will rewrite the code in assembly and write it line by line to the supplied file name. 
+		- With the cost option the CostModel reads the assembly file and prints the estimated size and cycles.
+		- With the simulate option the Simulator runs the assembly file with the input and the result is checked against the Interpreter.
 	"""
 	
-	raw_code = readFile(code_file)
-	if verbose:
-		printb(raw_code, "_______Raw Code_______",1) 
-	lexer = Lexer(raw_code)
-	tokens_list = lexer.tokenize(input_list)
-	if verbose:
-		printb(tokens_list, "_______Tokenized Tokens_______",1) 
-	parser = Parser(tokens_list)
-	parsed_list = parser.parse()
-	if verbose:
-		printb(parsed_list, "_______Parsed Tokens______",1)
-	if app_mode:
-		interpreter = Interpreter(parsed_list)
+	loaded = code_file.endswith(".cocob")
+	if loaded and (app_mode != 1 or profile_file):
+		cError("File Error: A `.cocob` file can only be interpreted, use the `.coco` file for the other modes.").throw()
+	artifacts = ArtifactCache(cache_directory, cache_size * 1024 * 1024) if cache_directory and not verbose and not loaded else None
+	asm_key = artifacts.key(code_file, "compile", asm_file, 64) if artifacts and not app_mode and not profile_file else None
+	compiled = asm_key is not None and artifacts.load_asm(asm_key, asm_file)
+	parsed_list = None
+	if not compiled or simulate:
+		parse_key = artifacts.key(code_file, "parse", len(input_list)) if artifacts else None
+		parsed_list = artifacts.load_parsed(parse_key) if artifacts else None
+	if parsed_list is None and (not compiled or simulate) and not loaded:
+		if verbose:
+			printb(readFile(code_file), "_______Raw Code_______",1) 
+		with openFile(code_file) as raw_code:
+			lexer = Lexer(raw_code)
+			tokens_list = lexer.tokenize(input_list)
 		if verbose:
-			print("_______Interpreted Result_______") 
-		interpreter.interpret(input_list)
-	else:
-		compiler = Compiler(parsed_list, asm_file, 64)
-		compiled_code = compiler.compile()
+			printb(tokens_list, "_______Tokenized Tokens_______",1) 
+		parser = Parser(tokens_list)
+		parsed_list = parser.parse()
 		if verbose:
-			print("_______Compiled Result_______")
-			print(compiled_code)
-		compiler.export(compiled_code)
+			printb(parsed_list, "_______Parsed Tokens______",1)
+		if artifacts:
+			artifacts.store_parsed(parse_key, parsed_list)
+	results = open(results_file, "wb" if sink_type == "binary" else "w") if results_file and (app_mode in (1, 2) or profile_file) else None
+	sink = create_sink(sink_type, results, flush_size, cell_width)
+	try:
+		if profile_file:
+			profile = Profiler(parsed_list, cell_width = cell_width).profile(input_list, sink)
+			print(profile.report())
+			profile.export(profile_file)
+		elif app_mode == 2:
+			transpiler = Transpiler(parsed_list, cell_width)
+			if verbose:
+				printb(transpiler.transpile(), "_______Transpiled Code_______",1)
+				print("_______Transpiled Result_______")
+			transpiler.run(input_list, sink = sink)
+		elif app_mode == 3:
+			interpreter = Interpreter(parsed_list, cell_width = cell_width)
+			with openFile(code_file) as raw_code:
+				BinaryWriter(interpreter.bytecode, interpreter.link_table, interpreter.loops, source_lines(raw_code)).write(binary_file)
+		elif app_mode:
+			interpreter = Interpreter.load(code_file, cell_width = cell_width) if loaded else Interpreter(parsed_list, cell_width = cell_width)
+			if verbose:
+				print("_______Interpreted Result_______") 
+			interpreter.interpret(input_list, sink)
+		elif not compiled:
+			compiler = Compiler(parsed_list, asm_file, 64)
+			if verbose:
+				compiled_code = compiler.compile()
+				print("_______Compiled Result_______")
+				print(compiled_code)
+				compiler.export(compiled_code)
+				printb(compiler.peephole.report(), "_______Peephole_______", 1)
+			else:
+				compiler.export()
+			if asm_key:
+				artifacts.store_asm(asm_key, asm_file)
+		if not app_mode and not profile_file:
+			if cost:
+				with open(asm_file) as asm_code:
+					print(CostModel(asm_code).estimate().report())
+			if simulate:
+				with open(asm_file) as asm_code:
+					simulation = Simulator(asm_code).run(input_list)
+				print(simulation.report())
+				result = Interpreter(parsed_list, 64).run(input_list)
+				if not simulation.matches(result):
+					cError("Simulation Error: The Interpreter printed `"+" ".join(map(str, result.outputs))+"` and ended with "+str(result.value)+", the compiled code does not.").throw()
+	finally:
+		if results:
+			results.close()
 	
 if __name__ == "__main__":
-	main(sys.argv[1:])
\ No newline at end of file
+	try:
+		main(sys.argv[1:])
+	except CocoError as error:
+		print(error)
\ No newline at end of file
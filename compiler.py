@@ -1,506 +1,372 @@
-from typing import List, Union
-
-from support import cp, getAddress
-
-#This dictionary is used to call functions that belong to instructions.
-compilerDict = {
-	"RIGHT" : lambda line, *params : RIGHT(line),
-	"LEFT" : lambda line, *params : LEFT(line),
-	"UP" : lambda line, *params : UP(line),
-	"DOWN" : lambda line, *params : DOWN(line),
-	"BA" : lambda line, *params : BA(line, params[0]),
-	"AB" : lambda line, *params : AB(line),
-	"START" : lambda line, *params : START(line, params[0]),
-	"SELECT" : lambda line, *params : SELECT(line, params[0]),
-	"ZL" : lambda line, *params : ZL(line, params[0], params[1]),
-	"LB" : lambda line, *params : LB(line, params[0]),
-	"RB" : lambda line, *params : RB(line),
-	"AX" : lambda line, *params : AX(line, params[0]),
-	"XA" : lambda line, *params : XA(line, params[0]),
-	"XB" : lambda line, *params : XB(line, params[0]),
-	"XY" : lambda line, *params : XY(line, params[0], params[1]),
-	"AY" : lambda line, *params : AY(line, params[0], params[1]),
-	"BY" : lambda line, *params : BY(line, params[0], params[1]),
-	"YA" : lambda line, *params : YA(line, params[0], params[1]),
-	"YB" : lambda line, *params : YB(line, params[0], params[1]),
-	"YX" : lambda line, *params : YX(line, params[0], params[1]),
-	"BX" : lambda line, *params : BX(line)
-}
-
-def RIGHT(line : int) -> str:
-	"""Writes the `RIGHT` instruction.
-	Go to the next address.
-
-	Args:
-		line (int): The line number of the current instruction
-
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	next 				= "\nSUB R4, #4"
-	return line_label + next
-	
-def LEFT(line : int) -> str:
-	"""Writes the `LEFT` instruction.
-	Go to the previous address.
-
-	Args:
-		line (int): The line number of the current instruction
-
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	previous 			= "\nADD R4, #4"
-	return line_label + previous
-
-def UP(line : int) -> str:
-	"""Writes the `UP` instruction.
-	Increase the byte of the memory address where the memory pointer is pointing
-
-	Args:
-		line (int): The line number of the current instruction
-
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	load 				= "\nLDR R0, [R4]"
-	increase 			= "\nADD R0, #1"
-	store 				= "\nSTR R0, [R4]"
-	return line_label + load + increase + store
-
-def DOWN(line : int) -> str:
-	"""Writes the `DOWN` instruction.
-	Decrease the byte of the memory address where the memory pointer is pointing
-
-	Args:
-		line (int): The line number of the current instruction
-
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	load 				= "\nLDR R0, [R4]"
-	decrease 			= "\nSUB R0, #1"
-	store 				= "\nSTR R0, [R4]"
-	return line_label + load + decrease + store
-
-def BA(line : int, identifier : int) -> str:
-	"""Writes the `BA` instruction.
-	Create labels and push the LR.
-
-	Args:
-		line (int): The line number of the current instruction
-		identifier (int): The identifier of the instruction.
-
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	label 				= "\nf_"+str(identifier)+":"
-	save_lr 			= "\nPUSH {LR}"
-	return line_label + label+save_lr
-	
-def AB(line : int) -> str:
-	"""Writes the `AB` instruction.
-	Pop the LR back to the PC.
-
-	Args:
-		line (int): The line number of the current instruction
-
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	load_lr 			= "\nPOP {PC}"
-	return line_label + load_lr
-	
-def START(line : int, identifier : int) -> str:
-	"""Writes the `START` instruction.
-	Branch link to the function label with the corresponding identifier.
-
-	Args:
-		line (int): The line number of the current instruction
-		identifier (int): The identifier of the instruction.
-
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	branch_l 			= "\nBL f_"+str(identifier)
-	return line_label + branch_l
-	
-def SELECT(line : int, line_nr : int) -> str:
-	"""Writes the `SELECT` instruction.
-	Branch to a line label.
-
-	Args:
-		line (int): The line number of the current instruction
-		line_nr (int): The line number of the line to jump to
-
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""	
-	line_label 			= "\nl_"+str(line)+":"
-	branch 				= "\nB l_"+str(line_nr)
-	return line_label + branch
-	
-def ZL(line : int, argument : int, memory_address : int) -> str:
-	"""Writes the `ZL` instruction.
-	Retrieves a input argument and stores it in the supplied memory address.
-	WARNING! Controller Code only accepts 2 arguments. If you ask for, for example, the third argument there will be undefined behavior.
-
-	Args:
-		line (int): The line number of the current instruction
-		argument (int): The number of the argument you want to store (Only 1 or 2).
-		memory_address (int): The memory address in which the input argument will be stored.
-
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	load_address 		= getAddress(memory_address, "R2")
-	store_argument		= "\nSTR R"+str(argument -1) + ", [R2]"
-	return line_label + load_address + store_argument
-	
-def LB(line : int, memory_address : int) -> str:
-	"""Writes the `LB` instruction.
-	Jump to a memory address.
-
-	Args:
-		line (int): The line number of the current instruction
-		memory_address (int): The memory address to jump to
-
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	move_address 		= "\nMOV R0, #"+str(memory_address)
-	move_multiplier 	= "\nMOV R1, #4"
-	calculate_address 	= "\nMUL R0, R0, R1"
-	adjust_address 		= "\nSUB R0, R5, R0"
-	move_value 			= "\nMOV R4, R0"
-	return line_label + move_address + move_multiplier + calculate_address + adjust_address + move_value
-	
-def RB(line : int) -> str:
-	"""Writes the `RB` instruction.
-	Print whatever is stored in the memory address the memory pointer is currently pointing to.
-	WARNING! To use this instruction there has to be a extern "C" print(int x) function.
-
-	Args:
-		line (int): The line number of the current instruction
-
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	load_value 			= "\nLDR R0, [R4]"
-	branch_l 			= "\nBL print"
-	return line_label + load_value + branch_l
-	
-def AX(line : int, value : int) -> str:
-	"""Writes the `AX` instruction.
-	Store the supplied in the memory addres the memory pointer is pointing to.
-
-	Args:
-		line (int): The line number of the current instruction
-		value (int): The value to store
-
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	move_value 			= "\nMOV R0, #" + str(value)
-	store_value 		= "\nSTR R0, [R4]"
-	return line_label + move_value + store_value
-	
-def XA(line : int, memory_address : int) -> str:
-	"""Writes the `XA` instruction.
-	Store the value from the supplied memory address in the memory address the memory pointer is pointing to.
-
-	Args:
-		line (int): The line number of the current instruction
-		memory_address (int): The memory address whose value we want to copy to the memory pointer memory address.
-
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	load_address 		= getAddress(memory_address, "R0")
-	load_value 			= "\nLDR R1, [R0]"
-	store_value 		= "\nSTR R1, [R4]"
-	return line_label + load_address + load_value + store_value
-	
-def XB(line : int, memory_address : int) -> str:
-	"""Writes the `XB` instruction.
-	Store the value from the memory address the memory pointer is pointing to in the memory of the supplied memory address.
-
-	Args:
-		line (int): The line number of the current instruction
-		memory_address (int): The memory address to where we want to copy the value of the memory pointer memory address to.
+import io
+from bisect import bisect_left, bisect_right
+from typing import List, Union, Dict, Set, Iterator, IO
 
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	load_address		= getAddress(memory_address, "R0")
-	load_value 			= "\nLDR R1, [R4]"
-	store_value 		= "\nSTR R1, [R0]"	
-	return line_label + load_address + load_value + store_value
-	
-def XY(line : int, memory_address_a : int,  memory_address_b : int) -> str:
-	"""Writes the `XY` instruction.
-	Compare the values of the 2 supplied memory addresses for equality. 
-	If equal execute the next instruciton else execute the one after that.
+from support import adjust, getPointer, getOperand
+from linker import Linker
+from optimizer import Optimizer, instruction_length
+from registers import RegisterCache, blockEndInstructions, loopEndInstructions, trace_pointers, move_register, fold_registers
+from peephole import Peephole
 
-	Args:
-		line (int): The line number of the current instruction
-		memory_address_a (int): The first memory address used to compare with
-		memory_address_b (int): the second memory address to compare with
+def operand(name : str, memory_address : int, register : str) -> Dict[str, str]:
+	"""Creates the fields of a memory address that is read or written by a template.
+	- address_name: The instructions that calculate the address, empty when the offset fits in the `LDR` or `STR` instruction.
+	- cell_name: The operand of the `LDR` or `STR` instruction, like `[R5, #-4]`.
 
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	load_address_a 		= getAddress(memory_address_a, "R0")
-	load_address_b		= getAddress(memory_address_b, "R1")
-	load_value_a		= "\nLDR R0, [R0]"
-	load_value_b		= "\nLDR R1, [R1]"	
-	compare				= "\nCMP R0, R1"
-	equal				= "\nBEQ l_"+str(line+1)
-	not_equal			= "\nBNE l_"+str(line+2)
-	return line_label + load_address_a + load_address_b + load_value_a + load_value_b + compare + equal + not_equal
-	
-def AY(line : int, memory_address_a : int,  memory_address_b : int) -> str:
-	"""Writes the `AY` instruction.
-	Compare the values of the 2 supplied memory addresses to see if a is greater than b.
-	If a is greater than b execute the next instruction else execute the one after that.
-	
 	Args:
-		line (int): The line number of the current instruction
-		memory_address_a (int): The first memory address used to compare with
-		memory_address_b (int): The second memory address to compare with
+		name (str): The name of the parameter, a or b.
+		memory_address (int): The memory address.
+		register (str): The register the address is calculated in when it does not fit.
 
 	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
+		Dict[str, str]: The fields.
 	"""
-	line_label 			= "\nl_"+str(line)+":"
-	load_address_a		= getAddress(memory_address_a, "R0")
-	load_address_b		= getAddress(memory_address_b, "R1")
-	load_value_a		= "\nLDR R0, [R0]"
-	load_value_b		= "\nLDR R1, [R1]"
-	compare				= "\nCMP R0, R1"
-	greather_than		= "\nBGT l_"+str(line+1)
-	less_than_equal		= "\nBLE l_"+str(line+2)
-	return line_label + load_address_a + load_address_b + load_value_a + load_value_b + compare + greather_than + less_than_equal
-	
-def BY(line : int, memory_address_a : int,  memory_address_b : int) -> str:
-	"""Writes the `BY` instruction.
-	Compare the values of the 2 supplied memory addresses to see if a is less than b.
-	If a is less than b execute the next instruction else execute the one after that.
-
-	Args:
-		line (int): The line number of the current instruction
-		memory_address_a (int): The first memory address used to compare with
-		memory_address_b (int): The second memory address to compare with
+	address, cell = getOperand(memory_address, register)
+	return {"address_"+name : address, "cell_"+name : cell}
 
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	load_address_a		= getAddress(memory_address_a, "R0")
-	load_address_b		= getAddress(memory_address_b, "R1")
-	load_value_a		= "\nLDR R0, [R0]"
-	load_value_b		= "\nLDR R1, [R1]"
-	compare				= "\nCMP R0, R1"
-	less_than			= "\nBGT l_"+str(line+1)
-	greater_than_equal 	= "\nBLE l_"+str(line+2)
-	return line_label + load_address_a + load_address_b + load_value_a + load_value_b + compare + less_than + greater_than_equal
-	
-def YA(line : int, memory_address_a : int,  memory_address_b : int) -> str:
-	"""Writes the `YA` instruction.
-	Multiply the value of memory address a with the value of memory address b and store it in memory address a.
+def compare(branch : str, target : str) -> str:
+	"""Creates the template of a comparison of the memory addresses a and b followed by a conditional branch.
 
 	Args:
-		line (int): The line number of the current instruction
-		memory_address_a (int): The memory address of the value to multiply and store the result in
-		memory_address_b (int): The memory address of the value to multiply the value of memory addres a with
+		branch (str): The conditional branch instruction.
+		target (str): The field of the line number to branch to.
 
 	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
+		str: The template.
 	"""
-	line_label 			= "\nl_"+str(line)+":"
-	load_address_a		= getAddress(memory_address_a, "R0")
-	load_address_b		= getAddress(memory_address_b, "R1")
-	load_value_a		= "\nLDR R2, [R0]"
-	load_value_b		= "\nLDR R1, [R1]"
-	calculate_result 	= "\nMUL R2, R1"
-	save_result 		= "\nSTR R2, [R0]"
-	return line_label + load_address_a + load_address_b + load_value_a + load_value_b + calculate_result + save_result
-	
-def YB(line : int, memory_address_a : int,  memory_address_b : int) -> str:
-	"""Writes the `YB` instruction.
-	Adds the value of memory address b to the value stored in memory address a.
-
-	Args:
-		line (int): The line number of the current instruction
-		memory_address_a (int): The memory address of the value to store the result in
-		memory_address_b (int): The memory address of the value to add to the value of memory address a
+	return "{address_a}{address_b}\nLDR R0, {cell_a}\nLDR R1, {cell_b}\nCMP R0, R1\n" + branch + " l_{" + target + "}"
 
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	load_address_a 		= getAddress(memory_address_a, "R0")
-	load_address_b		= getAddress(memory_address_b, "R1")
-	load_value_a		= "\nLDR R2, [R0]"
-	load_value_b		= "\nLDR R1, [R1]"
-	calculate_result	= "\nADD R2, R1"
-	save_result 		= "\nSTR R2, [R0]"
-	return line_label + load_address_a + load_address_b + load_value_a + load_value_b + calculate_result + save_result
-	
-def YX(line : int, memory_address_a : int,  memory_address_b : int) -> str:
-	"""Writes the `YX` instruction.
-	Subtracts the value of memory address b from the value stored in memory address a.
+def calculate(operation : str) -> str:
+	"""Creates the template of a calculation with the memory addresses a and b, the result is stored in memory address a.
 
 	Args:
-		line (int): The line number of the current instruction
-		memory_address_a (int): The memory address of the value to store the result in
-		memory_address_b (int): The memory address of the value to subtract from the value of memory address a
+		operation (str): The instruction that calculates R2 with R1.
 
 	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
+		str: The template.
 	"""
-	line_label 			= "\nl_"+str(line)+":"
-	load_address_a 		= getAddress(memory_address_a, "R0")
-	load_address_b		= getAddress(memory_address_b, "R1")
-	load_value_a		= "\nLDR R2, [R0]"
-	load_value_b		= "\nLDR R1, [R1]"
-	calculate_result	= "\nSUB R2, R1"
-	save_result 		= "\nSTR R2, [R0]"
-	return line_label + load_address_a + load_address_b + load_value_a + load_value_b + calculate_result + save_result
-	
-def BX(line : int) -> str:
-	"""Writes the `BX` instruction.
-	Ends the code , each file should contain this instruction.
-	Places whatever the memory pointer is pointing to in R0 so it can be used as a return value. 
-	Sets the Stack Pointer to it's original state en pops the registers R4 -R7 and PC. 
-
-	Args:
-		line (int): The line number of the current instruction
+	return "{address_a}{address_b}\nLDR R2, {cell_a}\nLDR R1, {cell_b}\n" + operation + " R2, R1\nSTR R2, {cell_a}"
+
+#This dictionary contains the assembly template of every (super)instruction, created once when the Compiler is loaded.
+#Every line of a template is a single assembly instruction, the fields are filled in for every line of Controller Code:
+# - a, b and c: The parameters of the instruction.
+# - next and skip: The line numbers of the next two lines, where `XY`, `AY` and `BY` continue.
+# - cell_p: The memory address the memory pointer points to, `[R4]` unless the RegisterCache keeps it in a register.
+# - The fields in fieldDict.
+#The label `l_line:` of every line is added by the Compiler itself.
+templateDict = {
+	"RIGHT" : "SUB R4, #4",
+	"LEFT" : "ADD R4, #4",
+	"UP" : "LDR R0, {cell_p}\nADD R0, #1\nSTR R0, {cell_p}",
+	"DOWN" : "LDR R0, {cell_p}\nSUB R0, #1\nSTR R0, {cell_p}",
+	"BA" : "f_{a}:\nPUSH {{LR}}",
+	"AB" : "POP {{PC}}",
+	"START" : "BL f_{a}",
+	"SELECT" : "B l_{a}",
+	"ZL" : "{address_b}\nSTR R{argument}, {cell_b}",
+	"LB" : "{pointer}",
+	"RB" : "LDR R0, {cell_p}\nBL print",
+	"AX" : "MOV R0, #{a}\nSTR R0, {cell_p}",
+	"XA" : "{address_a}\nLDR R1, {cell_a}\nSTR R1, {cell_p}",
+	"XB" : "{address_a}\nLDR R1, {cell_p}\nSTR R1, {cell_a}",
+	"XY" : compare("BEQ", "next") + "\nBNE l_{skip}",
+	"AY" : compare("BGT", "next") + "\nBLE l_{skip}",
+	"BY" : compare("BLT", "next") + "\nBGE l_{skip}",
+	"YA" : calculate("MUL"),
+	"YB" : calculate("ADD"),
+	"YX" : calculate("SUB"),
+	"BX" : "LDR R0, {cell_p}\nMOV SP, R5\nPOP {{R4,R5,R6,R7,PC}}",
+	"MOVE" : "{adjust}",
+	"ADD" : "LDR R0, {cell_p}\n{adjust}\nSTR R0, {cell_p}",
+	"STORE" : "{pointer}\nMOV R0, #{b}\nSTR R0, {cell_p}",
+	"XYSELECT" : compare("BEQ", "c"),
+	"AYSELECT" : compare("BGT", "c"),
+	"BYSELECT" : compare("BLT", "c")
+}
 
-	Returns:
-		str: A string containing a label to the instruction and the instruction itself.
-	"""
-	line_label 			= "\nl_"+str(line)+":"
-	load_return_value 	= "\nLDR R0, [R4]"
-	load_stack_pointer 	= "\nMOV SP, R5"
-	load_registers		= "\nPOP {R4,R5,R6,R7,PC}"
-	return line_label + load_return_value + load_stack_pointer + load_registers
+#These instructions branch to a label, a branch out of a loop that keeps memory addresses in registers jumps to code that writes them back first.
+branchInstructions = ["B", "BEQ", "BNE", "BGT", "BGE", "BLT", "BLE"]
+
+#This dictionary contains the fields of the templates that are calculated from the parameters.
+# - argument: The register `ZL` reads its input argument from.
+# - adjust: The additions or subtractions of `MOVE` and `ADD`.
+# - address_a, cell_a, address_b and cell_b: The memory addresses a and b, see operand().
+# - pointer: The instructions that point the memory pointer to memory address a.
+#The memory addresses are known while compiling, so their offsets from R5 are folded into the instructions here.
+fieldDict = {
+	"ZL" : lambda a, b, c : {"argument" : a - 1, **operand("b", b, "R2")},
+	"LB" : lambda a, b, c : {"pointer" : getPointer(a, "R4")},
+	"XA" : lambda a, b, c : operand("a", a, "R0"),
+	"XB" : lambda a, b, c : operand("a", a, "R0"),
+	"XY" : lambda a, b, c : {**operand("a", a, "R0"), **operand("b", b, "R1")},
+	"AY" : lambda a, b, c : {**operand("a", a, "R0"), **operand("b", b, "R1")},
+	"BY" : lambda a, b, c : {**operand("a", a, "R0"), **operand("b", b, "R1")},
+	"YA" : lambda a, b, c : {**operand("a", a, "R0"), **operand("b", b, "R1")},
+	"YB" : lambda a, b, c : {**operand("a", a, "R0"), **operand("b", b, "R1")},
+	"YX" : lambda a, b, c : {**operand("a", a, "R0"), **operand("b", b, "R1")},
+	"MOVE" : lambda a, b, c : {"adjust" : adjust("R4", -4 * a)},
+	"ADD" : lambda a, b, c : {"adjust" : adjust("R0", a)},
+	"STORE" : lambda a, b, c : {"pointer" : getPointer(a, "R4")},
+	"XYSELECT" : lambda a, b, c : {**operand("a", a, "R0"), **operand("b", b, "R1")},
+	"AYSELECT" : lambda a, b, c : {**operand("a", a, "R0"), **operand("b", b, "R1")},
+	"BYSELECT" : lambda a, b, c : {**operand("a", a, "R0"), **operand("b", b, "R1")}
+}
 
 class Compiler:
 	"""The Compiler class is used to compile Controller Code to assembly.
 	"""
-	def __init__(self, parsed_tokens : List[List[Union[str,int]]], asm_file : str, memory_size : int):
+	def __init__(self, parsed_tokens : List[List[Union[str,int]]], asm_file : str, memory_size : int, optimize : bool = True, cache : bool = True, peephole : bool = True):
 		"""The init function will ask the user to supply parsed Controller Code tokens, the name of the file to export to and the size of the memory.
-		This function will also create the coco_lines list which will contain just the first instruction of each line. It is used to find the index of certain instructions.
+		This function will also optimize and link the parsed tokens once, the LinkTable contains the start and end of every function.
 
 		Args:
 			parsed_tokens (List[List[Union[str,int]]]): A List of parsed Controller Code tokens
 			asm_file (str): The name of the file to which a string can be exported
 			memory_size (int): The size of the memory stack to be used.
+			optimize (bool, optional): Fuse common sequences of instructions into superinstructions using the Optimizer. Defaults to True.
+			cache (bool, optional): Keep the most used memory addresses of every loop and basic block in registers using a RegisterCache. Defaults to True.
+			peephole (bool, optional): Improve the created assembly code with a Peephole, the bytes it saved can be found in the Peephole afterwards. Defaults to True.
 		"""
-		self.tokens = parsed_tokens
-		self.coco_lines = list(map(lambda line : line[0], parsed_tokens)) #map 5/3
+		self.tokens = Optimizer(parsed_tokens).optimize() if optimize else parsed_tokens
+		self.link_table = Linker(self.tokens).link()
+		self.cache = cache
+		self.pointers = trace_pointers(self.tokens, self.link_table.jumps) if cache else []
+		self.targets = self.__find_targets() if cache else set()
+		self.loops = self.__find_loops() if cache else {}
+		self.peephole = Peephole(self.__create_code) if peephole else None
 		self.file = asm_file
 		self.memory_size = memory_size
 
 	def compile(self) -> str:
 		"""Call this function to start the compile process.
+		The assembly code is emitted into a string in memory, use emit() or export() to write it to a file directly.
+
+		Returns:
+			str: A string containing all the supplied parsed tokens in assembly.
+		"""
+		stream = io.StringIO()
+		self.emit(stream)
+		return stream.getvalue()
+
+	def emit(self, stream : IO[str]):
+		"""This function writes the assembly code to a text stream one line at a time, so the complete assembly code never has to be kept in memory as a single string.
 		It will start by first setting some "options" and make the filename -.asm available as a global.
 		Next it will find all the `BA` instructions and put their code behind the "options"
 		After that it will write the rest of the code, the "body".
 
+		Args:
+			stream (IO[str]): The stream to write to, for example a opened file or a `io.StringIO`.
+		"""
+		for line in self.lines():
+			stream.write("\n"+line)
+
+	def lines(self) -> Iterator[str]:
+		"""This function yields every line of the assembly code in order, improved by the Peephole when it is used.
+		Without the Peephole the Compiler creates the lines once, the Peephole creates them twice since it has to count every branch before it can remove a label. Neither keeps the lines in memory.
+
 		Returns:
-			str: A string containing all the supplied parsed tokens in assembly.
+			Iterator[str]: The lines of assembly code, without line endings.
+		"""
+		return self.peephole.optimize() if self.peephole else self.__create_code()
+
+	def __create_code(self) -> Iterator[str]:
+		"""This function creates every line of the assembly code in order.
+
+		Returns:
+			Iterator[str]: The lines of assembly code, without line endings.
 		"""
 		code_label = self.file.split('.')[0]
-		asm_code 	= self.__initialize_file(code_label)
-		asm_code   += self.__create_functions(cp(self.tokens), cp(self.coco_lines))
-		asm_code   += self.__initialize_code(code_label, self.memory_size)
-		asm_code   += self.__create_body(cp(self.tokens), cp(self.coco_lines))
-		return asm_code
+		yield from self.__initialize_file(code_label)
+		yield from self.__create_functions()
+		yield from self.__initialize_code(code_label, self.memory_size)
+		yield from self.__create_body()
 
-	def __create_functions(self, tokens : List[List[Union[str,int]]], instruction_list : List[str], index_end = 0) -> str:
-		"""This function will try to find all the `BA` instructions and corresponding `AB` instructions and create functions with all the code between them.
+	def __create_functions(self) -> Iterator[str]:
+		"""This function will create functions with all the code between every `BA` instruction and its corresponding `AB` instruction.
+		The start and end of every function is looked up in the LinkTable.
 
-		Args:
-			tokens (List[List[Union[str,int]]]): The list of parsed Controller Code tokens
-			instruction_list (List[str]): The instruction list, this is used to find the line numbers that correspond to the `BA` and `AB` instructions.
-			index_end (int, optional): This integer is used to define from where the function should start to look for `BA` instructions. Defaults to 0.
+		Returns:
+			Iterator[str]: The lines of all the `BA` and corresponding `AB` instructions and all their code
+		"""
+		for start, end in sorted(self.link_table.functions.values()):
+			yield from self.__create_lines(start, end+1)
+		yield ""
+
+	def __create_body(self) -> Iterator[str]:
+		"""This function will create all the instruction outside of functions, aka the "body".
+		The code between functions is found using the start and end of every function in the LinkTable.
 
 		Returns:
-			str: A string containing all the `BA` and corresponding `AB` instructions and all their code
+			Iterator[str]: The lines of all the code outside of `BA` instructions and all of their code.
 		"""
-		try:
-			start = instruction_list.index("BA", index_end)
-			end = instruction_list.index("AB",index_end+1)
-			cur_function = self.__create_lines(cp(tokens),start,end+1)
-		except:
-			return "\n"
-		return cur_function + self.__create_functions(cp(tokens),cp(instruction_list), end)
-		
-	def __create_body(self, tokens : List[List[Union[str,int]]], instruction_list : List[str], index_start = 0) -> str:
-		"""This function will try to find all the instruction outside of functions, aka the "body".
+		start = 0
+		for function_start, function_end in sorted(self.link_table.functions.values()):
+			yield from self.__create_lines(start, function_start)
+			start = function_end+1
+		yield from self.__create_lines(start, len(self.tokens))
 
-		Args:
-			tokens (List[List[Union[str,int]]]): The list of parsed Controller Code tokens
-			instruction_list (List[str]): The instruction list, this is used to find the line number that correspond to the `BA` and `AB` instructions se we can ignore those.
-			index_start (int, optional): This integer is used to define from where the function should start looking for `BA` instructions. Defaults to 0.
+	def __find_targets(self) -> Set[int]:
+		"""This function finds every line that is jumped to, a new basic block starts on these lines.
 
 		Returns:
-			str: A string containing all the code outside of `BA` instructions and all of their code.
+			Set[int]: The index of every line that is jumped to.
 		"""
-		try:
-			end = instruction_list.index("BA", index_start)
-			start = instruction_list.index("AB", index_start+1) 
-			cur_body = self.__create_lines(cp(tokens), index_start, end)
-		except:
-			return self.__create_lines(cp(tokens), index_start, len(instruction_list))
-		return cur_body + self.__create_body(cp(tokens), cp(instruction_list), start+1)
+		targets = set()
+		for line, instruction in enumerate(self.tokens):
+			if instruction[0] in ["XY", "AY", "BY", "SELECT", "XYSELECT", "AYSELECT", "BYSELECT"]:
+				targets.update([self.link_table.jumps[line], line + instruction_length(instruction)])
+		return targets
+
+	def __find_loops(self) -> Dict[int, int]:
+		"""This function finds the loops that keep their memory addresses in registers from the first to the last iteration.
+		Such a loop ends with a `SELECT` that jumps back to its first line and it is only entered on its first line, by the line before it.
+		The memory pointer has to be known on every line of the loop and it can not contain the loopEndInstructions.
+		Of loops that overlap only the smallest is used, the inner loop runs most often.
 
-	def __create_lines(self, tokens : List[List[Union[str,int]]], start : int, end : int) -> str:
-		"""This function creates the actual assembly code for a line using the compilerDict.
+		Returns:
+			Dict[int, int]: The index of the first and last line of every loop.
+		"""
+		starts = []
+		line = 0
+		while line < len(self.tokens):
+			starts.append(line)
+			line += instruction_length(self.tokens[line])
+		jumps = []
+		for line in starts:
+			instruction = self.tokens[line]
+			if instruction[0] in ["SELECT", "XYSELECT", "AYSELECT", "BYSELECT"]:
+				jumps.append((self.link_table.jumps[line], line))
+			elif instruction[0] in ["XY", "AY", "BY"]:
+				jumps += [(line + 1, line), (self.link_table.jumps[line], line)]
+		jumps.sort()
+		loops = {}
+		for first, last in sorted(filter(lambda jump : jump[0] <= jump[1] and self.tokens[jump[1]][0] == "SELECT", jumps), key = lambda loop : loop[1] - loop[0]):
+			lines = starts[bisect_left(starts, first):bisect_right(starts, last)]
+			if not lines or lines[0] != first or any(map(lambda loop : loop[0] <= last and first <= loop[1], loops.items())):
+				continue
+			if any(map(lambda line : self.tokens[line][0] in loopEndInstructions or self.pointers[line] is None, lines)):
+				continue
+			if all(map(lambda jump : first <= jump[1] <= last, jumps[bisect_left(jumps, (first, -1)):bisect_right(jumps, (last, len(self.tokens)))])):
+				loops[first] = last
+		return loops
+
+	def __create_lines(self, start : int, end : int) -> Iterator[str]:
+		"""This function splits a block of lines in basic blocks, a basic block ends at every instruction in the blockEndInstructions and before every line that is jumped to.
+		A superinstruction creates the code of all the lines it replaces, those lines are skipped.
 
 		Args:
-			tokens (List[List[Union[str,int]]]): The list of parsed Controller Code tokens
 			start (int): The start of a block of lines of which we want to create assembly code
 			end (int): Then end of a block of lines of which we want to create assembly code
 
 		Returns:
-			str: A string containing all the code of the supplied block of code
+			Iterator[str]: The lines of assembly code of the supplied block of code
 		"""
-		if start < end:
-			return compilerDict.get(tokens[start][:1][0])(start+1, *cp(tokens[start][1:])) + self.__create_lines(cp(tokens), start+1, end)
-		return ""
+		block = []
+		line = start
+		while line < end:
+			if line in self.loops:
+				yield from self.__create_block(block)
+				yield from self.__create_loop(line, self.loops[line])
+				block = []
+				line = self.loops[line] + 1
+				continue
+			if line in self.targets and block:
+				yield from self.__create_block(block)
+				block = []
+			block.append(line)
+			if self.tokens[line][0] in blockEndInstructions:
+				yield from self.__create_block(block)
+				block = []
+			line += instruction_length(self.tokens[line])
+		yield from self.__create_block(block)
+
+	def __create_block(self, block : List[int]) -> Iterator[str]:
+		"""This function creates the actual assembly code for a basic block by filling in the templates of the templateDict.
+		When the cache is used a RegisterCache decides which memory addresses of the block are kept in registers, the changed registers are written back at the end of the block.
 
-	def __initialize_file(self, code_label : str) -> str:
+		Args:
+			block (List[int]): The index of every (super)instruction in the basic block.
+
+		Returns:
+			Iterator[str]: The lines of assembly code of the basic block
+		"""
+		cache = RegisterCache(list(map(lambda line : self.tokens[line], block)), list(map(lambda line : self.pointers[line], block))) if self.cache else None
+		for line in block:
+			yield from self.__create_line(line, cache)
+		if cache:
+			yield from cache.flush()
+
+	def __create_loop(self, first : int, last : int) -> Iterator[str]:
+		"""This function creates the assembly code for a loop found by __find_loops(), its memory addresses stay in registers from the first to the last iteration.
+		The registers are loaded before the label of the first line, the `SELECT` at the end jumps back past those loads.
+		Every jump out of the loop jumps to a label after the loop instead, that writes the changed registers back before it jumps to the actual line.
+
+		Args:
+			first (int): The index of the first line of the loop.
+			last (int): The index of the `SELECT` at the end of the loop.
+
+		Returns:
+			Iterator[str]: The lines of assembly code of the loop.
+		"""
+		lines = []
+		line = first
+		while line <= last:
+			lines.append(line)
+			line += instruction_length(self.tokens[line])
+		cache = RegisterCache(list(map(lambda line : self.tokens[line], lines)), list(map(lambda line : self.pointers[line], lines)), True)
+		yield from cache.preload()
+		stores = cache.flush()
+		exits = set()
+		for line in lines:
+			for code in self.__create_line(line, cache):
+				operation, _, label = code.partition(" ")
+				if stores and operation in branchInstructions and label.startswith("l_") and not first < int(label[2:]) <= last + 1:
+					exits.add(int(label[2:]))
+					code = operation+" l_"+str(first+1)+"_"+label[2:]
+				yield code
+		for target in sorted(exits):
+			yield "l_"+str(first+1)+"_"+str(target)+":"
+			yield from stores
+			yield "B l_"+str(target)
+
+	def __create_line(self, line : int, cache : RegisterCache = None) -> List[str]:
+		"""This function creates the assembly code of a single (super)instruction by filling in its template of the templateDict.
+		The RegisterCache decides which memory addresses are read from or written to a register instead, when it does the copies between those registers and the others are removed with fold_registers().
+
+		Args:
+			line (int): The index of the (super)instruction.
+			cache (RegisterCache, optional): The RegisterCache of the basic block or loop. Defaults to None, every memory address is in memory.
+
+		Returns:
+			List[str]: The lines of assembly code, starting with the label of the line.
+		"""
+		instruction = self.tokens[line]
+		a, b, c = (instruction[1:] + [0, 0, 0])[:3]
+		fields = {"cell_p" : "[R4]", **(fieldDict[instruction[0]](a, b, c) if instruction[0] in fieldDict else {})}
+		code = ["l_"+str(line+1)+":"]
+		cached = {}
+		if cache:
+			lines, cached = cache.access(instruction, self.pointers[line])
+			fields.update(cached)
+			code += lines
+		template = list(map(move_register, filter(None, templateDict[instruction[0]].format(line = line+1, next = line+2, skip = line+3, a = a, b = b, c = c, **fields).split("\n"))))
+		return code + (fold_registers(template) if cached else template)
+
+	def __initialize_file(self, code_label : str) -> List[str]:
 		"""This function is used to create the basic "options" for the assembly code.
 
 		Args:
 			code_label (str): The name that will be made global and can be used in for example C++ code.
 
 		Returns:
-			str: A string containing all the "options"
+			List[str]: The lines containing all the "options"
 		"""
-		section 	= "\n.section .text"
-		align 		= "\n.align 4"
-		external 	= "\n.global "+code_label
-		return section + align + external + "\n"
+		section 	= ".section .text"
+		align 		= ".align 4"
+		external 	= ".global "+code_label
+		return [section, align, external, ""]
 
-	def __initialize_code(self, code_label : str, memory_size : int) -> str:
+	def __initialize_code(self, code_label : str, memory_size : int) -> List[str]:
 		"""This function is used to start the Controller Code and secure all the Registers so that when we return the C++ code can continue where it left off.
 
 		Args:
@@ -508,23 +374,27 @@ class Compiler:
 			memory_size (int): The size of the memory stack that we want to use.
 
 		Returns:
-			str: A string containing the start of a files Controller Code.
+			List[str]: The lines containing the start of a files Controller Code.
 		"""
-		start_label 			= "\n"+code_label+":"
-		save_registers 			= "\nPUSH {R4,R5,R6,R7,LR}"
-		create_memory_pointer 	= "\nMOV R4, SP"
-		save_stack_pointer 		= "\nMOV R5, SP"
-		protect_address_zero 	= "\nSUB R4, #4"
-		allocate_memory_size 	= "\nSUB SP, #"+str(memory_size * 4)
-		#save_program_counter = "\nMOV R6, PC"
-		return start_label+save_registers+create_memory_pointer+save_stack_pointer+protect_address_zero+allocate_memory_size
-
-	def export(self, compiled_code : str):
+		start_label 			= code_label+":"
+		save_registers 			= "PUSH {R4,R5,R6,R7,LR}"
+		create_memory_pointer 	= "MOV R4, SP"
+		save_stack_pointer 		= "MOV R5, SP"
+		protect_address_zero 	= "SUB R4, #4"
+		allocate_memory_size 	= "SUB SP, #"+str(memory_size * 4)
+		#save_program_counter = "MOV R6, PC"
+		return [start_label, save_registers, create_memory_pointer, save_stack_pointer, protect_address_zero, allocate_memory_size]
+
+	def export(self, compiled_code : str = None):
 		"""This function is used to export the supplied string to the file name that was supplied during creation of the Compiler Object.
+		When no string is supplied the assembly code is emitted straight into the file instead.
 
 		Args:
-			compiled_code (str): The string that will be written to the file
+			compiled_code (str, optional): The string that will be written to the file. Defaults to None.
 		"""
 		with open(self.file, "w") as file:
-			file.write(compiled_code)
+			if compiled_code is None:
+				self.emit(file)
+			else:
+				file.write(compiled_code)
 		return 
\ No newline at end of file
@@ -0,0 +1,175 @@
+import json
+from typing import List, Dict, Tuple, Iterable
+
+from peephole import instruction_size, conditionDict
+
+#The amount of cycles the pipeline of a Cortex-M3 needs to refill after a taken branch.
+#The Technical Reference Manual gives 1 to 3 cycles depending on the alignment and the width of the target instruction, the middle is used.
+refillCycles = 2
+
+#This dictionary contains the amount of cycles every instruction takes on a Cortex-M3 according to its Technical Reference Manual.
+#`PUSH`, `POP` and the branches depend on their operands, they are calculated by instruction_cycles().
+cycleDict = {
+	"MOV" : 1,
+	"ADD" : 1,
+	"SUB" : 1,
+	"CMP" : 1,
+	"MUL" : 1,
+	"LDR" : 2,
+	"STR" : 2
+}
+
+def instruction_cycles(line : str, taken : bool = False) -> int:
+	"""Returns the amount of cycles a line of assembly code takes on a Cortex-M3, labels and directives take 0 cycles.
+	- `PUSH` and `POP` take 1 cycle plus 1 for every register, a `POP` of the PC also refills the pipeline.
+	- `B` and `BL` always jump and refill the pipeline, a conditional branch only refills it when it is taken.
+
+	Args:
+		line (str): A line of assembly code.
+		taken (bool, optional): Whether a conditional branch is taken. Defaults to False.
+
+	Returns:
+		int: The amount of cycles.
+	"""
+	if not line or line.endswith(":") or line.startswith("."):
+		return 0
+	operation, _, operands = line.partition(" ")
+	if operation in ["PUSH", "POP"]:
+		registers = operands.strip("{}").split(",")
+		return 1 + len(registers) + (refillCycles if "PC" in registers else 0)
+	if operation in ["B", "BL"] or (operation in conditionDict and taken):
+		return 1 + refillCycles
+	return cycleDict.get(operation, 1)
+
+class Cost:
+	"""This class contains the estimated size and cycles of compiled Controller Code.
+	- lines: Every line of assembly code with its size in bytes, its cycles and its cycles when it is a branch that is taken.
+	- functions: For every function, the main code has the name of the global label, its size and the cycles of executing every instruction once without taking a branch.
+	- loops: For every branch back to an earlier label of the same function, the function, the label and the least and most cycles a single iteration of the loop takes.
+	"""
+	def __init__(self, lines : List[Tuple[str, int, int, int]], functions : Dict[str, Tuple[int, int]], loops : List[Tuple[str, str, int, int]]):
+		self.lines = lines
+		self.functions = functions
+		self.loops = loops
+
+	def __str__(self):
+		return "Cost({functions},\n{loops})".format(
+			functions = self.functions,
+			loops = self.loops
+		)
+
+	def totals(self) -> Dict[str, int]:
+		"""Returns the size and cycles of the whole program, the sum of all functions.
+
+		Returns:
+			Dict[str, int]: The size in bytes and the cycles.
+		"""
+		return {"size" : sum(map(lambda function : function[0], self.functions.values())), "cycles" : sum(map(lambda function : function[1], self.functions.values()))}
+
+	def report(self) -> str:
+		"""Creates a readable report with every line of assembly code, the costs of every function and every loop and the total.
+
+		Returns:
+			str: The report.
+		"""
+		report = "{:>6} {:>7}  {}\n".format("bytes", "cycles", "line")
+		report += "".join(map(lambda line : "{size:>6} {cycles:>7}  {code}\n".format(
+			size = line[1] if line[1] else "",
+			cycles = (str(line[2]) if line[2] == line[3] else str(line[2])+"/"+str(line[3])) if line[2] else "",
+			code = line[0]
+		), self.lines))
+		report += "\nFunctions:\n{:>12} {:>8} {:>8}\n".format("function", "bytes", "cycles")
+		report += "".join(map(lambda item : "{function:>12} {size:>8} {cycles:>8}\n".format(function = item[0], size = item[1][0], cycles = item[1][1]), self.functions.items()))
+		report += "\nLoops:\n{:>12} {:>8} {:>8} {:>8}\n".format("function", "label", "best", "worst")
+		report += "".join(map(lambda loop : "{function:>12} {label:>8} {best:>8} {worst:>8}\n".format(function = loop[0], label = loop[1], best = loop[2], worst = loop[3]), self.loops))
+		totals = self.totals()
+		return report + "\nTotal: {size} bytes, {cycles} cycles\n".format(size = totals["size"], cycles = totals["cycles"])
+
+	def export(self, filename : str):
+		"""Writes the costs of every function and loop and the total to a JSON file, so the results of different versions of the Compiler can be compared.
+
+		Args:
+			filename (str): The name of the file.
+		"""
+		with open(filename, "w") as file:
+			json.dump({
+				"functions" : dict(map(lambda item : (item[0], {"size" : item[1][0], "cycles" : item[1][1]}), self.functions.items())),
+				"loops" : list(map(lambda loop : {"function" : loop[0], "label" : loop[1], "best" : loop[2], "worst" : loop[3]}, self.loops)),
+				"total" : self.totals()
+			}, file, indent = 4)
+
+class CostModel:
+	"""The CostModel class estimates the size and the cycles of assembly code created by the Compiler without running it.
+	Every instruction gets its Thumb-2 size and its Cortex-M3 cycles, the paths through every loop are followed to find the cheapest and the most expensive iteration.
+	"""
+	def __init__(self, asm_lines : Iterable[str]):
+		"""The init function will ask the user to supply the lines of assembly code, for example a opened `.asm` file or `Compiler.lines()`.
+
+		Args:
+			asm_lines (Iterable[str]): The lines of assembly code.
+		"""
+		self.asm_lines = asm_lines
+
+	def estimate(self) -> Cost:
+		"""This function reads every line once and estimates its costs, every label that does not start with `l_` starts a new function.
+
+		Returns:
+			Cost: The estimated costs.
+		"""
+		lines = []
+		functions = {}
+		loops = []
+		function = ""
+		instructions = []
+		labels = {}
+		for line in map(lambda line : line.strip(), self.asm_lines):
+			if line.endswith(":") and not line.startswith("l_"):
+				loops += self.__loops(function, instructions, labels)
+				function = line[:-1]
+				instructions = []
+				labels = {}
+			if line.endswith(":"):
+				labels[line[:-1]] = len(instructions)
+			elif line and not line.startswith("."):
+				instructions.append(line)
+				size, cycles = functions.get(function, (0, 0))
+				functions[function] = (size + instruction_size(line), cycles + instruction_cycles(line))
+			lines.append((line, instruction_size(line), instruction_cycles(line), instruction_cycles(line, True)))
+		loops += self.__loops(function, instructions, labels)
+		return Cost(lines, functions, loops)
+
+	def __loops(self, function : str, instructions : List[str], labels : Dict[str, int]) -> List[Tuple[str, str, int, int]]:
+		"""Finds the loops of a function and calculates the cheapest and the most expensive path through every loop.
+		A loop is a branch back to a label of the same function. Every path from the label to that branch is followed, the branches inside the loop can only jump forward, the branches out of the loop leave it.
+
+		Args:
+			function (str): The name of the function.
+			instructions (List[str]): The instructions of the function, without labels.
+			labels (Dict[str, int]): The index of the instruction after every label of the function.
+
+		Returns:
+			List[Tuple[str, str, int, int]]: The function, the label and the least and most cycles of a iteration of every loop.
+		"""
+		loops = []
+		for end, line in enumerate(instructions):
+			operation, _, label = line.partition(" ")
+			if operation not in conditionDict or label not in labels or labels[label] > end:
+				continue
+			start = labels[label]
+			best = {start : 0}
+			worst = {start : 0}
+			for index in range(start, end):
+				if index not in best:
+					continue
+				operation, _, target = instructions[index].partition(" ")
+				paths = []
+				if operation != "B" and not (operation == "POP" and "PC" in target):
+					paths.append((index + 1, instruction_cycles(instructions[index])))
+				if operation in conditionDict and target in labels and index < labels[target] <= end:
+					paths.append((labels[target], instruction_cycles(instructions[index], True)))
+				for successor, cycles in paths:
+					best[successor] = min(best.get(successor, best[index] + cycles), best[index] + cycles)
+					worst[successor] = max(worst.get(successor, worst[index] + cycles), worst[index] + cycles)
+			if end in best:
+				loops.append((function, label, best[end] + instruction_cycles(line, True), worst[end] + instruction_cycles(line, True)))
+		return loops
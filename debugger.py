@@ -0,0 +1,229 @@
+from array import array
+from typing import List, Union, Dict, Tuple
+
+from linker import Linker
+from memory import Memory, cellTypeDict
+from interpreter import Platform, interpreterDict, throw_index_error
+from sinks import OutputSink, TextSink
+from support import cError
+
+#This dictionary returns the memory address every instruction writes to, instructions that do not write to memory are not in it.
+#The functions receive the memory pointer followed by the parameters of the instruction.
+writeAddressDict = {
+	"UP" : lambda memory_pointer : memory_pointer,
+	"DOWN" : lambda memory_pointer : memory_pointer,
+	"AX" : lambda memory_pointer, _ : memory_pointer,
+	"XA" : lambda memory_pointer, _ : memory_pointer,
+	"XB" : lambda _, memory_address : memory_address,
+	"ZL" : lambda _, argument, memory_address : memory_address,
+	"YA" : lambda _, memory_address_a, memory_address_b : memory_address_a,
+	"YB" : lambda _, memory_address_a, memory_address_b : memory_address_a,
+	"YX" : lambda _, memory_address_a, memory_address_b : memory_address_a
+}
+
+#The values in the stack column of the UndoLog that are not a popped return line.
+NO_STACK_CHANGE = -1
+STACK_PUSH = -2
+
+#The value in the address column of the UndoLog of a step that did not write to memory, the recorded addresses are never negative.
+NO_WRITE = -1
+
+class UndoLog:
+	"""This class contains the undo entries of the last capacity steps in a ring buffer of `array`s, so every step takes the same small amount of memory no matter how large the memory of the platform is.
+	Every entry contains what the step changed:
+	- The instruction pointer and memory pointer before the step.
+	- The address and old value of the single memory cell it wrote, the address is NO_WRITE when nothing was written.
+	  A negative address, like the memory pointer after `LEFT` from address 0, points to the end of the memory just like in the Memory, so it is recorded as the address of that cell from 0 up.
+	- Whether it pushed on the function_call_stack, popped a return line from it or left it alone.
+	"""
+	def __init__(self, capacity : int, cell_width : int):
+		self.capacity = capacity
+		self.instruction_pointers = array("i", bytes(4 * capacity))
+		self.memory_pointers = array("i", bytes(4 * capacity))
+		self.addresses = array("i", bytes(4 * capacity))
+		self.values = array(cellTypeDict[cell_width], bytes(cell_width // 8 * capacity))
+		self.stack = array("i", bytes(4 * capacity))
+
+	def __len__(self):
+		return self.capacity
+
+	def record(self, step : int, instruction_pointer : int, memory_pointer : int, address : int, value : int, stack : int):
+		"""Stores the undo entry of a step, the entry of the step capacity steps earlier is overwritten.
+
+		Args:
+			step (int): The number of the step.
+			instruction_pointer (int): The instruction pointer before the step.
+			memory_pointer (int): The memory pointer before the step.
+			address (int): The memory address the step writes from 0 up, NO_WRITE for none.
+			value (int): The value of that memory address before the step.
+			stack (int): NO_STACK_CHANGE, STACK_PUSH or the return line the step popped.
+		"""
+		slot = step % self.capacity
+		self.instruction_pointers[slot] = instruction_pointer
+		self.memory_pointers[slot] = memory_pointer
+		self.addresses[slot] = address
+		self.values[slot] = value
+		self.stack[slot] = stack
+
+	def undo(self, step : int, platform : Platform):
+		"""Restores the platform to the state before the supplied step.
+
+		Args:
+			step (int): The number of the step to undo.
+			platform (Platform): The platform to change in place.
+		"""
+		slot = step % self.capacity
+		platform.instruction_pointer = self.instruction_pointers[slot]
+		platform.memory_pointer = self.memory_pointers[slot]
+		if self.addresses[slot] != NO_WRITE:
+			platform.memory.cells[self.addresses[slot]] = self.values[slot]
+		if self.stack[slot] == STACK_PUSH:
+			platform.function_call_stack.pop()
+		elif self.stack[slot] != NO_STACK_CHANGE:
+			platform.function_call_stack.append(self.stack[slot])
+
+class ReverseDebugger:
+	"""The ReverseDebugger class runs Controller Code one instruction at a time and can go back to any of the last capacity steps.
+	Going back one step uses the UndoLog, every checkpoint_interval steps a full copy of the state is stored as well so going back far only has to replay the steps after the closest checkpoint.
+	Just like the Profiler the code is executed without superinstructions and counted loops, so every step is a single line.
+	"""
+	def __init__(self, parsed_tokens : List[List[Union[str,int]]], memory_size : int = 128, cell_width : int = 32, capacity : int = 1000000, checkpoint_interval : int = 10000):
+		self.tokens = parsed_tokens
+		self.memory_size = memory_size
+		self.cell_width = cell_width
+		self.checkpoint_interval = checkpoint_interval
+		self.link_table = Linker(parsed_tokens).link()
+		self.log = UndoLog(capacity, cell_width)
+		self.checkpoints : Dict[int, Tuple[int, int, Memory, List[int]]] = {}
+		self.platform = None
+		self.sink = None
+		self.step = 0
+		self.end = 0
+
+	def start(self, input_list : List[int] = [], sink : OutputSink = None):
+		"""Creates a new platform for the supplied input, the code is not executed yet.
+
+		Args:
+			input_list (List[int], optional): The input of the Controller Code. Defaults to [].
+			sink (OutputSink, optional): The sink that receives every value `RB` prints, values are only printed the first time a step is executed. Defaults to a TextSink on the standard output.
+		"""
+		self.sink = sink if sink is not None else TextSink()
+		self.platform = Platform(self.tokens, Memory(self.memory_size, self.cell_width), 0, 1, input_list, self.link_table.jumps, self.__output)
+		self.checkpoints = {}
+		self.step = 0
+		self.end = 0
+
+	def finished(self) -> bool:
+		"""Returns whether the code has reached `BX`.
+
+		Returns:
+			bool: True when the current instruction is `BX`.
+		"""
+		return self.tokens[self.platform.instruction_pointer][0] == "BX"
+
+	def forward(self, count : int = 1) -> int:
+		"""Executes the next count steps, or less when the code reaches `BX` first.
+
+		Args:
+			count (int, optional): The amount of steps. Defaults to 1.
+
+		Returns:
+			int: The number of the current step afterwards.
+		"""
+		platform = self.platform
+		memory = platform.memory
+		for _ in range(count):
+			if platform.instruction_pointer >= len(self.tokens):
+				throw_index_error(platform, None)
+			instruction = self.tokens[platform.instruction_pointer]
+			if instruction[0] == "BX":
+				break
+			if self.step % self.checkpoint_interval == 0:
+				self.__checkpoint()
+			address = writeAddressDict[instruction[0]](platform.memory_pointer, *instruction[1:]) if instruction[0] in writeAddressDict else None
+			stack = STACK_PUSH if instruction[0] == "START" else NO_STACK_CHANGE
+			if instruction[0] == "AB":
+				stack = platform.function_call_stack[-1] if platform.function_call_stack else NO_STACK_CHANGE
+			try:
+				value = memory[address] if address is not None else 0
+				self.log.record(self.step, platform.instruction_pointer, platform.memory_pointer, address % len(memory) if address is not None else NO_WRITE, value, stack)
+				interpreterDict.get(instruction[0])(platform, *instruction[1:])
+			except IndexError:
+				throw_index_error(platform, instruction[0])
+				raise
+			self.step += 1
+			self.end = max(self.end, self.step)
+		self.sink.flush()
+		return self.step
+
+	def backward(self, count : int = 1) -> int:
+		"""Undoes the last count steps, going back further than the oldest step in the UndoLog is not possible.
+
+		Args:
+			count (int, optional): The amount of steps. Defaults to 1.
+
+		Returns:
+			int: The number of the current step afterwards.
+		"""
+		return self.goto(self.step - count)
+
+	def goto(self, step : int) -> int:
+		"""Moves to the state after the supplied amount of steps, steps are numbered from 0 so this is also the state right before that step is executed.
+		Going back either undoes every step in between or restores the closest earlier checkpoint and replays the steps after it, whichever takes less steps.
+
+		Args:
+			step (int): The number of the step.
+
+		Returns:
+			int: The number of the current step afterwards.
+		"""
+		if step < self.oldest():
+			cError("Runtime Error: Step "+str(step)+" is no longer in the undo log, the oldest step is "+str(self.oldest())+".").throw()
+		if step >= self.step:
+			return self.forward(step - self.step)
+		checkpoint = max(filter(lambda checkpoint : self.oldest() <= checkpoint <= step, self.checkpoints), default = None)
+		if checkpoint is not None and step - checkpoint < self.step - step:
+			self.__restore(checkpoint)
+			return self.forward(step - checkpoint)
+		while self.step > step:
+			self.step -= 1
+			self.log.undo(self.step, self.platform)
+		return self.step
+
+	def oldest(self) -> int:
+		"""Returns the number of the oldest step that can still be undone.
+
+		Returns:
+			int: The oldest step.
+		"""
+		return max(0, self.end - len(self.log))
+
+	def __output(self, value : int):
+		"""Passes a printed value to the sink, unless the step is replayed after going back.
+
+		Args:
+			value (int): The value `RB` prints.
+		"""
+		if self.step >= self.end:
+			self.sink.write(value)
+
+	def __checkpoint(self):
+		"""Stores a full copy of the state before the current step and removes the checkpoints that are older than the UndoLog.
+		"""
+		platform = self.platform
+		self.checkpoints[self.step] = (platform.instruction_pointer, platform.memory_pointer, platform.memory.snapshot(), list(platform.function_call_stack))
+		for checkpoint in list(filter(lambda checkpoint : checkpoint < self.oldest(), self.checkpoints)):
+			del self.checkpoints[checkpoint]
+
+	def __restore(self, checkpoint : int):
+		"""Restores the state of a checkpoint, the memory of the checkpoint is copied so it can be restored again later.
+
+		Args:
+			checkpoint (int): The step of the checkpoint.
+		"""
+		instruction_pointer, memory_pointer, memory, call_stack = self.checkpoints[checkpoint]
+		self.platform.instruction_pointer = instruction_pointer
+		self.platform.memory_pointer = memory_pointer
+		self.platform.memory.cells[:] = memory.cells
+		self.platform.function_call_stack[:] = call_stack
+		self.step = checkpoint
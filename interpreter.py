@@ -1,6 +1,13 @@
-from support import cp, syntaxParametersDict
+from linker import Linker
+from memory import Memory
+from optimizer import Optimizer
+from loops import LoopAnalyzer
+from bytecode import Encoder, opcodeNames, OP_LOOP, OP_MOVE, OP_ADD, OP_STORE, OP_XYSELECT, OP_AYSELECT, OP_BYSELECT, OP_RIGHT, OP_LEFT, OP_UP, OP_DOWN, OP_BA, OP_AB, OP_START, OP_SELECT, OP_ZL, OP_LB, OP_RB, OP_AX, OP_XA, OP_XB, OP_XY, OP_AY, OP_BY, OP_YA, OP_YB, OP_YX
 
-from typing import List, Union
+from support import cError
+from sinks import OutputSink, ListSink, TextSink
+
+from typing import List, Union, Any, Callable, Optional
 
 #This dictionary is used to call functions that belong to instructions.
 interpreterDict = {
@@ -24,16 +31,26 @@ interpreterDict = {
 	"YA" : lambda platform, memory_address_a, memory_address_b : YA(platform, memory_address_a, memory_address_b),
 	"YB" : lambda platform, memory_address_a, memory_address_b : YB(platform, memory_address_a, memory_address_b),
 	"YX" : lambda platform, memory_address_a, memory_address_b : YX(platform, memory_address_a, memory_address_b),
-	"BX" : lambda platform : BX(platform)
+	"BX" : lambda platform : BX(platform),
+	"MOVE" : lambda platform, delta, length : MOVE(platform, delta, length),
+	"ADD" : lambda platform, value, length : ADD(platform, value, length),
+	"STORE" : lambda platform, address, value : STORE(platform, address, value),
+	"XYSELECT" : lambda platform, memory_address_a, memory_address_b, line : XYSELECT(platform, memory_address_a, memory_address_b, line),
+	"AYSELECT" : lambda platform, memory_address_a, memory_address_b, line : AYSELECT(platform, memory_address_a, memory_address_b, line),
+	"BYSELECT" : lambda platform, memory_address_a, memory_address_b, line : BYSELECT(platform, memory_address_a, memory_address_b, line),
+	"LOOP" : lambda platform, memory_address_a, memory_address_b, line : XYSELECT(platform, memory_address_a, memory_address_b, line)
 }
 		
 class Platform:
 	"""This class is used to simulate a platform on which can be coded.
 	It has its own memory, instruction list and pointers to both.
 	It also has many "quality of life" functions.
+	Everything `RB` prints is passed to the output function, this is print by default.
 	"""
-	def __init__(self, instructions : List[List[Union[str,int]]], memory : List[int], instruction_pointer : int, memory_pointer : int, input_list : List[int]):
+	def __init__(self, instructions : List[List[Union[str,int]]], memory : Memory, instruction_pointer : int, memory_pointer : int, input_list : List[int], jump_table : List[int], output : Callable[[int], Any] = print):
 		self.instructions = instructions
+		self.output = output
+		self.jump_table = jump_table
 		self.memory = memory
 		self.instruction_pointer = instruction_pointer
 		self.memory_pointer = memory_pointer
@@ -65,6 +82,12 @@ class Platform:
 		"""
 		self.instruction_pointer -= 1
 
+	def jump(self):
+		"""This function sets the instruction pointer to the target of the current instruction in the jump table.
+		The jump table is created once by the Linker so no instructions have to be searched while executing.
+		"""
+		self.instruction_pointer = self.jump_table[self.instruction_pointer]
+
 	def set_instruction_pointer(self, instruction : int):
 		"""Using this function you can set the instruction pointer to a exact value.
 		By doing this you can quickly jump through the code.
@@ -118,39 +141,381 @@ class Platform:
 		"""
 		self.memory[self.memory_pointer] -= 1
 
+class RunResult:
+	"""This class contains the result of running Controller Code with Interpreter.run().
+	- outputs: The values printed by `RB`.
+	- memory: The memory when the code reached `BX`.
+	- value: The value the memory pointer points to at `BX`, the same value the compiled code returns in R0.
+	- memory_pointer: The memory pointer at `BX`.
+	- steps: The amount of executed instructions, a superinstruction counts as one instruction and a counted loop that is calculated at once counts as the superinstructions all of its iterations would have executed, see CountedLoop.steps.
+	"""
+	def __init__(self, outputs : List[int], memory : Memory, value : int, memory_pointer : int, steps : int):
+		self.outputs = outputs
+		self.memory = memory
+		self.value = value
+		self.memory_pointer = memory_pointer
+		self.steps = steps
+
+	def __str__(self):
+		return "RunResult({outputs},\n{value},\n{memory_pointer},\n{steps})".format(
+			outputs = self.outputs,
+			value = self.value,
+			memory_pointer = self.memory_pointer,
+			steps = self.steps
+		)
+
+def exceed_budget(budget : int):
+	"""This function throws the error for code that did not reach `BX` within its instruction budget.
+
+	Args:
+		budget (int): The maximum amount of instructions.
+	"""
+	cError("Runtime Error: The code did not reach `BX` within the budget of "+str(budget)+" instructions.").throw()
+
+#These instructions read or write a memory address or read a input, they are the only instructions that can use a memory address or input that does not exist.
+lookupInstructions = ["UP", "DOWN", "ZL", "RB", "AX", "XA", "XB", "XY", "AY", "BY", "YA", "YB", "YX", "ADD", "STORE", "XYSELECT", "AYSELECT", "BYSELECT", "LOOP"]
+
+def throw_index_error(platform : Platform, instruction : Optional[str]):
+	"""This function throws the error for a IndexError that was raised while executing the instruction the instruction pointer points to.
+	The code can run past its last line when it does not reach `BX` and `AB` can be reached without a `START`, otherwise only the instructions that look up a memory address or input can raise a IndexError.
+	For any other instruction the IndexError is not caused by the code, this function then returns so the caller can raise it again.
+
+	Args:
+		platform (Platform): The state of the platform when the IndexError was raised.
+		instruction (Optional[str]): The name of the instruction, None when the instruction pointer is past the last line.
+	"""
+	if instruction is None:
+		cError("Runtime Error: The code ran past its last line without reaching `BX`, the instruction pointer is at line "+str(platform.instruction_pointer+1)+".").throw()
+	elif instruction == "AB" and not platform.function_call_stack:
+		cError("Runtime Error: The `AB` instruction on line "+str(platform.instruction_pointer+1)+" was reached without a `START`.").throw()
+	elif instruction in lookupInstructions:
+		cError("Runtime Error: The instruction on line "+str(platform.instruction_pointer+1)+" uses a memory address or input that does not exist.").throw()
+
 class Interpreter:
 	"""The Interpreter class executes the instructions in the parsed tokens list. 
 	It is possible to change the size of the memory "stack" but since I've specified 128 in the READM.me it defaults to 128.
 	"""
-	def __init__(self, parsed_tokens : List[List[Union[str,int]]], memory_size = 128):
-		self.tokens = parsed_tokens
+	def __init__(self, parsed_tokens : List[List[Union[str,int]]], memory_size = 128, use_bytecode = True, cell_width = 32, optimize = True):
+		"""The init function optimizes and links the parsed tokens and lowers them to Bytecode once, so this only has to happen a single time no matter how often the code is interpreted.
+
+		Args:
+			parsed_tokens (List[List[Union[str,int]]]): A List of parsed Controller Code tokens
+			memory_size (int, optional): The size of the memory stack. Defaults to 128.
+			use_bytecode (bool, optional): Execute the Bytecode instead of looking up every instruction in the interpreterDict. Defaults to True.
+			cell_width (int, optional): The width of a memory cell in bits, 8, 16 or 32. Defaults to 32 like the words of the compiled code.
+			optimize (bool, optional): Fuse common sequences of instructions into superinstructions using the Optimizer and execute counted loops at once. Defaults to True.
+		"""
+		self.tokens = Optimizer(parsed_tokens).optimize() if optimize else parsed_tokens
+		self.loops = LoopAnalyzer(parsed_tokens, self.tokens).analyze() if optimize else {}
+		for head in self.loops:
+			if self.tokens[head][0] == "XYSELECT":
+				self.tokens[head] = ["LOOP"] + self.tokens[head][1:]
 		self.memory_size = memory_size
+		self.use_bytecode = use_bytecode
+		self.cell_width = cell_width
+		self.link_table = Linker(self.tokens).link()
+		self.bytecode = Encoder(self.tokens, self.link_table).encode()
+		self.inputs = self.bytecode.inputs()
+		self.program = None
 		
-	def interpret(self, input_list : List[int] = []):
+	@classmethod
+	def load(cls, filename : str, memory_size = 128, cell_width = 32, verify = True) -> "Interpreter":
+		"""Creates a Interpreter from a `.cocob` file written by the BinaryWriter, the raw code is not read, lexed, checked, parsed, optimized or linked.
+		The file is mapped in memory and the Bytecode and LinkTable are memoryviews of it, so loading takes about as long as mapping the file.
+		Since the file does not contain the parsed tokens the code is always executed as Bytecode.
+		The code was checked when the file was written, the amount of inputs it needs is stored in the file and checked by interpret().
+
+		Args:
+			filename (str): The name of the `.cocob` file.
+			memory_size (int, optional): The size of the memory stack. Defaults to 128.
+			cell_width (int, optional): The width of a memory cell in bits, 8, 16 or 32. Defaults to 32 like the words of the compiled code.
+			verify (bool, optional): Check the checksum of the file. Defaults to True.
+
+		Returns:
+			Interpreter: The Interpreter of the loaded program.
+		"""
+		from binary import load_binary
+		program = load_binary(filename, verify)
+		interpreter = cls.__new__(cls)
+		interpreter.tokens = None
+		interpreter.loops = program.loops
+		interpreter.memory_size = memory_size
+		interpreter.use_bytecode = True
+		interpreter.cell_width = cell_width
+		interpreter.link_table = program.link_table
+		interpreter.bytecode = program.bytecode
+		interpreter.inputs = program.inputs
+		interpreter.program = program
+		return interpreter
+
+	def interpret(self, input_list : List[int] = [], sink : OutputSink = None):
 		"""This function can be called to start the execution process.
 		It first creates a simulated memory stack to use and then created the platform "on" which we will execute all the code.
+		The values in the memory stack wrap around when they overflow, just like the words of the microcontroller.
 		Note that the platforms memory pointer is initialized on 1 since 0 is reserved for the linker pointer.
+		Every value `RB` prints goes to the sink, by default a TextSink that writes the values to the standard output in large blocks. The sink is flushed before the application closes.
+		The input has to contain every argument a `ZL` instruction uses, just like the Lexer checks for the raw code, so a loaded `.cocob` file gets the same error as its `.coco` file.
 		WARNING: This function is not supposed to ever end. The code has been check and should contain a `BX` instruction which will immediatly close the application.
+
+		Args:
+			input_list (List[int], optional): The input of the Controller Code. Defaults to [].
+			sink (OutputSink, optional): The sink that receives every value `RB` prints. Defaults to a TextSink on the standard output.
 		"""
-		simulated_memory = [0] * self.memory_size
-		platform = Platform(self.tokens, simulated_memory, 0, 1, input_list)
-		self.__execute(platform)
-		
-	def __execute(self, platform : Platform):
-		"""Here the actual code is being executed by constantly find the current instruction in a dictionary that contains the instruction name as a key and the actual functionality as value.
-		Next we find how many parameters the instruction has and then call the current instruction.
-		WARNING: This function is not supposed to ever end. The code has been check and should contain a `BX` instruction which will immediatly close the application.
+		if len(input_list) < self.inputs:
+			cError("Input Error: ZL cannot have more arguments than there are supplied with a maximum of 2, the code needs "+str(self.inputs)+" input(s).").throw()
+		sink = sink if sink is not None else TextSink()
+		simulated_memory = Memory(self.memory_size, self.cell_width)
+		platform = Platform(self.tokens, simulated_memory, 0, 1, input_list, self.link_table.jumps, sink.write)
+		try:
+			if self.use_bytecode:
+				self.__dispatch(platform)
+			else:
+				self.__execute(platform)
+		except IndexError:
+			throw_index_error(platform, self.__instruction(platform.instruction_pointer))
+			raise
+		finally:
+			sink.flush()
+		BX(platform)
+
+	def run(self, input_list : List[int] = [], budget : int = None, sink : OutputSink = None) -> RunResult:
+		"""This function executes the code just like interpret() but returns when the code reaches `BX` instead of closing the application, so the same Interpreter can run many times in one process.
+		Everything `RB` prints is collected in the result, unless another sink is supplied, and every error is raised as a CocoError, see throw_index_error().
+		The budget is checked at every instruction that can jump back or call a function, so code that runs too long is stopped after at most the length of the code extra instructions.
+
+		Args:
+			input_list (List[int], optional): The input of the Controller Code. Defaults to [].
+			budget (int, optional): The maximum amount of instructions to execute. Defaults to None, no maximum.
+			sink (OutputSink, optional): The sink that receives every value `RB` prints, the outputs of the result are only filled by a ListSink. Defaults to a new ListSink.
+
+		Returns:
+			RunResult: The printed values, the memory and the value at the memory pointer when the code reached `BX` and the amount of executed instructions.
+		"""
+		sink = sink if sink is not None else ListSink()
+		simulated_memory = Memory(self.memory_size, self.cell_width)
+		platform = Platform(self.tokens, simulated_memory, 0, 1, input_list, self.link_table.jumps, sink.write)
+		budget = float("inf") if budget is None else budget
+		try:
+			steps = self.__dispatch(platform, budget) if self.use_bytecode else self.__execute(platform, budget)
+		except IndexError:
+			throw_index_error(platform, self.__instruction(platform.instruction_pointer))
+			raise
+		finally:
+			sink.flush()
+		return RunResult(sink.values if isinstance(sink, ListSink) else [], simulated_memory, simulated_memory[platform.memory_pointer], platform.memory_pointer, steps)
+
+	def interpret_batch(self, inputs : Any) -> Any:
+		"""This function executes the code for a whole batch of inputs at the same time using the BatchEngine.
+		All lanes run in lockstep on a 2-D NumPy memory, so NumPy is only needed when this function is used.
+
+		Args:
+			inputs (Any): A N x 2 matrix, a list of lists or NumPy array, every row contains the input of one lane.
+
+		Returns:
+			BatchResult: The values printed by `RB` and the final value, memory and memory pointer of every lane.
+		"""
+		from batch import BatchEngine
+		return BatchEngine(self.bytecode, self.memory_size, self.cell_width).run(inputs)
+
+	def __instruction(self, instruction_pointer : int) -> Optional[str]:
+		"""Returns the name of the instruction at the instruction pointer, the Bytecode is used since a loaded program does not have parsed tokens.
+
+		Args:
+			instruction_pointer (int): The instruction pointer.
+
+		Returns:
+			Optional[str]: The name of the instruction, None when the instruction pointer is past the last line.
+		"""
+		return opcodeNames[self.bytecode.opcodes[instruction_pointer]] if 0 <= instruction_pointer < len(self.bytecode) else None
+
+	def __execute(self, platform : Platform, budget : int = float("inf")) -> int:
+		"""Here the actual code is being executed by constantly finding the current instruction in a dictionary that contains the instruction name as a key and the actual functionality as value.
+		Next the current instruction is called with all of its parameters.
+		Every instruction changes the supplied platform in place so there is only ever one platform, this keeps the memory usage constant and the runtime linear in the amount of executed instructions.
+		The code has been check and should contain a `BX` instruction, when it is reached this function returns without executing it.
+
+		Args:
+			platform (Platform): The platform on which the code will be executed.
+			budget (int, optional): The maximum amount of instructions to execute. Defaults to no maximum.
+
+		Returns:
+			int: The amount of executed instructions.
+		"""
+		instructions = platform.instructions
+		steps = 0
+		while True:
+			instruction = instructions[platform.instruction_pointer]
+			steps += 1
+			if instruction[0] == "BX":
+				return steps
+			if steps > budget:
+				exceed_budget(budget)
+			interpreterDict.get(instruction[0])(platform, *instruction[1:])
+
+	def __dispatch(self, platform : Platform, budget : int = float("inf")) -> int:
+		"""Here the Bytecode is being executed. This does exactly the same as the __execute function but it runs directly over the arrays of the Bytecode.
+		The pointers, memory cells and call stack of the platform are kept in local variables and the opcodes are compared as integers, the most common instructions are checked first.
+		When a result does not fit in a memory cell the array raises a OverflowError before anything is written, that instruction is then executed again with wraparound.
+		The head of a counted loop first applies all iterations of the loop at once and then continues like a normal `XYSELECT`.
+		Every instruction is counted, the budget is only checked by the instructions that can jump back or call a function since all other code runs at most once in a row.
+		When the `BX` instruction is reached the pointers are written back to the platform and this function returns without executing it.
 
 		Args:
-			platform (Platform): [description]
+			platform (Platform): The platform on which the code will be executed.
+			budget (int, optional): The maximum amount of instructions to execute. Defaults to no maximum.
+
+		Returns:
+			int: The amount of executed instructions.
+		"""
+		opcodes = self.bytecode.opcodes
+		operands_a = self.bytecode.operands_a
+		operands_b = self.bytecode.operands_b
+		jumps = self.bytecode.jumps
+		loops = self.loops
+		cell_width = platform.memory.cell_width
+		memory = platform.memory.cells
+		call_stack = platform.function_call_stack
+		inputs = platform.input
+		output = platform.output
+		ip = platform.instruction_pointer
+		mp = platform.memory_pointer
+		steps = 0
+		while True:
+			try:
+				while True:
+					opcode = opcodes[ip]
+					steps += 1
+					if opcode == OP_SELECT:
+						if steps > budget:
+							exceed_budget(budget)
+						ip = jumps[ip]
+					elif opcode == OP_XYSELECT:
+						if steps > budget:
+							exceed_budget(budget)
+						ip = jumps[ip] if memory[operands_a[ip]] == memory[operands_b[ip]] else ip + 2
+					elif opcode == OP_LOOP:
+						steps += loops[ip].run(memory, mp, cell_width) * loops[ip].steps
+						if steps > budget:
+							exceed_budget(budget)
+						ip = jumps[ip] if memory[operands_a[ip]] == memory[operands_b[ip]] else ip + 2
+					elif opcode == OP_UP:
+						memory[mp] += 1
+						ip += 1
+					elif opcode == OP_DOWN:
+						memory[mp] -= 1
+						ip += 1
+					elif opcode == OP_YB:
+						memory[operands_a[ip]] += memory[operands_b[ip]]
+						ip += 1
+					elif opcode == OP_YX:
+						memory[operands_a[ip]] -= memory[operands_b[ip]]
+						ip += 1
+					elif opcode == OP_ADD:
+						memory[mp] += operands_a[ip]
+						ip = jumps[ip]
+					elif opcode == OP_MOVE:
+						mp += operands_a[ip]
+						ip = jumps[ip]
+					elif opcode == OP_XY:
+						ip = ip + 1 if memory[operands_a[ip]] == memory[operands_b[ip]] else jumps[ip]
+					elif opcode == OP_RIGHT:
+						mp += 1
+						ip += 1
+					elif opcode == OP_LEFT:
+						mp -= 1
+						ip += 1
+					elif opcode == OP_AY:
+						ip = ip + 1 if memory[operands_a[ip]] > memory[operands_b[ip]] else jumps[ip]
+					elif opcode == OP_BY:
+						ip = ip + 1 if memory[operands_a[ip]] < memory[operands_b[ip]] else jumps[ip]
+					elif opcode == OP_AYSELECT:
+						if steps > budget:
+							exceed_budget(budget)
+						ip = jumps[ip] if memory[operands_a[ip]] > memory[operands_b[ip]] else ip + 2
+					elif opcode == OP_BYSELECT:
+						if steps > budget:
+							exceed_budget(budget)
+						ip = jumps[ip] if memory[operands_a[ip]] < memory[operands_b[ip]] else ip + 2
+					elif opcode == OP_STORE:
+						mp = operands_a[ip]
+						memory[mp] = operands_b[ip]
+						ip = jumps[ip]
+					elif opcode == OP_YA:
+						memory[operands_a[ip]] *= memory[operands_b[ip]]
+						ip += 1
+					elif opcode == OP_AX:
+						memory[mp] = operands_a[ip]
+						ip += 1
+					elif opcode == OP_XA:
+						memory[mp] = memory[operands_a[ip]]
+						ip += 1
+					elif opcode == OP_XB:
+						memory[operands_a[ip]] = memory[mp]
+						ip += 1
+					elif opcode == OP_LB:
+						mp = operands_a[ip]
+						ip += 1
+					elif opcode == OP_START:
+						if steps > budget:
+							exceed_budget(budget)
+						call_stack.append(ip + 1)
+						ip = jumps[ip]
+					elif opcode == OP_AB:
+						ip = call_stack.pop()
+					elif opcode == OP_BA:
+						ip = jumps[ip]
+					elif opcode == OP_RB:
+						output(memory[mp])
+						ip += 1
+					elif opcode == OP_ZL:
+						memory[operands_b[ip]] = inputs[operands_a[ip]-1]
+						ip += 1
+					else:
+						platform.instruction_pointer = ip
+						platform.memory_pointer = mp
+						return steps
+			except OverflowError:
+				ip = self.__wrap_instruction(platform.memory, ip, mp, inputs)
+			except IndexError:
+				platform.instruction_pointer = ip
+				platform.memory_pointer = mp
+				raise
+
+	def __wrap_instruction(self, memory : Memory, ip : int, mp : int, inputs : List[int]) -> int:
+		"""This function executes a instruction whose result did not fit in a memory cell, the result wraps around just like it does on the microcontroller.
+		Only instructions that write a value can overflow and none of them jump.
+
+		Args:
+			memory (Memory): The memory of the platform.
+			ip (int): The instruction pointer of the instruction that overflowed.
+			mp (int): The memory pointer.
+			inputs (List[int]): The input list of the platform.
+
+		Returns:
+			int: The instruction pointer of the next instruction.
 		"""
-		current_instruction = interpreterDict.get(platform.instructions[platform.instruction_pointer][0])
-		parameterCount =  syntaxParametersDict.get(platform.instructions[platform.instruction_pointer][0])
-		if parameterCount:
-			platform = current_instruction(platform, *platform.instructions[platform.instruction_pointer][1:parameterCount+1])
-		else:
-			platform = current_instruction(platform)
-		self.__execute(cp(platform))
+		opcode = self.bytecode.opcodes[ip]
+		operand_a = self.bytecode.operands_a[ip]
+		operand_b = self.bytecode.operands_b[ip]
+		if opcode == OP_UP:
+			memory[mp] += 1
+		elif opcode == OP_DOWN:
+			memory[mp] -= 1
+		elif opcode == OP_AX:
+			memory[mp] = operand_a
+		elif opcode == OP_ZL:
+			memory[operand_b] = inputs[operand_a-1]
+		elif opcode == OP_YA:
+			memory[operand_a] *= memory[operand_b]
+		elif opcode == OP_YB:
+			memory[operand_a] += memory[operand_b]
+		elif opcode == OP_YX:
+			memory[operand_a] -= memory[operand_b]
+		elif opcode == OP_ADD:
+			memory[mp] += operand_a
+		elif opcode == OP_STORE:
+			memory[operand_a] = operand_b
+		return self.bytecode.jumps[ip]
 		
 
 def RIGHT(platform : Platform)-> Platform:
@@ -161,11 +526,11 @@ def RIGHT(platform : Platform)-> Platform:
 		platform (Platform): The state of the platform.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	platform.next_address()
 	platform.next_instruction()
-	return cp(platform)
+	return platform
 
 def LEFT(platform : Platform)-> Platform:
 	"""Executes the `LEFT` instruction.
@@ -175,11 +540,11 @@ def LEFT(platform : Platform)-> Platform:
 		platform (Platform): The state of the platform.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	platform.previous_address()
 	platform.next_instruction()
-	return cp(platform)
+	return platform
 
 def UP(platform : Platform) -> Platform:
 	"""Executes the `UP` instruction.
@@ -189,11 +554,11 @@ def UP(platform : Platform) -> Platform:
 		platform (Platform): The state of the platform.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	platform.increase_byte()
 	platform.next_instruction()
-	return cp(platform)
+	return platform
 
 def DOWN(platform : Platform) -> Platform:
 	"""Executes the `DOWN` instruction.
@@ -203,25 +568,25 @@ def DOWN(platform : Platform) -> Platform:
 		platform (Platform): The state of the platform.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	platform.decrease_byte()
 	platform.next_instruction()
-	return cp(platform)
+	return platform
 
 def BA(platform : Platform, _ : int) -> Platform:
 	"""Executes the `BA` instruction.
-	Set the instruction pointer to the instruction after the `AB` instruction that belongs to this "function".
+	Set the instruction pointer to the instruction after the `AB` instruction that belongs to this "function", this target is looked up in the jump table.
 
 	Args:
 		platform (Platform): The state of the platform.
 		_ (int): The identifier of the `BA` instruction. Nothing is being done with it.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
-	platform.set_instruction_pointer(platform.instructions.index(["AB"], platform.instruction_pointer)+1)
-	return cp(platform)
+	platform.jump()
+	return platform
 
 def AB(platform : Platform) -> Platform:
 	"""Executes the `AB` instruction.
@@ -231,40 +596,40 @@ def AB(platform : Platform) -> Platform:
 		platform (Platform): The state of the platform.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	platform.set_instruction_pointer(platform.get_linker())
-	return cp(platform)
+	return platform
 	
 def START(platform : Platform, identifier : int) -> Platform:
 	"""Executes the `START` instruction.
 	Set the linker value to the instruction after the current instruction.
-	Then set the instruction pointer to the instruction after the matching `BA` instrcution.
+	Then set the instruction pointer to the instruction after the matching `BA` instrcution, this target is looked up in the jump table.
 
 	Args:
 		platform (Platform): The state of the platform.
 		identifier (int): The identifier of the `BA` instruction to call.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	platform.set_linker(platform.instruction_pointer+1)
-	platform.set_instruction_pointer(platform.instructions.index(["BA",identifier])+1)
-	return cp(platform)
+	platform.jump()
+	return platform
 	
 def SELECT(platform : Platform, line : int) -> Platform:
 	"""Executes the `SELECT` instruction.
-	Set the instruction pointer to the instruction on the supplied line number (+1 because 0 based list).
+	Set the instruction pointer to the instruction on the supplied line number (-1 because 0 based list), this target is looked up in the jump table.
 
 	Args:
 		platform (Platform): The state of the platform.
 		line (int): The line of the instruction to be executed next.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
-	platform.set_instruction_pointer(line -1) # WARNING: For the offset -1
-	return cp(platform)
+	platform.jump()
+	return platform
 	
 def ZL(platform : Platform, argument : int, memory_address : int) -> Platform:
 	"""Executes the `ZL` instruction.
@@ -277,11 +642,11 @@ def ZL(platform : Platform, argument : int, memory_address : int) -> Platform:
 		memory_address (int): The memory address in which you want to store the input argument.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	platform.memory[memory_address] = platform.input[argument-1]
 	platform.next_instruction()
-	return cp(platform)
+	return platform
 	
 def LB(platform : Platform, address : int) -> Platform:
 	"""Executes the `LB` instruction.
@@ -293,26 +658,26 @@ def LB(platform : Platform, address : int) -> Platform:
 		address (int): The memory address to jump to.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	platform.set_address(address)
 	platform.next_instruction()
-	return cp(platform)
+	return platform
 	
 def RB(platform : Platform) -> Platform:
 	"""Executes the `RB` instruction.
-	Print the value that is stored in the memory address the memory pointer is pointing to.
+	Print the value that is stored in the memory address the memory pointer is pointing to, using the output function of the platform.
 	Then move on to the next instruction.
 
 	Args:
 		platform (Platform): The state of the platform.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
-	print(platform.memory[platform.memory_pointer])
+	platform.output(platform.memory[platform.memory_pointer])
 	platform.next_instruction()
-	return cp(platform)
+	return platform
 	
 def AX(platform : Platform, value : int) -> Platform:
 	"""Executes the `AX` instruction.
@@ -323,11 +688,11 @@ def AX(platform : Platform, value : int) -> Platform:
 		platform (Platform): The state of the platform.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	platform.memory[platform.memory_pointer] = value
 	platform.next_instruction()
-	return cp(platform)
+	return platform
 	
 def XA(platform : Platform, memory_address : int) -> Platform:
 	"""Executes the `XA` instruction.
@@ -338,11 +703,11 @@ def XA(platform : Platform, memory_address : int) -> Platform:
 		platform (Platform): The state of the platform.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	platform.memory[platform.memory_pointer] = platform.memory[memory_address]
 	platform.next_instruction()
-	return cp(platform)
+	return platform
 	
 def XB(platform : Platform, memory_address : int) -> Platform:
 	"""Executes the `XB` instruction.
@@ -353,11 +718,11 @@ def XB(platform : Platform, memory_address : int) -> Platform:
 		platform (Platform): The state of the platform.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	platform.memory[memory_address] = platform.memory[platform.memory_pointer]
 	platform.next_instruction()
-	return cp(platform)
+	return platform
 	
 def XY(platform : Platform, memory_address_a : int, memory_address_b : int) -> Platform:
 	"""Executes the `XY` instruction.
@@ -370,13 +735,13 @@ def XY(platform : Platform, memory_address_a : int, memory_address_b : int) -> P
 		memory_address_b (int): The second memory address to compare with.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	if platform.memory[memory_address_a] == platform.memory[memory_address_b]:
 		platform.next_instruction()
 	else:
-		platform.next_instruction(2)
-	return cp(platform)
+		platform.jump()
+	return platform
 	
 def AY(platform : Platform, memory_address_a : int, memory_address_b : int) -> Platform:
 	"""Executes the `AY` instruction.
@@ -389,13 +754,13 @@ def AY(platform : Platform, memory_address_a : int, memory_address_b : int) -> P
 		memory_address_b (int): The second memory address to compare with.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	if platform.memory[memory_address_a] > platform.memory[memory_address_b]:
 		platform.next_instruction()
 	else:
-		platform.next_instruction(2)
-	return cp(platform)
+		platform.jump()
+	return platform
 	
 def BY(platform : Platform, memory_address_a : int, memory_address_b : int) -> Platform:
 	"""Executes the `AY` instruction.
@@ -408,13 +773,13 @@ def BY(platform : Platform, memory_address_a : int, memory_address_b : int) -> P
 		memory_address_b (int): The second memory address to compare with.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	if platform.memory[memory_address_a] < platform.memory[memory_address_b]:
 		platform.next_instruction()
 	else:
-		platform.next_instruction(2)
-	return cp(platform)
+		platform.jump()
+	return platform
 
 def YA(platform : Platform, memory_address_a : int, memory_address_b : int) -> Platform:
 	"""Executes the `YA` instruction.
@@ -428,11 +793,11 @@ def YA(platform : Platform, memory_address_a : int, memory_address_b : int) -> P
 		memory_address_c (int): The memory address of the value with which memory address b wil be multiplied.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	platform.memory[memory_address_a] *= platform.memory[memory_address_b]
 	platform.next_instruction()
-	return cp(platform)
+	return platform
 	
 def YB(platform : Platform, memory_address_a : int, memory_address_b : int) -> Platform:
 	"""Executes the `YB` instruction.
@@ -445,11 +810,11 @@ def YB(platform : Platform, memory_address_a : int, memory_address_b : int) -> P
 		memory_address_b (int): The memory address of the value which will be added to the value of memory address a.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	platform.memory[memory_address_a] += platform.memory[memory_address_b]
 	platform.next_instruction()
-	return cp(platform)
+	return platform
 	
 def YX(platform : Platform, memory_address_a : int, memory_address_b : int) -> Platform:
 	"""Executes the `YX` instruction.
@@ -462,11 +827,11 @@ def YX(platform : Platform, memory_address_a : int, memory_address_b : int) -> P
 		memory_address_b (int): The memory address of the value which will be subtracted from the value of memory address a.
 
 	Returns:
-		Platform: A deepcopy of the state of the platform after this instruction.
+		Platform: The state of the platform after this instruction, it is changed in place.
 	"""
 	platform.memory[memory_address_a] -= platform.memory[memory_address_b]
 	platform.next_instruction()
-	return cp(platform)
+	return platform
 	
 def BX(_ : Platform):
 	"""Executes the `BX` instruction.
@@ -475,4 +840,109 @@ def BX(_ : Platform):
 	Args:
 		_ (Platform): The state of the platform.
 	"""
-	exit()
\ No newline at end of file
+	exit()
+def MOVE(platform : Platform, delta : int, length : int) -> Platform:
+	"""Executes the `MOVE` superinstruction, a sequence of `RIGHT` and `LEFT` instructions.
+	Move the memory pointer delta addresses and go to the instruction after the sequence.
+
+	Args:
+		platform (Platform): The state of the platform.
+		delta (int): The amount of addresses to move, negative to move to previous addresses.
+		length (int): The amount of instructions in the sequence. The jump table already contains the next instruction.
+
+	Returns:
+		Platform: The state of the platform after this instruction, it is changed in place.
+	"""
+	platform.set_address(platform.memory_pointer + delta)
+	platform.jump()
+	return platform
+
+def ADD(platform : Platform, value : int, length : int) -> Platform:
+	"""Executes the `ADD` superinstruction, a sequence of `UP` and `DOWN` instructions.
+	Add the value to the memory address the memory pointer is pointing to and go to the instruction after the sequence.
+
+	Args:
+		platform (Platform): The state of the platform.
+		value (int): The value to add, negative to subtract.
+		length (int): The amount of instructions in the sequence. The jump table already contains the next instruction.
+
+	Returns:
+		Platform: The state of the platform after this instruction, it is changed in place.
+	"""
+	platform.memory[platform.memory_pointer] += value
+	platform.jump()
+	return platform
+
+def STORE(platform : Platform, address : int, value : int) -> Platform:
+	"""Executes the `STORE` superinstruction, `LB address` followed by `AX value`.
+	Set the memory pointer to the address and store the value there.
+
+	Args:
+		platform (Platform): The state of the platform.
+		address (int): The memory address to jump to.
+		value (int): The value to store.
+
+	Returns:
+		Platform: The state of the platform after this instruction, it is changed in place.
+	"""
+	platform.set_address(address)
+	platform.memory[address] = value
+	platform.jump()
+	return platform
+
+def XYSELECT(platform : Platform, memory_address_a : int, memory_address_b : int, line : int) -> Platform:
+	"""Executes the `XYSELECT` superinstruction, `XY a b` followed by `SELECT line`.
+	If the values in memory address a and b are equal jump to the line, otherwise move to the instruction after the `SELECT`.
+
+	Args:
+		platform (Platform): The state of the platform.
+		memory_address_a (int): The first memory address to compare with.
+		memory_address_b (int): The second memory address to compare with.
+		line (int): The line to jump to. The jump table already contains this instruction.
+
+	Returns:
+		Platform: The state of the platform after this instruction, it is changed in place.
+	"""
+	if platform.memory[memory_address_a] == platform.memory[memory_address_b]:
+		platform.jump()
+	else:
+		platform.next_instruction(2)
+	return platform
+
+def AYSELECT(platform : Platform, memory_address_a : int, memory_address_b : int, line : int) -> Platform:
+	"""Executes the `AYSELECT` superinstruction, `AY a b` followed by `SELECT line`.
+	If the value in memory address a is larger than the value in memory address b jump to the line, otherwise move to the instruction after the `SELECT`.
+
+	Args:
+		platform (Platform): The state of the platform.
+		memory_address_a (int): The first memory address to compare with.
+		memory_address_b (int): The second memory address to compare with.
+		line (int): The line to jump to. The jump table already contains this instruction.
+
+	Returns:
+		Platform: The state of the platform after this instruction, it is changed in place.
+	"""
+	if platform.memory[memory_address_a] > platform.memory[memory_address_b]:
+		platform.jump()
+	else:
+		platform.next_instruction(2)
+	return platform
+
+def BYSELECT(platform : Platform, memory_address_a : int, memory_address_b : int, line : int) -> Platform:
+	"""Executes the `BYSELECT` superinstruction, `BY a b` followed by `SELECT line`.
+	If the value in memory address a is smaller than the value in memory address b jump to the line, otherwise move to the instruction after the `SELECT`.
+
+	Args:
+		platform (Platform): The state of the platform.
+		memory_address_a (int): The first memory address to compare with.
+		memory_address_b (int): The second memory address to compare with.
+		line (int): The line to jump to. The jump table already contains this instruction.
+
+	Returns:
+		Platform: The state of the platform after this instruction, it is changed in place.
+	"""
+	if platform.memory[memory_address_a] < platform.memory[memory_address_b]:
+		platform.jump()
+	else:
+		platform.next_instruction(2)
+	return platform
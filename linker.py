@@ -0,0 +1,61 @@
+from typing import List, Union, Dict, Tuple
+
+from optimizer import instruction_length
+
+#These instructions skip the next instruction when their comparison fails.
+conditionalInstructions = ["XY", "AY", "BY"]
+
+class LinkTable:
+	"""This class contains all of the control flow of a parsed Controller Code program, resolved once when the program is loaded.
+	The jumps list is indexed by instruction pointer and contains the instruction pointer a instruction jumps to:
+	- `BA` jumps to the instruction after its matching `AB`, this is how the body of a function is skipped.
+	- `START` jumps to the instruction after the matching `BA`, the entry of the function.
+	- `SELECT` jumps to the instruction on the supplied line.
+	- `XY`, `AY` and `BY` jump over the next instruction when their comparison fails.
+	- `AB` returns to the linker value so it does not have a static target, it contains -1.
+	- Superinstructions from the Optimizer continue after the last instruction they replace, `XYSELECT`, `AYSELECT`, `BYSELECT` and `LOOP` jump to their line.
+	Every other instruction simply continues with the next instruction.
+	"""
+	def __init__(self, jumps : List[int], functions : Dict[int, Tuple[int, int]]):
+		self.jumps = jumps
+		self.functions = functions
+
+	def __str__(self):
+		return "LinkTable({jumps},\n{functions})".format(
+			jumps = self.jumps,
+			functions = self.functions
+		)
+
+class Linker:
+	"""The Linker class resolves all the jumps in parsed Controller Code so nobody has to search through the instructions while executing or compiling them.
+	"""
+	def __init__(self, parsed_tokens : List[List[Union[str,int]]]):
+		self.tokens = parsed_tokens
+
+	def link(self) -> LinkTable:
+		"""This function walks over the parsed tokens once and creates a LinkTable.
+		The code has been checked by the Lexer so every `BA` has a matching `AB` and every `START` has a existing identifier.
+
+		Returns:
+			LinkTable: The resolved jumps and the start and end of every function.
+		"""
+		jumps = list(map(lambda index, instruction : index + instruction_length(instruction), range(len(self.tokens)), self.tokens))
+		functions = {}
+		function_start = None
+		for index, instruction in enumerate(self.tokens):
+			if instruction[0] == "BA":
+				function_start = index
+			elif instruction[0] == "AB":
+				jumps[index] = -1
+				if function_start is not None:
+					jumps[function_start] = index + 1
+					functions[self.tokens[function_start][1]] = (function_start, index)
+					function_start = None
+			elif instruction[0] in ["SELECT", "XYSELECT", "AYSELECT", "BYSELECT", "LOOP"]:
+				jumps[index] = instruction[-1] - 1 # WARNING: For the offset -1
+			elif instruction[0] in conditionalInstructions:
+				jumps[index] = index + 2
+		for index, instruction in enumerate(self.tokens):
+			if instruction[0] == "START":
+				jumps[index] = functions[instruction[1]][0] + 1
+		return LinkTable(jumps, functions)
@@ -0,0 +1,127 @@
+from array import array
+from typing import List, Union, Dict, Tuple
+
+from memory import wrap
+from optimizer import instruction_length
+
+#This dictionary contains the change `UP` and `DOWN` make to the induction cell of a loop.
+inductionDict = {
+	"UP":1,
+	"DOWN":-1
+}
+
+class CountedLoop:
+	"""This class contains a counted loop that was found by the LoopAnalyzer, it has the following form:
+	- `XY a b` on the head line, one of a and b is the induction cell and the other the limit.
+	- `SELECT exit` to leave the loop when both are equal.
+	- A body of only `UP`, `DOWN`, `YB` and `YX` instructions.
+	- `SELECT head` back to the `XY` instruction.
+	The induction cell is the memory address the memory pointer points to, `UP` and `DOWN` change it by 1 every time.
+	The accumulators are updated by `YB` and `YX` with either the induction cell or a cell that does not change during the loop.
+	Every iteration counts as steps (super)instructions, the amount the Interpreter would execute for it without the counted loop, see LoopAnalyzer.analyze().
+	"""
+	def __init__(self, head : int, compare : Tuple[int, int], body : List[List[Union[str,int]]], steps : int):
+		self.head = head
+		self.compare = compare
+		self.body = body
+		self.steps = steps
+		self.delta = sum(map(lambda instruction : inductionDict.get(instruction[0], 0), body))
+
+	def __str__(self):
+		return "CountedLoop({head},\n{compare},\n{body},\n{steps})".format(
+			head = self.head,
+			compare = self.compare,
+			body = self.body,
+			steps = self.steps
+		)
+
+	def run(self, memory : array, memory_pointer : int, cell_width : int) -> int:
+		"""This function applies all the iterations of the loop at once, the state afterwards is exactly the state the loop leaves behind at its `XY` instruction when both cells are equal.
+		When the loop does not have the right form for the current memory pointer nothing happens, the loop is then simply executed instruction by instruction.
+		Every value wraps around, so the amount of iterations is also calculated the way the microcontroller would count them.
+
+		Args:
+			memory (array): The memory cells.
+			memory_pointer (int): The memory pointer when the loop starts, this is the induction cell.
+			cell_width (int): The width of a memory cell in bits.
+
+		Returns:
+			int: The amount of iterations that have been applied, 0 when nothing happened.
+		"""
+		if memory_pointer not in self.compare or self.delta not in (1, -1) or self.compare[0] == self.compare[1]:
+			return 0
+		limit = self.compare[1] if self.compare[0] == memory_pointer else self.compare[0]
+		accumulators = set(map(lambda instruction : instruction[1], filter(lambda instruction : instruction[0] in ["YB", "YX"], self.body)))
+		sources = set(map(lambda instruction : instruction[2], filter(lambda instruction : instruction[0] in ["YB", "YX"], self.body)))
+		if memory_pointer in accumulators or limit in accumulators or accumulators & sources:
+			return 0
+		start = memory[memory_pointer]
+		iterations = ((memory[limit] - start) * self.delta) % (1 << cell_width)
+		if iterations == 0:
+			return 0
+		results = dict(map(lambda accumulator : (accumulator, memory[accumulator]), accumulators))
+		offset = 0
+		for instruction in self.body:
+			if instruction[0] in inductionDict:
+				offset += inductionDict[instruction[0]]
+				continue
+			if instruction[2] == memory_pointer:
+				total = iterations * (start + offset) + self.delta * iterations * (iterations - 1) // 2
+			else:
+				total = iterations * memory[instruction[2]]
+			results[instruction[1]] += total if instruction[0] == "YB" else -total
+		for accumulator, value in results.items():
+			memory[accumulator] = wrap(value, cell_width)
+		memory[memory_pointer] = wrap(start + iterations * self.delta, cell_width)
+		return iterations
+
+class LoopAnalyzer:
+	"""The LoopAnalyzer class finds counted loops in parsed Controller Code, so the Interpreter can execute them in one go instead of iteration by iteration.
+	"""
+	def __init__(self, parsed_tokens : List[List[Union[str,int]]], optimized_tokens : List[List[Union[str,int]]]):
+		"""The init function will ask the user to supply the parsed Controller Code tokens and the tokens the Optimizer created of them.
+
+		Args:
+			parsed_tokens (List[List[Union[str,int]]]): A List of parsed Controller Code tokens
+			optimized_tokens (List[List[Union[str,int]]]): The List the Optimizer returned for the same tokens, it is used to count the steps of every iteration.
+		"""
+		self.tokens = parsed_tokens
+		self.optimized_tokens = optimized_tokens
+
+	def analyze(self) -> Dict[int, CountedLoop]:
+		"""This function looks at every `SELECT` that jumps back to a `XY` instruction and checks whether the loop between them is a counted loop.
+		Whether the memory pointer points to the induction cell is only known while executing, so that is checked by CountedLoop.run().
+		The steps of a iteration are counted in the optimized tokens: the `XYSELECT` at the head and every (super)instruction from the body up to and including the `SELECT` back.
+		A run of `UP` and `DOWN` is only fused into a single `ADD` when none of its lines is jumped to, so the body can take more steps than its runs.
+
+		Returns:
+			Dict[int, CountedLoop]: The counted loops with the index of their `XY` instruction as key.
+		"""
+		loops = {}
+		for index, instruction in enumerate(self.tokens):
+			if instruction[0] != "SELECT":
+				continue
+			head = instruction[1] - 1 # WARNING: For the offset -1
+			if head < 0 or head + 2 > index or self.tokens[head][0] != "XY" or self.tokens[head+1][0] != "SELECT":
+				continue
+			body = self.tokens[head+2:index]
+			if all(map(lambda line : line[0] in ["UP", "DOWN", "YB", "YX"], body)):
+				loops[head] = CountedLoop(head, tuple(self.tokens[head][1:3]), body, self.__steps(head + 2, index))
+		return loops
+
+	def __steps(self, first : int, last : int) -> int:
+		"""This function counts the (super)instructions the Interpreter executes for a iteration of a loop.
+
+		Args:
+			first (int): The index of the first instruction of the body.
+			last (int): The index of the `SELECT` back to the head.
+
+		Returns:
+			int: The amount of (super)instructions from the first instruction up to and including the last, plus 1 for the head.
+		"""
+		steps = 1
+		index = first
+		while index <= last:
+			steps += 1
+			index += instruction_length(self.optimized_tokens[index])
+		return steps
@@ -3,61 +3,27 @@
 .align 4
 .global loopysum
 
-l_1:
 f_1:
 PUSH {LR}
-l_2:
 SUB R4, #4
-l_3:
 MOV R0, #0
 STR R0, [R4]
-l_4:
 SUB R4, #4
-l_5:
 MOV R0, #0
 STR R0, [R4]
-l_6:
-MOV R0, #1
-MOV R1, #4
-MUL R0, R0, R1
-SUB R0, R5, R0
-MOV R4, R0
+SUB R4, R5, #4
+LDR R6, [R5, #-4]
+LDR R7, [R5, #-8]
 l_7:
-MOV R0, #1
-MOV R3, #4
-MUL R0, R0, R3
-SUB R0, R5, R0
-MOV R1, #3
-MOV R3, #4
-MUL R1, R1, R3
-SUB R1, R5, R1
-LDR R0, [R0]
-LDR R1, [R1]
-CMP R0, R1
-BEQ l_8
-BNE l_9
-l_8:
-B l_12
-l_9:
-MOV R0, #2
-MOV R3, #4
-MUL R0, R0, R3
-SUB R0, R5, R0
-MOV R1, #1
-MOV R3, #4
-MUL R1, R1, R3
-SUB R1, R5, R1
-LDR R2, [R0]
-LDR R1, [R1]
-ADD R2, R1
-STR R2, [R0]
-l_10:
-LDR R0, [R4]
-SUB R0, #1
-STR R0, [R4]
-l_11:
+LDR R1, [R5, #-12]
+CMP R6, R1
+BEQ l_7_12
+ADD R7, R6
+SUB R6, #1
 B l_7
-l_12:
+l_7_12:
+STR R6, [R5, #-4]
+STR R7, [R5, #-8]
 POP {PC}
 
 loopysum:
@@ -66,25 +32,12 @@ MOV R4, SP
 MOV R5, SP
 SUB R4, #4
 SUB SP, #256
-l_13:
-MOV R2, #1
-MOV R3, #4
-MUL R2, R2, R3
-SUB R2, R5, R2
-STR R0, [R2]
-l_14:
+STR R0, [R5, #-4]
 BL f_1
-l_15:
-MOV R0, #2
-MOV R3, #4
-MUL R0, R0, R3
-SUB R0, R5, R0
-LDR R1, [R0]
+LDR R1, [R5, #-8]
 STR R1, [R4]
-l_16:
-LDR R0, [R4]
+MOV R0, R1
 BL print
-l_17:
 LDR R0, [R4]
 MOV SP, R5
 POP {R4,R5,R6,R7,PC}
\ No newline at end of file
@@ -0,0 +1,93 @@
+from array import array
+from typing import List, Any
+
+#This dictionary contains the array typecode that belongs to every supported cell width in bits.
+cellTypeDict = {
+	8 : "b",
+	16 : "h",
+	32 : "i"
+}
+
+def wrap(value : int, cell_width : int) -> int:
+	"""This function wraps a integer around to a signed integer of the supplied width, the same way the microcontroller does when a value overflows.
+
+	Args:
+		value (int): The value to wrap.
+		cell_width (int): The width of a memory cell in bits.
+
+	Returns:
+		int: The value as a signed integer of cell_width bits.
+	"""
+	half = 1 << (cell_width - 1)
+	return ((value + half) & ((1 << cell_width) - 1)) - half
+
+class Memory:
+	"""This class simulates the memory stack of the microcontroller.
+	The cells are stored in a `array` of signed integers of a fixed width, 32 bits like the words of the compiled code by default.
+	Every value that is written using this class wraps around just like it does on the microcontroller.
+	The cells can also be used directly, writing a value that does not fit in a cell to the array raises a OverflowError.
+	"""
+	def __init__(self, size : int, cell_width : int = 32):
+		self.cell_width = cell_width
+		self.cells = array(cellTypeDict[cell_width], bytes(size * cell_width // 8))
+
+	def __str__(self):
+		return "Memory({cells})".format(
+			cells = self.cells.tolist()
+		)
+
+	def __len__(self):
+		return len(self.cells)
+
+	def __getitem__(self, address : int) -> int:
+		return self.cells[address]
+
+	def __setitem__(self, address : int, value : int):
+		self.cells[address] = wrap(value, self.cell_width)
+
+	def wrap(self, value : int) -> int:
+		"""This function wraps a integer around so it fits in a cell of this memory.
+
+		Args:
+			value (int): The value to wrap.
+
+		Returns:
+			int: The wrapped value.
+		"""
+		return wrap(value, self.cell_width)
+
+	def snapshot(self) -> "Memory":
+		"""This function creates a copy of the memory, since the cells are a single array this is a single copy of bytes.
+
+		Returns:
+			Memory: A copy of this memory.
+		"""
+		copy = Memory(0, self.cell_width)
+		copy.cells = array(self.cells.typecode, self.cells)
+		return copy
+
+	def tolist(self) -> List[int]:
+		"""Returns the values of all cells.
+
+		Returns:
+			List[int]: A list with the value of every cell.
+		"""
+		return self.cells.tolist()
+
+	def size(self) -> int:
+		"""Returns the amount of bytes the cells take in memory.
+
+		Returns:
+			int: The amount of bytes of the cells.
+		"""
+		return self.cells.itemsize * len(self.cells)
+
+	def numpy(self) -> Any:
+		"""Returns the cells as a NumPy array that shares its memory with this memory, so nothing is copied.
+		NumPy is only imported when this function is used.
+
+		Returns:
+			numpy.ndarray: The cells as a NumPy array of signed integers.
+		"""
+		import numpy
+		return numpy.frombuffer(self.cells, dtype = "int"+str(self.cell_width))
@@ -0,0 +1,99 @@
+from typing import List, Union, Set
+
+#This dictionary contains the superinstructions the Optimizer can create and the amount of parameters they have.
+#A superinstruction replaces the first instruction of a sequence, the other instructions of the sequence stay in the list so every line keeps its number.
+# - MOVE delta length: A sequence of `RIGHT` and `LEFT` instructions, the memory pointer moves delta addresses.
+# - ADD value length: A sequence of `UP` and `DOWN` instructions, value is added to the memory address the memory pointer is pointing to.
+# - STORE address value: `LB address` followed by `AX value`.
+# - XYSELECT, AYSELECT, BYSELECT a b line: `XY a b`, `AY a b` or `BY a b` followed by `SELECT line`.
+# - LOOP a b line: A `XYSELECT` that is the head of a counted loop, this one is only created by the Interpreter.
+superinstructionParametersDict = {
+	"MOVE":2,
+	"ADD":2,
+	"STORE":2,
+	"XYSELECT":3,
+	"AYSELECT":3,
+	"BYSELECT":3,
+	"LOOP":3
+}
+
+#This dictionary contains the change every instruction in a MOVE or ADD sequence makes.
+stepDict = {
+	"RIGHT":1,
+	"LEFT":-1,
+	"UP":1,
+	"DOWN":-1
+}
+
+def instruction_length(instruction : List[Union[str,int]]) -> int:
+	"""Returns the amount of lines a (super)instruction takes.
+
+	Args:
+		instruction (List[Union[str,int]]): A parsed instruction with its parameters.
+
+	Returns:
+		int: The amount of lines, 1 for every normal instruction.
+	"""
+	if instruction[0] in ["MOVE", "ADD"]:
+		return instruction[2]
+	elif instruction[0] in superinstructionParametersDict:
+		return 2
+	return 1
+
+class Optimizer:
+	"""The Optimizer class fuses common sequences of parsed instructions into superinstructions, so they can be executed or compiled as a single instruction.
+	A sequence is only fused when none of its instructions except the first can be jumped to, otherwise a jump would land in the middle of a superinstruction.
+	"""
+	def __init__(self, parsed_tokens : List[List[Union[str,int]]]):
+		self.tokens = parsed_tokens
+
+	def optimize(self) -> List[List[Union[str,int]]]:
+		"""This function creates a new list of parsed instructions in which the sequences are replaced by superinstructions.
+		The list has the same length as the parsed tokens, the first instruction of a sequence is replaced and the rest is left as it is.
+
+		Returns:
+			List[List[Union[str,int]]]: The optimized list of instructions.
+		"""
+		targets = self.__find_targets()
+		optimized = list(map(list, self.tokens))
+		index = 0
+		while index < len(self.tokens):
+			instruction = self.tokens[index][0]
+			if instruction in stepDict:
+				end = index + 1
+				while end < len(self.tokens) and end not in targets and self.tokens[end][0] in stepDict and (self.tokens[end][0] in ["RIGHT", "LEFT"]) == (instruction in ["RIGHT", "LEFT"]):
+					end += 1
+				if end - index > 1:
+					value = sum(map(lambda line : stepDict[line[0]], self.tokens[index:end]))
+					optimized[index] = ["MOVE" if instruction in ["RIGHT", "LEFT"] else "ADD", value, end - index]
+				index = end
+				continue
+			if index + 1 < len(self.tokens) and index + 1 not in targets:
+				next_instruction = self.tokens[index+1]
+				if instruction == "LB" and next_instruction[0] == "AX":
+					optimized[index] = ["STORE", self.tokens[index][1], next_instruction[1]]
+					index += 2
+					continue
+				elif instruction in ["XY", "AY", "BY"] and next_instruction[0] == "SELECT":
+					optimized[index] = [instruction+"SELECT"] + self.tokens[index][1:] + [next_instruction[1]]
+					index += 2
+					continue
+			index += 1
+		return optimized
+
+	def __find_targets(self) -> Set[int]:
+		"""This function finds the index of every instruction that can be reached by something else than the instruction before it.
+		These are the lines `SELECT` jumps to, the instructions `XY`, `AY` and `BY` skip to, the start of every function, the instruction after every function and the instruction after every `START`, where `AB` returns to.
+
+		Returns:
+			Set[int]: The indexes of all instructions that can be jumped to.
+		"""
+		targets = set()
+		for index, instruction in enumerate(self.tokens):
+			if instruction[0] == "SELECT":
+				targets.add(instruction[1] - 1) # WARNING: For the offset -1
+			elif instruction[0] in ["XY", "AY", "BY"]:
+				targets.add(index + 2)
+			elif instruction[0] in ["BA", "AB", "START"]:
+				targets.add(index + 1)
+		return targets
@@ -1,43 +1,31 @@
-from typing import List, Union
+from itertools import islice
+from typing import List, Union, Iterable, Iterator
 
-from support import cp, syntaxParametersDict
+from lexer import Token
+from support import syntaxParametersDict
 
 class Parser:
     """The Parser class is used to parse tokenized Controller Code.
+    The tokens can be a list or any other iterable, like the tokens `Lexer.lex()` yields, so lexing and parsing can happen at the same time.
     """
-    def __init__(self, tokens):
+    def __init__(self, tokens : Iterable[Union[str,int,Token]]):
         self.tokens = tokens
-        
+
     def parse(self) -> List[List[Union[str,int]]]:
         """This function parses the tokenized Controller Code.
 
         Returns:
             [List[List[Union[str,int]]]]: A list of parsed tokens. Each item in the list is a instructions with it's parameters.
         """
-        return self.__create_list(cp(self.tokens))
-        
-    def __create_list(self, tokens : List[Union[str,int]]) -> List[List[Union[str,int]]]:
-        """This function recursively creates the actial list of instructions.
-
-        Args:
-            tokens (List[Union[str,int]]): The Lexed tokens from which we wil create a Parsed list containing all the instructions with their parameters.
-
-        Returns:
-            List[List[Union[str,int]]]: A list of lists with instructions and their parameters.
-        """
-        if tokens:
-            return [self.__add_instruction(cp(tokens[:1+syntaxParametersDict.get(tokens[0])]))] + self.__create_list(cp(tokens[1+syntaxParametersDict.get(tokens[0]):]))
-        return []
-        
-    def __add_instruction(self, tokens : List[Union[str,int]]) -> List[Union[str,int]]:
-        """This function adds the actual line of a instruction to the list.
+        return list(self.instructions())
 
-        Args:
-            tokens (List[Union[str,int]]): The list of tokens of which the function will get the instructions and parameters.   
+    def instructions(self) -> Iterator[List[Union[str,int]]]:
+        """This function walks over the tokens once and yields every instruction with its parameters as soon as all of them have been read.
+        Only the current instruction is kept in memory, so this takes the same amount of memory no matter how long the code is.
 
         Returns:
-            List[Union[str,int]]: A List with a single instruction and it's parameters.
+            Iterator[List[Union[str,int]]]: Every instruction with its parameters.
         """
-        if tokens:
-            return tokens[:syntaxParametersDict.get(tokens[0])+1]
-        return []
\ No newline at end of file
+        tokens = iter(map(lambda token : token.value if isinstance(token, Token) else token, self.tokens))
+        for instruction in tokens:
+            yield [instruction] + list(islice(tokens, syntaxParametersDict.get(instruction)))
@@ -0,0 +1,236 @@
+from functools import lru_cache
+from collections import Counter
+from typing import List, Dict, Callable, Iterable, Iterator
+
+from support import adjust
+
+#This dictionary contains the outcomes of a comparison every branch instruction jumps on, `B` always jumps.
+#Two branches with no outcome in common can never both jump after the same comparison.
+conditionDict = {
+	"B" : {"LT", "EQ", "GT"},
+	"BEQ" : {"EQ"},
+	"BNE" : {"LT", "GT"},
+	"BGT" : {"GT"},
+	"BGE" : {"EQ", "GT"},
+	"BLT" : {"LT"},
+	"BLE" : {"LT", "EQ"}
+}
+
+#This dictionary contains the branch instruction that jumps on exactly the other outcomes of a comparison.
+inverseDict = {
+	"BEQ" : "BNE",
+	"BNE" : "BEQ",
+	"BGT" : "BLE",
+	"BLE" : "BGT",
+	"BLT" : "BGE",
+	"BGE" : "BLT"
+}
+
+@lru_cache(maxsize = 4096)
+def instruction_size(line : str) -> int:
+	"""Returns the amount of bytes a line of assembly code takes on a Cortex-M with Thumb-2.
+	Labels and directives do not take any bytes, most instructions take 2 bytes and the instructions that need a larger immediate value or a negative offset take 4 bytes.
+
+	Args:
+		line (str): A line of assembly code.
+
+	Returns:
+		int: The amount of bytes.
+	"""
+	if not line or line.endswith(":") or line.startswith("."):
+		return 0
+	operation, _, operands = line.partition(" ")
+	values = list(map(lambda operand : int(operand.strip("#]")), filter(lambda operand : "#" in operand, operands.split(", "))))
+	if operation == "BL" or (operation in ["LDR", "STR"] and values and values[0] < 0):
+		return 4
+	if operation in ["ADD", "SUB"] and operands.count(",") == 2 and values and values[0] > 7:
+		return 4
+	if operation in ["MOV", "ADD", "SUB"] and values and values[0] > 255 and not operands.startswith("SP"):
+		return 4
+	return 2
+
+class Peephole:
+	"""The Peephole class improves the assembly code the Compiler creates by looking at a few lines at a time:
+	- A branch to the line right after it is removed, also when a branch with the opposite condition is in between, like `BEQ l_8` followed by `BNE l_9` before `l_8`.
+	- A conditional branch over a `B` is replaced by a single branch with the inverse condition, `BEQ l_8` and `B l_9` before `l_8` become `BNE l_9`.
+	- Labels that are not jumped to are removed, so more instructions end up next to each other.
+	- Consecutive additions and subtractions of the memory pointer in R4 are merged.
+	- A value that is loaded right after it was stored, or moved back right after it was moved, is not loaded or moved again.
+	The labels that are jumped to are only known after all lines have been seen, so the lines are created twice and never kept: the first time the branches to every label are counted, the second time the branches are removed and inverted and the lines are passed on right away.
+	A branch is only removed or inverted when the label it jumps to arrives, so when a label is passed on it is known how many branches to it are left and it is removed when that is none.
+	"""
+	def __init__(self, lines : Callable[[], Iterable[str]]):
+		"""The init function will ask the user to supply a function that creates the lines of assembly code, it is called twice for every call of optimize().
+
+		Args:
+			lines (Callable[[], Iterable[str]]): The function that creates the lines.
+		"""
+		self.lines = lines
+		self.targets : Dict[str, int] = Counter()
+		self.removed : Dict[str, int] = Counter()
+		self.before : Dict[str, int] = {}
+		self.after : Dict[str, int] = {}
+
+	def __str__(self):
+		return "Peephole({before},\n{after})".format(
+			before = self.before,
+			after = self.after
+		)
+
+	def optimize(self) -> Iterator[str]:
+		"""This function yields the optimized lines and measures the size of every function before and after.
+		Only the branches to every label are counted in between, the lines are created again to optimize them, so the memory it takes does not grow with the amount of lines.
+
+		Returns:
+			Iterator[str]: The optimized lines.
+		"""
+		self.before = {}
+		self.after = {}
+		self.targets = self.__targets(self.__measure(self.lines(), self.before))
+		self.removed = Counter()
+		yield from self.__measure(self.__merge(self.__labels(self.__branches(self.lines()))), self.after)
+
+	def saved(self) -> Dict[str, int]:
+		"""Returns the amount of bytes the Peephole saved in every function, the main code has the name of the global label.
+
+		Returns:
+			Dict[str, int]: The functions with their saved bytes.
+		"""
+		return dict(map(lambda function : (function, self.before[function] - self.after.get(function, 0)), filter(None, self.before)))
+
+	def report(self) -> str:
+		"""Creates a readable report with the size of every function before and after the Peephole.
+
+		Returns:
+			str: The report.
+		"""
+		report = "{:>12} {:>8} {:>8} {:>8}\n".format("function", "before", "after", "saved")
+		report += "".join(map(lambda item : "{function:>12} {before:>8} {after:>8} {saved:>8}\n".format(
+			function = item[0],
+			before = self.before[item[0]],
+			after = self.after.get(item[0], 0),
+			saved = item[1]
+		), self.saved().items()))
+		return report + "{:>12} {:>8} {:>8} {:>8}\n".format("total", sum(self.before.values()), sum(self.after.values()), sum(self.saved().values()))
+
+	def __measure(self, lines : Iterable[str], sizes : Dict[str, int]) -> Iterator[str]:
+		"""Passes every line on and adds its size to the function it is in, every label that does not start with `l_` starts a new function.
+
+		Args:
+			lines (Iterable[str]): The lines of assembly code.
+			sizes (Dict[str, int]): The sizes of the functions, changed in place.
+
+		Returns:
+			Iterator[str]: The same lines.
+		"""
+		function = ""
+		for line in lines:
+			if line.endswith(":") and not line.startswith("l_"):
+				function = line[:-1]
+			sizes[function] = sizes.get(function, 0) + instruction_size(line)
+			yield line
+
+	def __targets(self, lines : Iterable[str]) -> Dict[str, int]:
+		"""Counts the branches to every label.
+
+		Args:
+			lines (Iterable[str]): The lines of assembly code.
+
+		Returns:
+			Dict[str, int]: The labels with the amount of branches that jump to them.
+		"""
+		return Counter(map(lambda line : line.partition(" ")[2], filter(lambda line : line.startswith("B"), lines)))
+
+	def __branches(self, lines : Iterable[str]) -> Iterator[str]:
+		"""Removes the branches that jump to the line right after them.
+		Branches and labels are held back until a instruction that is not a branch follows, when a label arrives every held back branch to that label is removed as long as the branches after it can not jump after the same comparison.
+		A conditional branch over a `B` is only inverted when no label the Compiler jumps to is in between.
+
+		Args:
+			lines (Iterable[str]): The lines of assembly code.
+
+		Returns:
+			Iterator[str]: The lines without the branches.
+		"""
+		pending : List[str] = []
+		for line in lines:
+			if line.endswith(":") and pending:
+				pending = self.__fall_through(pending + [line], line[:-1])
+			elif line.partition(" ")[0] in conditionDict:
+				pending.append(line)
+			else:
+				yield from pending
+				pending = []
+				yield line
+		yield from pending
+
+	def __fall_through(self, pending : List[str], label : str) -> List[str]:
+		"""Removes the held back branches to a label that is reached anyway when they do not jump, the amount of removed branches to the label is counted.
+
+		Args:
+			pending (List[str]): The held back branches and labels, the label is the last one.
+			label (str): The label.
+
+		Returns:
+			List[str]: The branches and labels that are kept.
+		"""
+		references = sum(map(lambda line : line.partition(" ")[2] == label, pending))
+		branches = list(filter(lambda index : not pending[index].endswith(":"), range(len(pending))))
+		if len(branches) > 1 and not any(map(lambda line : line[:-1] in self.targets, pending[branches[-2]+1:branches[-1]])):
+			operation, _, target = pending[branches[-2]].partition(" ")
+			jump, _, destination = pending[branches[-1]].partition(" ")
+			if target == label and operation in inverseDict and jump == "B":
+				pending = pending[:branches[-2]] + [inverseDict[operation]+" "+destination] + pending[branches[-1]+1:]
+		kept : List[str] = []
+		for line in reversed(pending):
+			operation, _, target = line.partition(" ")
+			later = map(lambda branch : conditionDict[branch.partition(" ")[0]], filter(lambda branch : not branch.endswith(":"), kept))
+			if target != label or not all(map(lambda condition : not condition & conditionDict[operation], later)):
+				kept.append(line)
+		self.removed[label] += references - sum(map(lambda line : line.partition(" ")[2] == label, kept))
+		return list(reversed(kept))
+
+	def __labels(self, lines : Iterable[str]) -> Iterator[str]:
+		"""Removes the line labels that are not jumped to, every branch to a label that is removed comes before it.
+
+		Args:
+			lines (Iterable[str]): The lines of assembly code.
+
+		Returns:
+			Iterator[str]: The lines without the labels.
+		"""
+		return filter(lambda line : not (line.startswith("l_") and line.endswith(":")) or self.targets[line[:-1]] > self.removed[line[:-1]], lines)
+
+	def __merge(self, lines : Iterable[str]) -> Iterator[str]:
+		"""Merges consecutive changes of the memory pointer in R4 and removes loads and moves of a value that is already in the register.
+
+		Args:
+			lines (Iterable[str]): The lines of assembly code.
+
+		Returns:
+			Iterator[str]: The optimized lines.
+		"""
+		adjustment = None
+		previous = ""
+		for line in lines:
+			operation, _, operands = line.partition(" ")
+			if operation in ["ADD", "SUB"] and operands.startswith("R4, #"):
+				adjustment = (adjustment or 0) + int(operands[5:]) * (1 if operation == "ADD" else -1)
+				continue
+			if adjustment is not None:
+				merged = list(filter(None, adjust("R4", adjustment).split("\n")))
+				yield from merged
+				previous = merged[-1] if merged else previous
+				adjustment = None
+			last_operation, _, last_operands = previous.partition(" ")
+			if operation == "LDR" and last_operation == "STR" and operands.partition(", ")[2] == last_operands.partition(", ")[2]:
+				target, source = operands.partition(", ")[0], last_operands.partition(", ")[0]
+				if target == source:
+					continue
+				line = "MOV "+target+", "+source
+			elif operation == "MOV" and (last_operation == "MOV" and operands.split(", ")[::-1] == last_operands.split(", ") or len(set(operands.split(", "))) == 1):
+				continue
+			yield line
+			previous = line if not line.endswith(":") else ""
+		if adjustment is not None:
+			yield from filter(None, adjust("R4", adjustment).split("\n"))
@@ -0,0 +1,155 @@
+from typing import List, Union, Dict, Tuple
+
+from linker import Linker
+from memory import Memory
+from interpreter import Platform, interpreterDict, throw_index_error
+from sinks import OutputSink, TextSink
+
+class Profile:
+	"""This class contains everything the Profiler measured while running Controller Code.
+	- line_counts: For every line the amount of times it was executed.
+	- functions: For every `BA` identifier the amount of calls, the inclusive steps, including the functions it calls, and the exclusive steps, only its own lines.
+	- stacks: The amount of steps executed with every chain of function calls, `main` is the code outside of the functions.
+	- max_depth: The deepest the functions have called each other.
+	- steps: The amount of executed instructions.
+	"""
+	def __init__(self, tokens : List[List[Union[str,int]]], line_counts : List[int], functions : Dict[int, Tuple[int, int, int]], stacks : Dict[str, int], max_depth : int, steps : int):
+		self.tokens = tokens
+		self.line_counts = line_counts
+		self.functions = functions
+		self.stacks = stacks
+		self.max_depth = max_depth
+		self.steps = steps
+
+	def __str__(self):
+		return "Profile({steps},\n{max_depth},\n{functions})".format(
+			steps = self.steps,
+			max_depth = self.max_depth,
+			functions = self.functions
+		)
+
+	def opcode_counts(self) -> Dict[str, int]:
+		"""Returns the amount of times every instruction was executed, counted from the line counts.
+
+		Returns:
+			Dict[str, int]: The instruction names with their counts, the most executed first.
+		"""
+		counts = {}
+		for instruction, count in zip(self.tokens, self.line_counts):
+			counts[instruction[0]] = counts.get(instruction[0], 0) + count
+		return dict(sorted(filter(lambda item : item[1], counts.items()), key = lambda item : -item[1]))
+
+	def report(self, top : int = 10) -> str:
+		"""Creates a readable report with the hottest lines, the instruction histogram and the costs of every function.
+
+		Args:
+			top (int, optional): The amount of lines to show. Defaults to 10.
+
+		Returns:
+			str: The report.
+		"""
+		steps = max(self.steps, 1)
+		hot_lines = sorted(filter(lambda line : self.line_counts[line], range(len(self.tokens))), key = lambda line : -self.line_counts[line])[:top]
+		report = "{steps} steps, max call depth {max_depth}\n\nHot lines:\n".format(steps = self.steps, max_depth = self.max_depth)
+		report += "".join(map(lambda line : "{line:>6} {count:>12} {percent:>6.1%}  {code}\n".format(
+			line = line + 1,
+			count = self.line_counts[line],
+			percent = self.line_counts[line] / steps,
+			code = " ".join(map(str, self.tokens[line]))
+		), hot_lines))
+		report += "\nInstructions:\n"
+		report += "".join(map(lambda item : "{name:>6} {count:>12} {percent:>6.1%}\n".format(name = item[0], count = item[1], percent = item[1] / steps), self.opcode_counts().items()))
+		report += "\nFunctions:\n{:>6} {:>8} {:>12} {:>12}\n".format("BA", "calls", "inclusive", "exclusive")
+		report += "".join(map(lambda item : "{identifier:>6} {calls:>8} {inclusive:>12} {exclusive:>12}\n".format(
+			identifier = item[0],
+			calls = item[1][0],
+			inclusive = item[1][1],
+			exclusive = item[1][2]
+		), sorted(self.functions.items(), key = lambda item : -item[1][1])))
+		return report
+
+	def collapsed(self) -> str:
+		"""Creates the collapsed stacks, a line with every chain of function calls separated by `;` followed by its amount of steps.
+		This is the format flamegraph tools read.
+
+		Returns:
+			str: The collapsed stacks.
+		"""
+		return "".join(map(lambda item : item[0] + " " + str(item[1]) + "\n", filter(lambda item : item[1], self.stacks.items())))
+
+	def export(self, filename : str):
+		"""Writes the collapsed stacks to a file.
+
+		Args:
+			filename (str): The name of the file.
+		"""
+		with open(filename, "w") as file:
+			file.write(self.collapsed())
+
+class Profiler:
+	"""The Profiler class runs Controller Code with a separate instrumented loop that counts every executed line and follows every function call.
+	The code is executed without superinstructions and counted loops, so every line is counted exactly as it is written.
+	Since this loop is separate the Interpreter itself does not do any extra work when it is not profiling.
+	"""
+	def __init__(self, parsed_tokens : List[List[Union[str,int]]], memory_size : int = 128, cell_width : int = 32):
+		self.tokens = parsed_tokens
+		self.memory_size = memory_size
+		self.cell_width = cell_width
+		self.link_table = Linker(parsed_tokens).link()
+
+	def profile(self, input_list : List[int] = [], sink : OutputSink = None) -> Profile:
+		"""This function runs the code until it reaches `BX` and measures it.
+		When `START` is executed the function is pushed on the function_call_stack of the platform, its steps are counted until the matching `AB` pops it again.
+		The inclusive steps of a recursive function are only counted for its outermost call, so no step is counted twice.
+
+		Args:
+			input_list (List[int], optional): The input of the Controller Code. Defaults to [].
+			sink (OutputSink, optional): The sink that receives every value `RB` prints. Defaults to a TextSink on the standard output.
+
+		Returns:
+			Profile: The measurements.
+		"""
+		sink = sink if sink is not None else TextSink()
+		platform = Platform(self.tokens, Memory(self.memory_size, self.cell_width), 0, 1, input_list, self.link_table.jumps, sink.write)
+		instructions = self.tokens
+		line_counts = [0] * len(instructions)
+		calls = dict(map(lambda identifier : (identifier, 0), self.link_table.functions))
+		inclusive = dict(calls)
+		active = dict(calls)
+		frames = [("main", None, 0)]
+		stacks = {}
+		max_depth = 0
+		steps = 0
+		mark = 0
+		try:
+			while True:
+				ip = platform.instruction_pointer
+				instruction = instructions[ip]
+				line_counts[ip] += 1
+				steps += 1
+				if instruction[0] == "BX":
+					break
+				interpreterDict.get(instruction[0])(platform, *instruction[1:])
+				if instruction[0] == "START":
+					stacks[frames[-1][0]] = stacks.get(frames[-1][0], 0) + steps - mark
+					mark = steps
+					identifier = instruction[1]
+					frames.append((frames[-1][0] + ";BA " + str(identifier), identifier, steps))
+					calls[identifier] += 1
+					active[identifier] += 1
+					max_depth = max(max_depth, len(platform.function_call_stack))
+				elif instruction[0] == "AB":
+					key, identifier, entry = frames.pop()
+					stacks[key] = stacks.get(key, 0) + steps - mark
+					mark = steps
+					active[identifier] -= 1
+					if not active[identifier]:
+						inclusive[identifier] += steps - entry
+		except IndexError:
+			throw_index_error(platform, instructions[platform.instruction_pointer][0] if platform.instruction_pointer < len(instructions) else None)
+			raise
+		finally:
+			sink.flush()
+		stacks[frames[-1][0]] = stacks.get(frames[-1][0], 0) + steps - mark
+		functions = dict(map(lambda item : (item[0], (calls[item[0]], inclusive[item[0]], sum(line_counts[item[1][0]+1:item[1][1]+1]))), self.link_table.functions.items()))
+		return Profile(self.tokens, line_counts, functions, stacks, max_depth, steps)
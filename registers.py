@@ -0,0 +1,387 @@
+import re
+from typing import List, Union, Dict, Tuple, Set, Optional
+
+from support import maxLoadOffset
+from optimizer import instruction_length
+
+#These registers are not used by the templates of the Compiler, so they can keep memory addresses.
+cacheRegisters = ["R6", "R7"]
+
+#These registers only hold a value within the template of a single line, the template of the next line never reads them before it writes them.
+scratchRegisters = ["R0", "R1", "R2", "R3"]
+
+#These instructions end a basic block, every changed memory address in a register is written back before their code.
+blockEndInstructions = ["XY", "AY", "BY", "SELECT", "XYSELECT", "AYSELECT", "BYSELECT", "START", "RB", "BX", "AB"]
+
+#These instructions can not be part of a loop that keeps its memory addresses in registers, a function call changes R6 and R7 and the others leave the code they are in.
+loopEndInstructions = ["START", "BX", "BA", "AB"]
+
+#Every changed memory address in a register of a loop is written back before the code of these instructions.
+loopFlushInstructions = ["RB"]
+
+#These instructions read their value from R0 or R1 or need it in R0, with a register they need a `MOV` instead of a `LDR` or `STR`, so keeping their memory address in a register saves nothing.
+copyInstructions = ["ZL", "RB", "BX", "AX", "STORE"]
+
+#These instructions calculate a register, the first operand is read as well when they have two operands.
+arithmeticInstructions = ["ADD", "SUB", "MUL"]
+
+#This pattern finds the registers in the operands of a line of assembly code.
+registerPattern = re.compile(r"\bR\d+\b")
+
+#These dictionaries contain the memory addresses every instruction reads and writes:
+# - a and b: The memory address in the first or second parameter.
+# - p: The memory address the memory pointer points to.
+readDict = {
+	"UP" : "p",
+	"DOWN" : "p",
+	"RB" : "p",
+	"XA" : "a",
+	"XB" : "p",
+	"XY" : "ab",
+	"AY" : "ab",
+	"BY" : "ab",
+	"YA" : "ab",
+	"YB" : "ab",
+	"YX" : "ab",
+	"BX" : "p",
+	"ADD" : "p",
+	"XYSELECT" : "ab",
+	"AYSELECT" : "ab",
+	"BYSELECT" : "ab"
+}
+
+writeDict = {
+	"UP" : "p",
+	"DOWN" : "p",
+	"ZL" : "b",
+	"AX" : "p",
+	"XA" : "p",
+	"XB" : "a",
+	"YA" : "a",
+	"YB" : "a",
+	"YX" : "a",
+	"ADD" : "p",
+	"STORE" : "p"
+}
+
+#This dictionary returns the memory address the memory pointer points to after the instructions that move it.
+#The functions receive the memory pointer before the instruction, which is None when it is not known while compiling, followed by the parameters of the instruction.
+pointerDict = {
+	"RIGHT" : lambda pointer : pointer + 1 if pointer is not None else None,
+	"LEFT" : lambda pointer : pointer - 1 if pointer is not None else None,
+	"MOVE" : lambda pointer, delta, length : pointer + delta if pointer is not None else None,
+	"LB" : lambda pointer, memory_address : memory_address,
+	"STORE" : lambda pointer, memory_address, value : memory_address,
+	"START" : lambda pointer, identifier : None
+}
+
+def move_pointer(instruction : List[Union[str,int]], pointer : Optional[int]) -> Optional[int]:
+	"""Returns the memory address the memory pointer points to after a instruction.
+
+	Args:
+		instruction (List[Union[str,int]]): A parsed (super)instruction with its parameters.
+		pointer (Optional[int]): The memory address before the instruction, None when it is unknown.
+
+	Returns:
+		Optional[int]: The memory address after the instruction, None when it is unknown.
+	"""
+	if instruction[0] in pointerDict:
+		return pointerDict[instruction[0]](pointer, *instruction[1:])
+	return pointer
+
+def trace_pointers(tokens : List[List[Union[str,int]]], jumps : List[int]) -> List[Optional[int]]:
+	"""This function follows every path through the code once to find the memory address the memory pointer points to before every line, as far as it is known while compiling.
+	The code starts with the memory pointer at memory address 1. When two paths reach a line with a different memory address, or a function could have moved it, it is unknown.
+	Every line changes at most twice, from unreached to known and from known to unknown, so this takes linear time.
+
+	Args:
+		tokens (List[List[Union[str,int]]]): The parsed (super)instructions.
+		jumps (List[int]): The jumps of the LinkTable of the tokens.
+
+	Returns:
+		List[Optional[int]]: The memory address before every line, None when it is unknown or the line is never reached.
+	"""
+	pointers : List[Optional[int]] = [None] * len(tokens)
+	reached = bytearray(len(tokens))
+	work : List[Tuple[int, Optional[int]]] = [(0, 1)]
+	while work:
+		line, pointer = work.pop()
+		if not 0 <= line < len(tokens) or (reached[line] and pointers[line] in (pointer, None)):
+			continue
+		pointers[line] = pointer if not reached[line] else None
+		reached[line] = 1
+		instruction = tokens[line]
+		after = move_pointer(instruction, pointers[line])
+		if instruction[0] == "START":
+			work += [(jumps[line], None), (line + 1, None)]
+		elif instruction[0] in ["XY", "AY", "BY", "XYSELECT", "AYSELECT", "BYSELECT"]:
+			work += [(jumps[line], after), (line + instruction_length(instruction), after)]
+		elif instruction[0] != "BX":
+			work.append((jumps[line], after))
+	return pointers
+
+def move_register(line : str) -> str:
+	"""Rewrites a `LDR` or `STR` instruction of a template that reads or writes a register instead of memory into a `MOV` instruction.
+
+	Args:
+		line (str): A line of assembly code.
+
+	Returns:
+		str: The same line, or the `MOV` instruction.
+	"""
+	if line[-1] == "]" or not line.startswith(("LDR ", "STR ")):
+		return line
+	target, source = line[4:].split(", ")
+	return "MOV "+target+", "+source if line[0] == "L" else "MOV "+source+", "+target
+
+def register_operands(line : str) -> Optional[Tuple[Set[str], Set[str]]]:
+	"""Returns the registers a line of assembly code of a template reads and writes.
+
+	Args:
+		line (str): A line of assembly code.
+
+	Returns:
+		Optional[Tuple[Set[str], Set[str]]]: The registers it reads and the registers it writes, None for calls, returns, labels and every other line that could read any register.
+	"""
+	operation, _, text = line.partition(" ")
+	operands = text.split(", ")
+	if operation in ["LDR", "STR"]:
+		register, _, address = text.partition(", ")
+		bases = set(registerPattern.findall(address))
+		return (bases | {register}, set()) if operation == "STR" else (bases, {register})
+	if operation == "MOV":
+		return set(registerPattern.findall(operands[1])), {operands[0]}
+	if operation in arithmeticInstructions:
+		return set(registerPattern.findall(", ".join(operands[len(operands) - 2:]))), {operands[0]}
+	if operation == "CMP":
+		return set(registerPattern.findall(text)), set()
+	if operation.startswith("B") and operation != "BL" and not line.endswith(":"):
+		return set(), set()
+	return None
+
+def rename_reads(line : str, copies : Dict[str, str]) -> str:
+	"""Replaces the registers a line of assembly code reads by the registers they are a copy of, the register it writes stays the same.
+
+	Args:
+		line (str): A line of assembly code, register_operands() does not return None for it.
+		copies (Dict[str, str]): The cache register every scratch register is a copy of.
+
+	Returns:
+		str: The line that reads the cache registers.
+	"""
+	rename = lambda text : registerPattern.sub(lambda register : copies.get(register.group(), register.group()), text)
+	operation, _, text = line.partition(" ")
+	if operation in ["STR", "CMP"]:
+		return operation+" "+rename(text)
+	target, _, sources = text.partition(", ")
+	return operation+" "+target+", "+rename(sources) if sources else line
+
+def read_later(lines : List[str], register : str) -> bool:
+	"""Checks whether a register is read by the lines before it is written again.
+
+	Args:
+		lines (List[str]): The following lines of a template.
+		register (str): The register.
+
+	Returns:
+		bool: True when a line reads the register, a call or return reads every scratch register.
+	"""
+	for line in lines:
+		used = register_operands(line)
+		if used is None:
+			return register in scratchRegisters
+		if register in used[0]:
+			return True
+		if register in used[1]:
+			return False
+	return False
+
+def calculate_in_place(lines : List[str], scratch : str, register : str, copies : Dict[str, str]) -> bool:
+	"""Checks whether a calculation of a scratch register that is a copy of a cache register can change the cache register itself.
+	That is the case when the result is copied back into the cache register before anything else reads or writes the cache register, and no other copy of its old value is read afterwards.
+
+	Args:
+		lines (List[str]): The lines of the template after the calculation.
+		scratch (str): The scratch register that is calculated.
+		register (str): The cache register it is a copy of.
+		copies (Dict[str, str]): The cache register every scratch register is a copy of.
+
+	Returns:
+		bool: True when the calculation can change the cache register.
+	"""
+	others = list(filter(lambda other : other != scratch and copies[other] == register, copies))
+	if any(map(lambda other : read_later(lines, other), others)):
+		return False
+	for line in lines:
+		if line == "MOV "+register+", "+scratch:
+			return True
+		used = register_operands(line)
+		if used is None or register in used[0] | used[1] or (scratch in used[1] and not (line.startswith(tuple(map(lambda operation : operation+" "+scratch+", ", arithmeticInstructions))) and line.count(",") == 1)):
+			return False
+	return False
+
+def fold_registers(lines : List[str]) -> List[str]:
+	"""Removes the copies between the cache registers and the scratch registers from the code of a single template, so its instructions use R6 and R7 directly.
+	- A `MOV` from a cache register into a scratch register is left out, the lines that read the scratch register read the cache register instead.
+	- A calculation of such a copy that is copied back into the same cache register calculates the cache register itself, see calculate_in_place().
+	- A copy is only created when it is really read, like R0 before a call to `print`, or when the cache register changes while the old value is still needed.
+
+	Args:
+		lines (List[str]): The lines of the template, after move_register().
+
+	Returns:
+		List[str]: The lines without the copies.
+	"""
+	code = []
+	copies : Dict[str, str] = {}
+	for index, line in enumerate(lines):
+		used = register_operands(line)
+		if used is None:
+			code += list(map(lambda scratch : "MOV "+scratch+", "+copies[scratch], sorted(copies)))
+			copies = {}
+			code.append(line)
+			continue
+		renamed = rename_reads(line, copies)
+		operation, _, text = renamed.partition(" ")
+		target = text.split(", ")[0]
+		if operation == "MOV" and text == target+", "+target:
+			continue
+		if operation == "MOV" and target in scratchRegisters and text.split(", ")[1] in cacheRegisters:
+			copies[target] = text.split(", ")[1]
+			continue
+		if target in cacheRegisters and target in used[1]:
+			for scratch in list(filter(lambda scratch : copies[scratch] == target, copies)):
+				if read_later(lines[index+1:], scratch):
+					code.append("MOV "+scratch+", "+target)
+				del copies[scratch]
+		elif target in copies and target in used[0] | used[1] and operation in arithmeticInstructions and text.count(",") == 1:
+			if calculate_in_place(lines[index+1:], target, copies[target], copies):
+				for other in list(filter(lambda other : other != target and copies[other] == copies[target], copies)):
+					del copies[other]
+				code.append(operation+" "+copies[target]+", "+text.split(", ")[1])
+				continue
+			code.append("MOV "+target+", "+copies.pop(target))
+		if target in used[1]:
+			copies.pop(target, None)
+		code.append(renamed)
+	return code
+
+class RegisterCache:
+	"""The RegisterCache class keeps the most used memory addresses of a single basic block or loop in the registers R6 and R7.
+	In a basic block a memory address is only kept in a register when the block uses it more often than it has to be loaded and written back and its offset fits in a `LDR` or `STR` instruction, the uses by the copyInstructions do not count.
+	It is loaded the first time the block reads it and it is only written back when the block ends or before the memory pointer reads or writes a memory address that is not known while compiling, since that memory address could be the same one.
+	In a loop every memory address the loop uses can be kept in a register, the loop runs its code more than once. The registers are loaded once before the loop and written back when the loop is left and before the loopFlushInstructions, the memory pointer is known on every line of such a loop.
+	"""
+	def __init__(self, instructions : List[List[Union[str,int]]], pointers : List[Optional[int]], loop : bool = False):
+		"""The init function counts how often the block or loop uses every memory address and chooses the memory addresses that are kept in registers.
+
+		Args:
+			instructions (List[List[Union[str,int]]]): The (super)instructions of the basic block or loop.
+			pointers (List[Optional[int]]): The memory address the memory pointer points to before every instruction, None when it is unknown.
+			loop (bool, optional): The instructions are a loop, see preload(). Defaults to False.
+		"""
+		counts : Dict[int, int] = {}
+		loads : Set[int] = set()
+		written : Set[int] = set()
+		for instruction, pointer in zip(instructions, pointers):
+			cells = self.__cells(instruction, pointer)
+			for name in readDict.get(instruction[0], "") + writeDict.get(instruction[0], ""):
+				if cells[name] is not None and 0 < cells[name] * 4 <= maxLoadOffset:
+					counts[cells[name]] = counts.get(cells[name], 0) + (0 if instruction[0] in copyInstructions else 1)
+			loads.update(filter(lambda cell : cell not in written, map(lambda name : cells[name], readDict.get(instruction[0], ""))))
+			written.update(map(lambda name : cells[name], writeDict.get(instruction[0], "")))
+		used = sorted(filter(lambda cell : counts[cell] > (0 if loop else (cell in loads) + (cell in written)), counts), key = lambda cell : -counts[cell])
+		self.registers = dict(zip(used, cacheRegisters))
+		self.loop = loop
+		self.written = set(filter(lambda cell : cell in self.registers, written))
+		self.loaded : Set[int] = set()
+		self.dirty : Set[int] = set()
+		self.pointer : Optional[int] = None
+
+	def __str__(self):
+		return "RegisterCache({registers},\n{loaded},\n{dirty})".format(
+			registers = self.registers,
+			loaded = self.loaded,
+			dirty = self.dirty
+		)
+
+	def access(self, instruction : List[Union[str,int]], pointer : Optional[int]) -> Tuple[List[str], Dict[str, str]]:
+		"""This function is called for every instruction of the block in order and returns what has to change in its code.
+		- The instructions that are placed before the template, to load the memory addresses it reads or to write back the registers.
+		- The fields of the template that read or write a register instead of memory.
+
+		Args:
+			instruction (List[Union[str,int]]): The (super)instruction.
+			pointer (Optional[int]): The memory address the memory pointer points to before the instruction, None when it is unknown.
+
+		Returns:
+			Tuple[List[str], Dict[str, str]]: The instructions and the fields.
+		"""
+		cells = self.__cells(instruction, pointer)
+		self.pointer = pointer
+		if self.loop:
+			lines = self.flush() if instruction[0] in loopFlushInstructions else []
+		else:
+			lines = self.flush() if instruction[0] in blockEndInstructions or ("p" in cells and cells["p"] is None) else []
+		for name in readDict.get(instruction[0], ""):
+			if cells[name] in self.registers and cells[name] not in self.loaded:
+				lines.append("LDR "+self.registers[cells[name]]+", "+self.__operand(cells[name]))
+				self.loaded.add(cells[name])
+		fields = {}
+		for name, cell in cells.items():
+			if cell in self.registers:
+				fields["cell_"+name] = self.registers[cell]
+				fields["address_"+name] = ""
+		for name in writeDict.get(instruction[0], ""):
+			if cells[name] in self.registers:
+				self.loaded.add(cells[name])
+				self.dirty.add(cells[name])
+		if "p" in writeDict.get(instruction[0], "") and cells["p"] is None:
+			self.loaded = set()
+		self.pointer = move_pointer(instruction, pointer)
+		return lines, fields
+
+	def preload(self) -> List[str]:
+		"""Loads every memory address of a loop in its register, the code is placed before the first line of the loop so it only runs once.
+
+		Returns:
+			List[str]: The `LDR` instructions.
+		"""
+		self.loaded = set(self.registers)
+		return list(map(lambda cell : "LDR "+self.registers[cell]+", "+self.__operand(cell), sorted(self.registers)))
+
+	def flush(self) -> List[str]:
+		"""Writes back every register that has been changed, the registers still contain the same values afterwards.
+		In a loop the registers that have been changed depend on the path through the loop, so every register the loop writes is written back.
+
+		Returns:
+			List[str]: The `STR` instructions.
+		"""
+		lines = list(map(lambda cell : "STR "+self.registers[cell]+", "+self.__operand(cell), sorted(self.written if self.loop else self.dirty)))
+		self.dirty = set()
+		return lines
+
+	def __operand(self, cell : int) -> str:
+		"""Returns the operand of the `LDR` or `STR` instruction that loads or writes back a memory address, `[R4]` takes less bytes when the memory pointer points to it.
+
+		Args:
+			cell (int): The memory address.
+
+		Returns:
+			str: The operand.
+		"""
+		return "[R4]" if cell == self.pointer else "[R5, #-"+str(cell * 4)+"]"
+
+	def __cells(self, instruction : List[Union[str,int]], pointer : Optional[int]) -> Dict[str, Optional[int]]:
+		"""Returns the memory addresses an instruction reads or writes.
+
+		Args:
+			instruction (List[Union[str,int]]): The (super)instruction.
+			pointer (Optional[int]): The memory address the memory pointer points to before the instruction.
+
+		Returns:
+			Dict[str, Optional[int]]: The memory address of every used name of the readDict and writeDict, p is None when it is unknown.
+		"""
+		names = set(readDict.get(instruction[0], "") + writeDict.get(instruction[0], ""))
+		parameters = {"a" : (instruction[1:2] or [None])[0], "b" : (instruction[2:3] or [None])[0], "p" : move_pointer(instruction, pointer)}
+		return dict(map(lambda name : (name, parameters[name]), names))
@@ -0,0 +1,178 @@
+import os, csv, json, time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Iterator
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter
+from support import readFile, cError, CocoError
+
+#Every worker process keeps the Interpreter of every program it has loaded, so a program is only lexed and parsed once per worker.
+programCache = {}
+
+class Job:
+	"""This class contains a single run of the batch mode, a Controller Code file and its input.
+	The index is the position of the job in the jobs file.
+	"""
+	def __init__(self, index : int, code_file : str, input_list : List[int]):
+		self.index = index
+		self.code_file = code_file
+		self.input_list = input_list
+
+	def __str__(self):
+		return "Job({index},\n{code_file},\n{input_list})".format(
+			index = self.index,
+			code_file = self.code_file,
+			input_list = self.input_list
+		)
+
+class JobResult:
+	"""This class contains the result of a Job.
+	- output: Everything the Controller Code printed, or the error when the job failed.
+	- wall_time: The time in seconds the job took in the worker, including loading the program the first time.
+	- failed: Whether the program could not be loaded or stopped with a error instead of `BX`.
+	"""
+	def __init__(self, job : Job, output : str, wall_time : float, failed : bool):
+		self.job = job
+		self.output = output
+		self.wall_time = wall_time
+		self.failed = failed
+
+	def __str__(self):
+		return "{index} {code_file} {input_list}: {output} ({wall_time:.3f} ms)".format(
+			index = self.job.index,
+			code_file = self.job.code_file,
+			input_list = ",".join(map(str, self.job.input_list)),
+			output = self.output.replace("\n", " "),
+			wall_time = self.wall_time * 1000
+		)
+
+def read_jobs(jobs_file : str, code_file : str) -> List[Job]:
+	"""This function reads the jobs of the batch mode from a CSV or JSONL file.
+	- CSV: Every row contains the input values, optionally preceded by a .coco file.
+	- JSONL: Every line contains a list with the input values or a object with a `input` list and optionally a `file`.
+	Jobs without a file use the supplied code file.
+
+	Args:
+		jobs_file (str): A file with the extension .csv or .jsonl.
+		code_file (str): The Controller Code file of jobs that do not name one.
+
+	Returns:
+		List[Job]: All the jobs in the order of the file.
+	"""
+	if not os.path.exists(jobs_file):
+		cError("File Error: The supplied file `"+jobs_file+"` doesn't exist").throw()
+	rows = []
+	with open(jobs_file, newline = "") as file:
+		if jobs_file.endswith(".jsonl"):
+			for line in filter(lambda line : line.strip(), file):
+				row = json.loads(line)
+				rows.append((row.get("file", code_file), row.get("input", [])) if isinstance(row, dict) else (code_file, row))
+		elif jobs_file.endswith(".csv"):
+			for row in filter(None, csv.reader(file)):
+				row = list(map(lambda field : field.strip(), row))
+				rows.append((row[0], row[1:]) if row[0].endswith(".coco") else (code_file, row))
+		else:
+			cError("File Error: The supplied jobs file does not have the file extension `.csv` or `.jsonl`.").throw()
+	try:
+		return list(map(lambda index, row : Job(index, row[0], list(map(int, row[1]))), range(len(rows)), rows))
+	except ValueError:
+		cError("ValueError: The input values in `"+jobs_file+"` have to be integers.").throw()
+
+def load_program(code_file : str, cell_width : int) -> Interpreter:
+	"""This function returns the Interpreter of a Controller Code file, the file is only read, lexed and parsed the first time it is used in this process.
+	The code is checked with the maximum of 2 input values so a single Interpreter can be used for every input.
+
+	Args:
+		code_file (str): The Controller Code file.
+		cell_width (int): The width of a memory cell in bits.
+
+	Returns:
+		Interpreter: The Interpreter of the file.
+	"""
+	if (code_file, cell_width) not in programCache:
+		programCache[(code_file, cell_width)] = Interpreter(Parser(Lexer(readFile(code_file)).tokenize([0, 0])).parse(), cell_width = cell_width)
+	return programCache[(code_file, cell_width)]
+
+def run_job(job : Job, cell_width : int, budget : int = None) -> JobResult:
+	"""This function runs a single Job in a worker process.
+	The code is run with Interpreter.run() so every error is caught here as a CocoError and the job simply fails, also when it does not reach `BX` within the budget.
+
+	Args:
+		job (Job): The job to run.
+		cell_width (int): The width of a memory cell in bits.
+		budget (int, optional): The maximum amount of steps of the job. Defaults to None, no maximum.
+
+	Returns:
+		JobResult: The output of the job and the time it took.
+	"""
+	start = time.perf_counter()
+	try:
+		output = "\n".join(map(str, load_program(job.code_file, cell_width).run(job.input_list, budget).outputs))
+		failed = False
+	except CocoError as error:
+		output = str(error)
+		failed = True
+	return JobResult(job, output, time.perf_counter() - start, failed)
+
+def run_chunk(jobs : List[Job], cell_width : int, budget : int = None) -> List[JobResult]:
+	"""This function runs a chunk of jobs in a worker process, sending jobs in chunks keeps the communication between the processes small compared to the work.
+
+	Args:
+		jobs (List[Job]): The jobs to run.
+		cell_width (int): The width of a memory cell in bits.
+		budget (int, optional): The maximum amount of steps of every job. Defaults to None, no maximum.
+
+	Returns:
+		List[JobResult]: The result of every job in the same order.
+	"""
+	return list(map(lambda job : run_job(job, cell_width, budget), jobs))
+
+class BatchRunner:
+	"""The BatchRunner class spreads many jobs over a pool of processes, one for every core of the machine by default.
+	Jobs are grouped by file and sent in chunks, so every worker mostly runs jobs of the programs it already has loaded.
+	With a budget a job that does not reach `BX` within that amount of steps fails, so a program that never ends does not keep a worker busy forever.
+	"""
+	def __init__(self, jobs : List[Job], cell_width : int = 32, workers : int = None, ordered : bool = True, budget : int = None):
+		self.jobs = jobs
+		self.cell_width = cell_width
+		self.workers = workers or os.cpu_count() or 1
+		self.ordered = ordered
+		self.budget = budget
+
+	def run(self) -> Iterator[JobResult]:
+		"""This function runs all the jobs and yields every result as soon as it can.
+		When ordered the results are yielded in the order of the jobs, otherwise in the order the chunks are finished.
+
+		Returns:
+			Iterator[JobResult]: The result of every job.
+		"""
+		chunks = self.__create_chunks()
+		with ProcessPoolExecutor(max_workers = self.workers) as executor:
+			futures = list(map(lambda chunk : executor.submit(run_chunk, chunk, self.cell_width, self.budget), chunks))
+			if not self.ordered:
+				for future in as_completed(futures):
+					yield from future.result()
+				return
+			finished = {}
+			position = 0
+			for future in futures:
+				for result in future.result():
+					finished[result.job.index] = result
+				while position in finished:
+					yield finished.pop(position)
+					position += 1
+
+	def __create_chunks(self) -> List[List[Job]]:
+		"""This function splits the jobs in chunks, about 4 for every worker so a slow chunk does not keep the other workers waiting.
+		A chunk only contains jobs of a single file.
+
+		Returns:
+			List[List[Job]]: The chunks in the order of the first job they contain.
+		"""
+		size = max(1, len(self.jobs) // (self.workers * 4))
+		files : Dict[str, List[Job]] = {}
+		for job in self.jobs:
+			files.setdefault(job.code_file, []).append(job)
+		chunks = [jobs[start:start+size] for jobs in files.values() for start in range(0, len(jobs), size)]
+		return sorted(chunks, key = lambda chunk : chunk[0].index)
@@ -0,0 +1,278 @@
+from typing import List, Dict, Tuple, Iterable
+
+from cost import instruction_cycles
+from interpreter import RunResult
+from support import cError
+
+#Every instruction of the Thumb subset the Compiler creates gets a integer opcode.
+#Arithmetic with a register and with a immediate value get a different opcode, so the operand never has to be checked while running.
+OP_MOV_R, OP_MOV_I, OP_ADD_R, OP_ADD_I, OP_SUB_R, OP_SUB_I, OP_MUL, OP_LDR, OP_STR, OP_CMP_R, OP_CMP_I, OP_B, OP_BEQ, OP_BNE, OP_BGT, OP_BGE, OP_BLT, OP_BLE, OP_BL, OP_PRINT, OP_PUSH, OP_POP = range(22)
+
+#This dictionary contains the opcode of every branch, the target label is replaced by the index of its instruction.
+branchDict = {
+	"B" : OP_B,
+	"BEQ" : OP_BEQ,
+	"BNE" : OP_BNE,
+	"BGT" : OP_BGT,
+	"BGE" : OP_BGE,
+	"BLT" : OP_BLT,
+	"BLE" : OP_BLE,
+	"BL" : OP_BL
+}
+
+#This dictionary contains the index of every register in the list of registers.
+registerDict = dict(map(lambda index : ("R"+str(index), index), range(13)))
+registerDict.update({"SP" : 13, "LR" : 14, "PC" : 15})
+
+#The address the stack starts at, the stack grows down from here.
+stackTop = 0x20010000
+
+#The return address the simulated caller leaves in LR, popping it into the PC ends the simulation.
+returnAddress = -1
+
+def wrap(value : int) -> int:
+	"""Wraps a value around to a signed 32 bit word, just like a register of the microcontroller.
+
+	Args:
+		value (int): The value.
+
+	Returns:
+		int: The value as signed 32 bit word.
+	"""
+	return ((value + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+
+class Simulation:
+	"""This class contains the result of simulating compiled Controller Code.
+	- outputs: The values passed to `print`.
+	- value: The value the function returned in R0.
+	- instructions: The amount of executed instructions.
+	- cycles: The amount of cycles the instructions take on a Cortex-M3, see `cost.py`.
+	- stack: The largest amount of bytes the stack used.
+	"""
+	def __init__(self, outputs : List[int], value : int, instructions : int, cycles : int, stack : int):
+		self.outputs = outputs
+		self.value = value
+		self.instructions = instructions
+		self.cycles = cycles
+		self.stack = stack
+
+	def __str__(self):
+		return "Simulation({outputs},\n{value},\n{instructions},\n{cycles},\n{stack})".format(
+			outputs = self.outputs,
+			value = self.value,
+			instructions = self.instructions,
+			cycles = self.cycles,
+			stack = self.stack
+		)
+
+	def matches(self, result : RunResult) -> bool:
+		"""Checks whether the compiled code printed and returned the same values as the Interpreter.
+
+		Args:
+			result (RunResult): The result of Interpreter.run() with the same input.
+
+		Returns:
+			bool: True when the printed values and the returned value are the same.
+		"""
+		return self.outputs == list(map(wrap, result.outputs)) and self.value == wrap(result.value)
+
+	def report(self) -> str:
+		"""Creates a readable report with the printed values, the returned value and what it took.
+
+		Returns:
+			str: The report.
+		"""
+		return "printed: {outputs}\nreturned: {value}\n{instructions} instructions, {cycles} cycles, {stack} bytes of stack\n".format(
+			outputs = " ".join(map(str, self.outputs)),
+			value = self.value,
+			instructions = self.instructions,
+			cycles = self.cycles,
+			stack = self.stack
+		)
+
+class Simulator:
+	"""The Simulator class runs the assembly code the Compiler creates without a microcontroller.
+	It only supports the Thumb instructions the Compiler uses: `MOV`, `ADD`, `SUB`, `MUL`, `LDR`, `STR`, `CMP`, the branches, `BL`, `PUSH` and `POP`.
+	A call to `print` is not simulated, the value in R0 is collected instead and R0 to R3 are cleared like any called function is allowed to change them.
+	Every line is decoded once into a opcode and its operands, the labels of the branches are replaced by the index of the instruction they jump to.
+	"""
+	def __init__(self, asm_lines : Iterable[str]):
+		"""The init function will ask the user to supply the lines of assembly code, for example a opened `.asm` file or `Compiler.lines()`, and decodes them.
+
+		Args:
+			asm_lines (Iterable[str]): The lines of assembly code.
+		"""
+		self.entry = None
+		self.lines : List[str] = []
+		self.labels : Dict[str, int] = {}
+		for line in map(lambda line : line.strip(), asm_lines):
+			if line.startswith(".global "):
+				self.entry = line[8:].strip()
+			elif line.endswith(":"):
+				self.labels[line[:-1]] = len(self.lines)
+			elif line and not line.startswith("."):
+				self.lines.append(line)
+		if self.entry not in self.labels:
+			cError("Simulation Error: The assembly code does not have a global label to start at.").throw()
+		self.opcodes : List[int] = []
+		self.operands : List[Tuple] = []
+		for line in self.lines:
+			opcode, operands = self.__decode(line)
+			self.opcodes.append(opcode)
+			self.operands.append(operands)
+		self.cycles = list(map(instruction_cycles, self.lines))
+		self.taken = list(map(lambda line : instruction_cycles(line, True) - instruction_cycles(line), self.lines))
+
+	def __str__(self):
+		return "Simulator({entry},\n{lines})".format(
+			entry = self.entry,
+			lines = len(self.lines)
+		)
+
+	def run(self, arguments : List[int] = [], budget : int = None) -> Simulation:
+		"""This function calls the global function with the arguments in R0 and R1 and runs it until it returns.
+		Memory that has not been written yet reads as 0, just like the memory of the Interpreter.
+
+		Args:
+			arguments (List[int], optional): The arguments of the function. Defaults to [].
+			budget (int, optional): The maximum amount of instructions to execute. Defaults to None, no maximum.
+
+		Returns:
+			Simulation: The printed values, the returned value and the amount of instructions, cycles and stack it took.
+		"""
+		opcodes = self.opcodes
+		operands = self.operands
+		cycle_counts = self.cycles
+		taken = self.taken
+		budget = float("inf") if budget is None else budget
+		registers = [0] * 16
+		for index, argument in enumerate(arguments[:4]):
+			registers[index] = wrap(argument)
+		registers[13] = stackTop
+		registers[14] = returnAddress
+		memory : Dict[int, int] = {}
+		outputs : List[int] = []
+		lowest = stackTop
+		difference = 0
+		pc = self.labels[self.entry]
+		instructions = 0
+		cycles = 0
+		while True:
+			opcode = opcodes[pc]
+			operand = operands[pc]
+			cycles += cycle_counts[pc]
+			instructions += 1
+			pc += 1
+			if opcode == OP_LDR:
+				registers[operand[0]] = memory.get(registers[operand[1]] + operand[2], 0)
+			elif opcode == OP_STR:
+				memory[registers[operand[1]] + operand[2]] = registers[operand[0]]
+			elif opcode == OP_ADD_I:
+				registers[operand[0]] = wrap(registers[operand[1]] + operand[2])
+			elif opcode == OP_SUB_I:
+				registers[operand[0]] = wrap(registers[operand[1]] - operand[2])
+				if operand[0] == 13:
+					lowest = min(lowest, registers[13])
+			elif opcode == OP_MOV_R:
+				registers[operand[0]] = registers[operand[1]]
+			elif opcode == OP_MOV_I:
+				registers[operand[0]] = operand[1]
+			elif opcode == OP_CMP_R:
+				difference = registers[operand[0]] - registers[operand[1]]
+			elif opcode == OP_CMP_I:
+				difference = registers[operand[0]] - operand[1]
+			elif opcode <= OP_BLE and opcode >= OP_B:
+				if opcode == OP_B or (opcode == OP_BEQ and difference == 0) or (opcode == OP_BNE and difference != 0) or (opcode == OP_BGT and difference > 0) or (opcode == OP_BGE and difference >= 0) or (opcode == OP_BLT and difference < 0) or (opcode == OP_BLE and difference <= 0):
+					if opcode != OP_B:
+						cycles += taken[pc - 1]
+					if operand[0] < pc and instructions > budget:
+						self.__exceed_budget(budget)
+					pc = operand[0]
+			elif opcode == OP_ADD_R:
+				registers[operand[0]] = wrap(registers[operand[1]] + registers[operand[2]])
+			elif opcode == OP_SUB_R:
+				registers[operand[0]] = wrap(registers[operand[1]] - registers[operand[2]])
+			elif opcode == OP_MUL:
+				registers[operand[0]] = wrap(registers[operand[1]] * registers[operand[2]])
+			elif opcode == OP_BL:
+				if instructions > budget:
+					self.__exceed_budget(budget)
+				registers[14] = pc
+				pc = operand[0]
+			elif opcode == OP_PRINT:
+				outputs.append(registers[0])
+				registers[0:4] = [0, 0, 0, 0]
+			elif opcode == OP_PUSH:
+				for register in reversed(operand):
+					registers[13] -= 4
+					memory[registers[13]] = registers[register]
+				lowest = min(lowest, registers[13])
+			elif opcode == OP_POP:
+				for register in operand:
+					registers[register] = memory.get(registers[13], 0)
+					registers[13] += 4
+				if operand[-1] == 15:
+					if registers[15] == returnAddress:
+						return Simulation(outputs, registers[0], instructions, cycles, stackTop - lowest)
+					pc = registers[15]
+
+	def __decode(self, line : str) -> Tuple[int, Tuple]:
+		"""Decodes a single line of assembly code into its opcode and operands.
+		- Registers become their index in the list of registers and immediate values become integers.
+		- A operation with two operands uses its first operand as source as well, `ADD R0, #1` is decoded like `ADD R0, R0, #1`.
+		- `LDR` and `STR` get the register, the base register and the offset.
+		- Branches get the index of the instruction they jump to, `PUSH` and `POP` get the indexes of their registers.
+
+		Args:
+			line (str): A line of assembly code.
+
+		Returns:
+			Tuple[int, Tuple]: The opcode and the operands.
+		"""
+		operation, _, text = line.partition(" ")
+		if operation in ["PUSH", "POP"]:
+			return OP_PUSH if operation == "PUSH" else OP_POP, tuple(map(self.__register, text.strip("{}").split(",")))
+		if operation in branchDict:
+			if operation == "BL" and text not in self.labels:
+				return OP_PRINT, ()
+			if text not in self.labels:
+				cError("Simulation Error: The instruction `"+line+"` jumps to a label that does not exist.").throw()
+			return branchDict[operation], (self.labels[text],)
+		if operation in ["LDR", "STR"]:
+			register, _, address = text.partition(", ")
+			base, _, offset = address.strip("[]").partition(", ")
+			return OP_LDR if operation == "LDR" else OP_STR, (self.__register(register), self.__register(base), int(offset.strip("#") or 0))
+		operands = text.split(", ")
+		if operation in ["MOV", "CMP"] and len(operands) == 2:
+			immediate = operands[1].startswith("#")
+			opcode = {"MOV" : [OP_MOV_R, OP_MOV_I], "CMP" : [OP_CMP_R, OP_CMP_I]}[operation][immediate]
+			return opcode, (self.__register(operands[0]), int(operands[1][1:]) if immediate else self.__register(operands[1]))
+		if operation in ["ADD", "SUB", "MUL"] and len(operands) in [2, 3]:
+			operands = operands[:1] + operands if len(operands) == 2 else operands
+			immediate = operands[2].startswith("#")
+			if operation == "MUL" and immediate:
+				cError("Simulation Error: The instruction `"+line+"` is not supported.").throw()
+			opcode = {"ADD" : [OP_ADD_R, OP_ADD_I], "SUB" : [OP_SUB_R, OP_SUB_I], "MUL" : [OP_MUL]}[operation][immediate]
+			return opcode, (self.__register(operands[0]), self.__register(operands[1]), int(operands[2][1:]) if immediate else self.__register(operands[2]))
+		cError("Simulation Error: The instruction `"+line+"` is not supported.").throw()
+
+	def __register(self, name : str) -> int:
+		"""Returns the index of a register.
+
+		Args:
+			name (str): The name of the register, like R0 or SP.
+
+		Returns:
+			int: The index in the list of registers.
+		"""
+		if name.strip() not in registerDict:
+			cError("Simulation Error: The register `"+name+"` is not supported.").throw()
+		return registerDict[name.strip()]
+
+	def __exceed_budget(self, budget : int):
+		"""This function throws the error for code that did not return within its instruction budget.
+
+		Args:
+			budget (int): The maximum amount of instructions.
+		"""
+		cError("Simulation Error: The code did not return within the budget of "+str(budget)+" instructions.").throw()
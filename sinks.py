@@ -0,0 +1,92 @@
+import sys
+from array import array
+from typing import List, Callable, Any, IO
+
+from memory import cellTypeDict
+
+class OutputSink:
+	"""The base of every output sink, a sink receives every value `RB` prints.
+	The Interpreter calls write() once for every printed value, so a sink decides itself when the values actually leave the application.
+	"""
+	def write(self, value : int):
+		"""Receives a single printed value.
+
+		Args:
+			value (int): The value `RB` prints.
+		"""
+		pass
+
+	def flush(self):
+		"""Sends every value that is still waiting in the sink to its destination.
+		"""
+		pass
+
+	def close(self):
+		"""Flushes the sink, the destination itself is left open since the sink did not open it.
+		"""
+		self.flush()
+
+class PrintSink(OutputSink):
+	"""This sink prints every value on its own line right away, just like the `RB` instruction always did.
+	"""
+	def write(self, value : int):
+		print(value)
+
+class ListSink(OutputSink):
+	"""This sink keeps every value in a list in memory.
+	The write function is the append function of the list itself so a value costs a single call.
+	"""
+	def __init__(self):
+		self.values : List[int] = []
+		self.write = self.values.append
+
+	def __str__(self):
+		return "ListSink({values})".format(
+			values = self.values
+		)
+
+class TextSink(OutputSink):
+	"""This sink writes every value on its own line to a text file, like print does.
+	The values are collected and written at once every time flush_size values are waiting, so a file or terminal is not written to for every single value.
+	"""
+	def __init__(self, file : IO[str] = None, flush_size : int = 4096):
+		self.file = file if file is not None else sys.stdout
+		self.flush_size = flush_size
+		self.buffer : List[int] = []
+
+	def write(self, value : int):
+		self.buffer.append(value)
+		if len(self.buffer) >= self.flush_size:
+			self.flush()
+
+	def flush(self):
+		if self.buffer:
+			self.file.write("\n".join(map(str, self.buffer)) + "\n")
+			self.buffer = []
+		self.file.flush()
+
+class BinarySink(OutputSink):
+	"""This sink writes every value as a signed integer of cell_width bits in the byte order of the machine to a binary file.
+	The values are collected in a `array` and written at once every time flush_size values are waiting.
+	"""
+	def __init__(self, file : IO[bytes], flush_size : int = 4096, cell_width : int = 32):
+		self.file = file
+		self.flush_size = flush_size
+		self.buffer = array(cellTypeDict[cell_width])
+
+	def write(self, value : int):
+		self.buffer.append(value)
+		if len(self.buffer) >= self.flush_size:
+			self.flush()
+
+	def flush(self):
+		if self.buffer:
+			self.file.write(self.buffer.tobytes())
+			del self.buffer[:]
+		self.file.flush()
+
+class CallbackSink(OutputSink):
+	"""This sink calls the supplied function with every value.
+	"""
+	def __init__(self, callback : Callable[[int], Any]):
+		self.write = callback
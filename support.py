@@ -1,4 +1,4 @@
-from typing import List, Union, Callable, Any
+from typing import List, Union, Tuple, Callable, Any, IO
 import os
 
 from copy import deepcopy
@@ -18,9 +18,8 @@ def check_existance(func : Callable[[str], Any]):
 @check_existance
 def readFile(filename : str) -> List[str]:
 	"""This function will read a file containing Controller Code.
-	The function will cast all the strings to upper case.
+	The whole file is cast to upper case at once and then split in lines.
 	
-	Note that the map function is being used here which is a Higher Order Function.
 	Note that this function is decorate to check the existance of a file.
 	
 	Args:
@@ -30,8 +29,22 @@ def readFile(filename : str) -> List[str]:
 		List[str]: A list of strings, a single string for each code line in the file.
 	"""
 	with open(filename) as file:
-		raw_code = file.read().splitlines()
-		return list(map(lambda word: word.upper(), raw_code)) #map 4/3
+		return file.read().upper().splitlines()
+
+@check_existance
+def openFile(filename : str) -> IO[str]:
+	"""This function opens a file containing Controller Code so the Lexer can read it line by line, the file is never in memory as a whole.
+	Use the returned file in a `with` statement so it is closed afterwards.
+
+	Note that this function is decorate to check the existance of a file.
+
+	Args:
+		filename (str): The file to open. Controller Code files have the extension .coco
+
+	Returns:
+		IO[str]: The opened file.
+	"""
+	return open(filename)
 
 def printb(data, symbol = "=", times = 40):
 	"""Small support function for printing results and keeping them together in a block for visibility.
@@ -56,6 +69,22 @@ def cp(data : Any) -> Any:
 	"""
 	return deepcopy(data)
 	
+class Token:
+	"""This class contains a single lexed token, a instruction or a parameter, and the line and column in the code where it starts.
+	Both the line and column start at 1.
+	"""
+	def __init__(self, value : Union[str,int], line : int, column : int):
+		self.value = value
+		self.line = line
+		self.column = column
+
+	def __str__(self):
+		return "Token({value},\n{line},\n{column})".format(
+			value = self.value,
+			line = self.line,
+			column = self.column
+		)
+
 class bareError:
 	"""A very bare frame for error classes. 
 	Could be expanded upon with code lines for example.
@@ -68,7 +97,7 @@ class bareError:
 	
 class cError(bareError):
 	"""A custom error class that inherits from bareError.
-	A cError can always be printed but when a cError is thrown the application will close.
+	A cError can always be printed, when a cError is thrown it is raised as a CocoError.
 	"""
 	def __init__(self, error_string : str):
 		self.text = error_string
@@ -79,24 +108,26 @@ class cError(bareError):
 		)
 		
 	def throw(self):
-		"""This function will print itself and then exit the application.
+		"""This function raises itself as a CocoError, when nobody catches it cc.py prints it and closes the application.
 		"""
-		print(self)
-		exit()
+		raise CocoError([self])
+
+class CocoError(Exception):
+	"""The exception that is raised when one or more cErrors are thrown.
+	It contains every error so a program that uses the Lexer, Parser or Interpreter can handle them instead of the application closing.
+	"""
+	def __init__(self, errors : List[cError]):
+		super().__init__("\n".join(map(str, errors)))
+		self.errors = errors
 		
 def throw_errors(errors : List[cError]):
-	"""Small support function to print a list of cErrors and then throw the last one.
+	"""Small support function to throw a list of cErrors at once as a single CocoError.
 
 	Args:
 		errors (List[cError]): A list of cErrors.
 	"""
 	if errors:
-		head, *tail = errors
-		if tail:
-			print(head)
-			throw_errors(tail)
-		else:
-			head.throw()
+		raise CocoError(errors)
 	else:
 		print("Warning : There were no errors to throw!")
 
@@ -142,4 +173,57 @@ def getAddress(memory_address : int, target_register : str) -> str:
 	move_multiplier 	= "\nMOV R3, #4"
 	calculate_address 	= "\nMUL "+target_register+", "+target_register+", R3"
 	adjust_address 		= "\nSUB "+target_register+", R5, "+target_register
-	return move_address + move_multiplier + calculate_address + adjust_address
\ No newline at end of file
+	return move_address + move_multiplier + calculate_address + adjust_address
+
+def adjust(register : str, value : int) -> str:
+	"""Creates the instructions to add a value to a register, since a immediate value can be at most 255 large values are added in multiple steps.
+
+	Args:
+		register (str): The register to add the value to.
+		value (int): The value to add, negative to subtract.
+
+	Returns:
+		str: The `ADD` or `SUB` instructions, one on every line.
+	"""
+	instruction = "ADD "+register+", #" if value > 0 else "SUB "+register+", #"
+	steps = [252] * (abs(value) // 252) + ([abs(value) % 252] if abs(value) % 252 else [])
+	return "\n".join(map(lambda step : instruction+str(step), steps))
+
+#The largest offset a `LDR` or `STR` instruction can subtract from its base register, larger offsets have to be calculated first.
+maxLoadOffset = 255
+#The largest value a single `SUB` instruction can subtract from a register.
+maxSubtractOffset = 4095
+
+def getPointer(memory_address : int, target_register : str) -> str:
+	"""This function is used by the Compiler to place the address of a memory address in a register.
+	Since the memory address is known while compiling, the offset from the Stack Pointer in R5 is calculated right away and subtracted with a single instruction.
+	When the offset is too large for a single `SUB` instruction, getAddress() calculates it while running instead.
+
+	Args:
+		memory_address (int): The target memory address.
+		target_register (str): The Register in which the correct address will be stored.
+
+	Returns:
+		str: The instructions to get the correct memory address.
+	"""
+	if memory_address == 0:
+		return "\nMOV "+target_register+", R5"
+	if 0 < memory_address * 4 <= maxSubtractOffset:
+		return "\nSUB "+target_register+", R5, #"+str(memory_address * 4)
+	return getAddress(memory_address, target_register)
+
+def getOperand(memory_address : int, target_register : str) -> Tuple[str, str]:
+	"""This function is used by the Compiler to read or write a memory address.
+	When the offset from the Stack Pointer in R5 fits in the `LDR` or `STR` instruction itself, no instructions are needed to calculate the address.
+	Otherwise getPointer() places the address in the target register first.
+
+	Args:
+		memory_address (int): The target memory address.
+		target_register (str): The Register in which the address will be stored if it has to be calculated.
+
+	Returns:
+		Tuple[str, str]: The instructions to calculate the address, which can be empty, and the operand to use in a `LDR` or `STR` instruction.
+	"""
+	if 0 < memory_address * 4 <= maxLoadOffset:
+		return "", "[R5, #-"+str(memory_address * 4)+"]"
+	return getPointer(memory_address, target_register), "["+target_register+"]"
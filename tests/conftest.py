@@ -0,0 +1,34 @@
+import os, sys
+from typing import List, Union, Callable
+
+import pytest
+
+#The modules of the application are not a package, they are imported from the folder above the tests.
+rootDirectory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, rootDirectory)
+
+from lexer import Lexer
+from parser import Parser
+
+@pytest.fixture
+def parse() -> Callable[[str, List[int]], List[List[Union[str,int]]]]:
+	"""Returns a function that lexes, checks and parses Controller Code from a string.
+	"""
+	def parse_code(code : str, input_list : List[int] = []) -> List[List[Union[str,int]]]:
+		return Parser(Lexer(code.splitlines()).tokenize(input_list)).parse()
+	return parse_code
+
+@pytest.fixture
+def example_file() -> Callable[[str], str]:
+	"""Returns a function that gives the path of one of the example `.coco` files of the application.
+	"""
+	return lambda name : os.path.join(rootDirectory, name)
+
+@pytest.fixture
+def example(example_file) -> Callable[[str, List[int]], List[List[Union[str,int]]]]:
+	"""Returns a function that lexes, checks and parses one of the example `.coco` files of the application.
+	"""
+	def parse_example(name : str, input_list : List[int] = []) -> List[List[Union[str,int]]]:
+		with open(example_file(name)) as raw_code:
+			return Parser(Lexer(raw_code).tokenize(input_list)).parse()
+	return parse_example
@@ -0,0 +1,30 @@
+import pytest
+
+from lexer import Lexer
+from parser import Parser
+from interpreter import Interpreter
+from benchmark import workloadDict, scaledStagesDict, scaling
+
+@pytest.mark.parametrize("workload", list(workloadDict))
+def test_workloads_run(workload):
+	for size in [10, 40]:
+		parsed_list = Parser(Lexer(workloadDict[workload](size)).tokenize([])).parse()
+		assert Interpreter(parsed_list).run().outputs == Interpreter(parsed_list, optimize = False).run().outputs
+
+def test_loop_workload_sums_its_iterations():
+	assert Interpreter(Parser(Lexer(workloadDict["loop"](100)).tokenize([])).parse()).run().outputs == [5050]
+
+@pytest.mark.parametrize("workload", list(workloadDict))
+def test_scaled_stages_get_more_lines(workload):
+	grows = len(workloadDict[workload](40)) > len(workloadDict[workload](10))
+	assert grows == ("lexer" in scaledStagesDict[workload])
+
+def test_scaling_only_contains_the_scaled_stages():
+	stage = lambda throughput : {"work" : 1, "unit" : "lines", "seconds" : 1.0, "throughput" : throughput, "peak_memory" : 0}
+	results = dict(map(lambda workload : (workload, {
+		"10" : dict(map(lambda name : (name, stage(100.0)), ["lexer", "parser", "interpreter", "compiler"])),
+		"40" : dict(map(lambda name : (name, stage(50.0)), ["lexer", "parser", "interpreter", "compiler"]))
+	}), workloadDict))
+	scales = scaling(results)
+	assert scales["recursion"] == {"interpreter" : 2.0}
+	assert scales["straight"] == dict(map(lambda name : (name, 2.0), ["lexer", "parser", "interpreter", "compiler"]))
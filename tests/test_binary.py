@@ -0,0 +1,59 @@
+import pytest
+
+from interpreter import Interpreter
+from binary import BinaryWriter, source_lines
+from support import CocoError
+
+def write(interpreter, code_lines, filename):
+	BinaryWriter(interpreter.bytecode, interpreter.link_table, interpreter.loops, source_lines(code_lines)).write(filename)
+	return filename
+
+@pytest.mark.parametrize("name, input_list", [
+	("loopysum.coco", [10]),
+	("loopysum.coco", [1000]),
+	("even.coco", [4]),
+	("even.coco", [7]),
+	("code.coco", [3, 4])
+])
+def test_round_trip(example, example_file, tmp_path, name, input_list):
+	interpreter = Interpreter(example(name, input_list))
+	with open(example_file(name)) as raw_code:
+		loaded = Interpreter.load(write(interpreter, raw_code, str(tmp_path / "program.cocob")))
+	expected = interpreter.run(input_list)
+	result = loaded.run(input_list)
+	assert (result.outputs, result.value, result.memory_pointer, result.steps) == (expected.outputs, expected.value, expected.memory_pointer, expected.steps)
+	assert loaded.inputs == interpreter.inputs == len(input_list)
+	assert loaded.program.lines.tolist() == list(range(1, len(interpreter.tokens) + 1))
+
+@pytest.mark.parametrize("input_list", [[], [3]])
+def test_loaded_code_checks_the_input(parse, tmp_path, capsys, input_list):
+	code = "ZL 1 1\nZL 2 2\nRB\nBX"
+	loaded = Interpreter.load(write(Interpreter(parse(code, [3, 4])), code.splitlines(), str(tmp_path / "input.cocob")))
+	with pytest.raises(CocoError, match = "ZL cannot have more arguments"):
+		loaded.interpret(input_list)
+	with pytest.raises(SystemExit):
+		loaded.interpret([3, 4])
+	assert capsys.readouterr().out.split() == ["3"]
+
+def test_interpret_reports_a_missing_memory_address(parse):
+	with pytest.raises(CocoError, match = "line 2 uses a memory address"):
+		Interpreter(parse("LB 500\nRB\nBX")).interpret()
+
+def test_damaged_file_is_not_loaded(parse, tmp_path):
+	code = "AX 5\nRB\nBX"
+	filename = write(Interpreter(parse(code)), code.splitlines(), str(tmp_path / "damaged.cocob"))
+	with open(filename, "r+b") as file:
+		file.seek(-1, 2)
+		file.write(b"\xff")
+	with pytest.raises(CocoError, match = "checksum"):
+		Interpreter.load(filename)
+	assert Interpreter.load(filename, verify = False).run().outputs == [5]
+
+def test_other_version_is_not_loaded(parse, tmp_path):
+	code = "AX 5\nRB\nBX"
+	filename = write(Interpreter(parse(code)), code.splitlines(), str(tmp_path / "version.cocob"))
+	with open(filename, "r+b") as file:
+		file.seek(6)
+		file.write(b"\x01\x00")
+	with pytest.raises(CocoError, match = "another version"):
+		Interpreter.load(filename)
@@ -0,0 +1,31 @@
+import pytest
+
+from interpreter import Interpreter
+from binary import BinaryWriter, source_lines
+from support import CocoError
+from memory import wrap
+from bytecode import pack_operand, limit_operand
+
+@pytest.mark.parametrize("value", [3000000000, -3000000000, 30000000000000000000])
+@pytest.mark.parametrize("cell_width", [8, 16, 32])
+@pytest.mark.parametrize("use_bytecode", [True, False])
+def test_immediate_outside_32_bits_wraps(parse, value, cell_width, use_bytecode):
+	result = Interpreter(parse("AX "+str(value)+"\nRB\nLB 2\nAX "+str(value)+"\nRB\nBX"), cell_width = cell_width, use_bytecode = use_bytecode).run()
+	assert result.outputs == [wrap(value, cell_width)] * 2
+
+def test_pack_operand():
+	assert pack_operand(["AX", 1 << 32], 1) == 0
+	assert pack_operand(["STORE", 1 << 40, (1 << 32) + 5], 2) == 5
+	assert pack_operand(["STORE", 1 << 40, 5], 1) == limit_operand(1 << 40) == (1 << 31) - 1
+	assert pack_operand(["RB"], 1) == 0
+
+def test_address_outside_32_bits_does_not_exist(parse):
+	interpreter = Interpreter(parse("XA 3000000000\nRB\nBX"))
+	with pytest.raises(CocoError, match = "does not exist"):
+		interpreter.run()
+
+def test_binary_with_values_outside_32_bits(parse, tmp_path):
+	code = "BA 5000000000\nAX 3000000000\nAB\nZL 1 1\nSTART 5000000000\nRB\nBX"
+	interpreter = Interpreter(parse(code, [1]))
+	BinaryWriter(interpreter.bytecode, interpreter.link_table, interpreter.loops, source_lines(code.splitlines())).write(str(tmp_path / "large.cocob"))
+	assert Interpreter.load(str(tmp_path / "large.cocob")).run([1]).outputs == [wrap(3000000000, 32)]
@@ -0,0 +1,50 @@
+import pytest
+
+from debugger import ReverseDebugger
+from sinks import ListSink
+from support import CocoError
+
+def state(debugger):
+	platform = debugger.platform
+	return (platform.instruction_pointer, platform.memory_pointer, platform.memory.tolist(), list(platform.function_call_stack))
+
+def record(debugger):
+	states = [state(debugger)]
+	while not debugger.finished():
+		debugger.forward()
+		states.append(state(debugger))
+	return states
+
+@pytest.mark.parametrize("checkpoint_interval", [3, 10000])
+@pytest.mark.parametrize("code, input_list", [
+	("LEFT\nLEFT\nAX 5\nUP\nUP\nDOWN\nRB\nRIGHT\nXA 127\nLEFT\nUP\nRB\nBX", []),
+	("ZL 1 1\nLEFT\nLEFT\nXA 1\nDOWN\nRIGHT\nRIGHT\nRIGHT\nXB 3\nYB 3 1\nBX", [6])
+])
+def test_undo_at_wrapped_addresses(parse, checkpoint_interval, code, input_list):
+	debugger = ReverseDebugger(parse(code, input_list), 128, checkpoint_interval = checkpoint_interval)
+	debugger.start(input_list, ListSink())
+	states = record(debugger)
+	assert states[-1][2][-1] != 0
+	for step in reversed(range(len(states))):
+		debugger.goto(step)
+		assert state(debugger) == states[step]
+	assert state(debugger) == states[0]
+
+def test_undo_function_calls(example):
+	debugger = ReverseDebugger(example("even.coco", [5]), 64, checkpoint_interval = 7)
+	sink = ListSink()
+	debugger.start([5], sink)
+	states = record(debugger)
+	for step in [len(states) - 2, 3, 20, 0, len(states) - 1]:
+		debugger.goto(step)
+		assert state(debugger) == states[step]
+	assert sink.values == [0]
+
+def test_steps_older_than_the_log_cannot_be_restored(parse):
+	debugger = ReverseDebugger(parse("UP\nUP\nUP\nUP\nUP\nBX"), 8, capacity = 2)
+	debugger.start([], ListSink())
+	debugger.forward(5)
+	debugger.backward(2)
+	assert state(debugger)[2][1] == 3
+	with pytest.raises(CocoError, match = "no longer in the undo log"):
+		debugger.goto(2)
@@ -0,0 +1,33 @@
+import pytest
+
+from interpreter import Interpreter
+
+#Every way the Interpreter can execute the code: the Bytecode, the interpreterDict and both without superinstructions.
+modes = [
+	{},
+	{"use_bytecode" : False},
+	{"optimize" : False},
+	{"use_bytecode" : False, "optimize" : False}
+]
+
+@pytest.mark.parametrize("options", modes)
+@pytest.mark.parametrize("name, input_list, outputs", [
+	("loopysum.coco", [10], [55]),
+	("loopysum.coco", [0], [0]),
+	("even.coco", [4], [1]),
+	("even.coco", [7], [0]),
+	("code.coco", [3, 4], [3, 4])
+])
+def test_examples(example, options, name, input_list, outputs):
+	assert Interpreter(example(name, input_list), **options).run(input_list).outputs == outputs
+
+@pytest.mark.parametrize("options", modes)
+def test_memory_wraps_around(parse, options):
+	result = Interpreter(parse("AX 127\nUP\nRB\nBX"), cell_width = 8, **options).run()
+	assert result.outputs == [-128]
+
+@pytest.mark.parametrize("options", modes)
+def test_interpret_prints_and_exits(parse, capsys, options):
+	with pytest.raises(SystemExit):
+		Interpreter(parse("AX 5\nRB\nBX"), **options).interpret()
+	assert capsys.readouterr().out.split() == ["5"]
@@ -0,0 +1,39 @@
+import pytest
+
+from interpreter import Interpreter
+from binary import BinaryWriter, source_lines
+from loops import CountedLoop
+
+#The loop sums the input like `loopysum.coco`, the body counts down with a run of `DOWN`, `DOWN` and `UP`.
+#The `SELECT` after `BX` is never executed, but it jumps to line 11 so the Optimizer does not fuse that line with the line before it.
+splitLoop = "BA 1\nRIGHT\nAX 0\nRIGHT\nAX 0\nLB 1\nXY 1 3\nSELECT 14\nYB 2 1\nDOWN\nDOWN\nUP\nSELECT 7\nAB\nZL 1 1\nSTART 1\nXA 2\nRB\nBX\nSELECT 11"
+
+def run_without_closed_form(parsed_list, input_list, monkeypatch):
+	with monkeypatch.context() as patch:
+		patch.setattr(CountedLoop, "run", lambda *params : 0)
+		return Interpreter(parsed_list).run(input_list)
+
+@pytest.mark.parametrize("code, steps", [
+	(splitLoop, 5),
+	(splitLoop.replace("\nSELECT 11", ""), 4)
+])
+def test_steps_follow_the_optimizer(parse, monkeypatch, code, steps):
+	parsed_list = parse(code, [10])
+	interpreter = Interpreter(parsed_list)
+	assert [loop.steps for loop in interpreter.loops.values()] == [steps]
+	result = interpreter.run([10])
+	expected = run_without_closed_form(parsed_list, [10], monkeypatch)
+	assert result.outputs == expected.outputs == [55]
+	assert result.steps == expected.steps
+
+def test_loopysum_steps_match_the_iterations(example, monkeypatch):
+	parsed_list = example("loopysum.coco", [100])
+	assert Interpreter(parsed_list).run([100]).steps == run_without_closed_form(parsed_list, [100], monkeypatch).steps
+
+def test_loaded_loops_keep_their_steps(parse, tmp_path):
+	interpreter = Interpreter(parse(splitLoop, [10]))
+	filename = str(tmp_path / "loop.cocob")
+	BinaryWriter(interpreter.bytecode, interpreter.link_table, interpreter.loops, source_lines(splitLoop.splitlines())).write(filename)
+	loaded = Interpreter.load(filename)
+	assert [(loop.head, loop.steps, loop.body) for loop in loaded.loops.values()] == [(loop.head, loop.steps, loop.body) for loop in interpreter.loops.values()]
+	assert loaded.run([10]).steps == interpreter.run([10]).steps
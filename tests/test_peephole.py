@@ -0,0 +1,34 @@
+import pytest
+
+from peephole import Peephole
+from compiler import Compiler
+
+def optimize(lines):
+	return list(Peephole(lambda : iter(lines)).optimize())
+
+def test_branch_to_the_next_line_is_removed():
+	assert optimize(["f:", "CMP R0, R1", "BEQ l_8", "BNE l_9", "l_8:", "MOV R0, #1", "l_9:", "BX LR"]) == ["f:", "CMP R0, R1", "BNE l_9", "MOV R0, #1", "l_9:", "BX LR"]
+
+def test_branch_over_a_branch_is_inverted():
+	assert optimize(["f:", "CMP R0, R1", "BEQ l_8", "B l_9", "l_8:", "MOV R0, #1", "l_9:", "BX LR"]) == ["f:", "CMP R0, R1", "BNE l_9", "MOV R0, #1", "l_9:", "BX LR"]
+
+def test_label_jumped_to_from_elsewhere_is_kept():
+	assert optimize(["f:", "l_2:", "CMP R0, R1", "BEQ l_8", "l_8:", "MOV R0, #1", "BEQ l_8", "B l_2"]) == ["f:", "l_2:", "CMP R0, R1", "l_8:", "MOV R0, #1", "BEQ l_8", "B l_2"]
+
+def test_lines_are_created_twice_and_never_kept():
+	calls = []
+	def lines():
+		calls.append(True)
+		yield from ["f:", "l_1:", "MOV R0, #1", "B l_1"]
+	peephole = Peephole(lines)
+	optimized = peephole.optimize()
+	assert next(optimized) == "f:"
+	assert len(calls) == 2
+	assert list(optimized) == ["l_1:", "MOV R0, #1", "B l_1"]
+
+@pytest.mark.parametrize("name, asm_file", [("loopysum.coco", "loopysum.asm"), ("even.coco", "even.asm"), ("code.coco", "coco.asm")])
+def test_examples_match_their_assembly_code(example, example_file, name, asm_file):
+	compiler = Compiler(example(name, [1, 2]), asm_file, 64)
+	with open(example_file(asm_file)) as compiled:
+		assert compiler.compile() == compiled.read()
+	assert sum(compiler.peephole.before.values()) - sum(compiler.peephole.after.values()) == sum(compiler.peephole.saved().values()) >= 0
@@ -0,0 +1,50 @@
+import pytest
+
+from interpreter import Interpreter, Platform, throw_index_error
+from memory import Memory
+from debugger import ReverseDebugger
+from profiler import Profiler
+from support import CocoError
+
+#Every way the Interpreter can execute the code.
+modes = [{}, {"use_bytecode" : False}, {"optimize" : False}]
+
+@pytest.mark.parametrize("options", modes)
+def test_run_returns_the_result(parse, options):
+	result = Interpreter(parse("ZL 1 1\nUP\nRB\nRIGHT\nAX 7\nRB\nBX", [4]), **options).run([4])
+	assert (result.outputs, result.value, result.memory_pointer, result.steps) == ([5, 7], 7, 2, 7)
+	assert result.memory.tolist()[:3] == [0, 5, 7]
+
+@pytest.mark.parametrize("options", modes)
+@pytest.mark.parametrize("code, input_list, message", [
+	("LB 500\nRB\nBX", [], "instruction on line 2 uses a memory address or input that does not exist"),
+	("XA 200\nRB\nBX", [], "instruction on line 1 uses a memory address or input that does not exist"),
+	("ZL 2 1\nRB\nBX", [1, 2], "instruction on line 1 uses a memory address or input that does not exist"),
+	("AX 1\nSELECT 4\nBX\nRB", [], "ran past its last line without reaching `BX`, the instruction pointer is at line 5"),
+	("SELECT 3\nBA 1\nAB\nBX", [], "`AB` instruction on line 3 was reached without a `START`")
+])
+def test_run_errors(parse, options, code, input_list, message):
+	interpreter = Interpreter(parse(code, input_list), **options)
+	with pytest.raises(CocoError, match = message):
+		interpreter.run(input_list[:1])
+
+@pytest.mark.parametrize("options", modes)
+def test_run_budget(parse, options):
+	interpreter = Interpreter(parse("AX 1\nSELECT 2\nBX"), **options)
+	with pytest.raises(CocoError, match = "budget of 100 instructions"):
+		interpreter.run(budget = 100)
+
+def test_other_index_errors_are_raised_again():
+	platform = Platform([["RIGHT"], ["BX"]], Memory(8), 0, 1, [], [1, 2])
+	assert throw_index_error(platform, "RIGHT") is None
+	with pytest.raises(CocoError, match = "line 1 uses a memory address"):
+		throw_index_error(platform, "XA")
+
+def test_debugger_and_profiler_report_running_past_the_end(parse):
+	tokens = parse("AX 1\nSELECT 4\nBX\nRB")
+	debugger = ReverseDebugger(tokens, 64)
+	debugger.start()
+	with pytest.raises(CocoError, match = "ran past its last line"):
+		debugger.forward(10)
+	with pytest.raises(CocoError, match = "ran past its last line"):
+		Profiler(tokens).profile()
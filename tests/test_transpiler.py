@@ -0,0 +1,51 @@
+import pytest
+
+from interpreter import Interpreter
+from transpiler import Transpiler
+from sinks import ListSink
+from support import CocoError
+
+def transpile_run(parsed_list, input_list):
+	sink = ListSink()
+	value = Transpiler(parsed_list).run(input_list, 64, sink)
+	return sink.values, value
+
+def interpret_run(parsed_list, input_list):
+	result = Interpreter(parsed_list, 64).run(input_list)
+	return result.outputs, result.value
+
+@pytest.mark.parametrize("name, input_list", [
+	("loopysum.coco", [10]),
+	("even.coco", [4]),
+	("even.coco", [7]),
+	("code.coco", [3, 4])
+])
+def test_examples(example, name, input_list):
+	parsed_list = example(name, input_list)
+	assert transpile_run(parsed_list, input_list) == interpret_run(parsed_list, input_list)
+
+@pytest.mark.parametrize("instruction", ["XY 1 2", "AY 1 2", "BY 1 2"])
+@pytest.mark.parametrize("input_list", [[1], [-2], [0]])
+def test_conditional_skip_out_of_a_function(parse, instruction, input_list):
+	parsed_list = parse("ZL 1 1\nSTART 1\nRB\nBX\nBA 1\nUP\n"+instruction+"\nAB\nRB\nLB 2\nRB\nBX", input_list)
+	assert transpile_run(parsed_list, input_list) == interpret_run(parsed_list, input_list)
+
+def test_select_out_of_a_function_continues_until_ab(parse):
+	parsed_list = parse("START 1\nRB\nBX\nBA 1\nUP\nSELECT 8\nAB\nUP\nUP\nAB\nBX")
+	assert transpile_run(parsed_list, []) == interpret_run(parsed_list, []) == ([3], 3)
+
+@pytest.mark.parametrize("code, message", [
+	("AX 1\nSELECT 4\nBX\nRB", "ran past its last line"),
+	("AX 1\nRIGHT\nXY 1 2\nBX", "ran past its last line"),
+	("SELECT 3\nBA 1\nAB\nBX", "`AB` instruction on line 3 was reached without a `START`")
+])
+def test_runtime_errors_match_the_interpreter(parse, code, message):
+	parsed_list = parse(code)
+	with pytest.raises(CocoError, match = message):
+		transpile_run(parsed_list, [])
+	with pytest.raises(CocoError, match = message):
+		interpret_run(parsed_list, [])
+
+def test_function_that_jumps_back_before_its_first_line(parse):
+	parsed_list = parse("BA 1\nXA 6\nSELECT 4\nYB 1 2\nXA 2\nAB\nBA 2\nLEFT\nAX -1\nDOWN\nSELECT 6\nAB\nSTART 2\nSTART 2\nBX")
+	assert transpile_run(parsed_list, []) == interpret_run(parsed_list, []) == ([], -2)
@@ -0,0 +1,212 @@
+from typing import List, Union, Callable
+
+from support import cError
+from linker import Linker
+from memory import Memory
+from sinks import OutputSink, TextSink
+
+#This dictionary contains the Python code of every instruction that does not change the control flow.
+#The memory is called `m`, the memory pointer `mp`, the input list `inputs` and the write function of the output sink `output`.
+#Every value that is calculated wraps around using the globals HALF and MASK, so it always fits in a memory cell.
+transpilerDict = {
+	"RIGHT" : lambda *params : "mp += 1",
+	"LEFT" : lambda *params : "mp -= 1",
+	"UP" : lambda *params : "m[mp] = "+wrap_expression("m[mp] + 1"),
+	"DOWN" : lambda *params : "m[mp] = "+wrap_expression("m[mp] - 1"),
+	"START" : lambda *params : "mp = f_"+str(params[0])+"(m, mp, inputs)",
+	"ZL" : lambda *params : "m["+str(params[1])+"] = "+wrap_expression("inputs["+str(params[0]-1)+"]"),
+	"LB" : lambda *params : "mp = "+str(params[0]),
+	"RB" : lambda *params : "output(m[mp])",
+	"AX" : lambda *params : "m[mp] = "+wrap_expression(str(params[0])),
+	"XA" : lambda *params : "m[mp] = m["+str(params[0])+"]",
+	"XB" : lambda *params : "m["+str(params[0])+"] = m[mp]",
+	"YA" : lambda *params : "m["+str(params[0])+"] = "+wrap_expression("m["+str(params[0])+"] * m["+str(params[1])+"]"),
+	"YB" : lambda *params : "m["+str(params[0])+"] = "+wrap_expression("m["+str(params[0])+"] + m["+str(params[1])+"]"),
+	"YX" : lambda *params : "m["+str(params[0])+"] = "+wrap_expression("m["+str(params[0])+"] - m["+str(params[1])+"]"),
+}
+
+#This dictionary contains the Python comparison of the conditional instructions.
+comparisonDict = {
+	"XY" : "==",
+	"AY" : ">",
+	"BY" : "<"
+}
+
+def wrap_expression(expression : str) -> str:
+	"""Creates a Python expression that wraps the result of the supplied expression around to a signed integer, just like the memory of the Interpreter.
+
+	Args:
+		expression (str): The Python expression whose result should fit in a memory cell.
+
+	Returns:
+		str: The wrapping Python expression.
+	"""
+	return "((" + expression + " + HALF) & MASK) - HALF"
+
+class Halt(Exception):
+	"""This exception is raised by the `BX` instruction in the transpiled code so it stops the code even when it is inside a function.
+	"""
+	def __init__(self, memory_pointer : int):
+		self.memory_pointer = memory_pointer
+
+class Fault(Exception):
+	"""This exception is raised by the transpiled code when it reaches a `AB` without a `START` or runs past its last line, it contains the text of the error the Interpreter gives.
+	"""
+	def __init__(self, text : str):
+		self.text = text
+
+class Transpiler:
+	"""The Transpiler class rewrites parsed Controller Code to Python source code, which can then be loaded and run by Python itself.
+	Every `BA` function becomes a Python function and the rest of the code becomes the function `main`.
+	Inside a function the code is split in basic blocks, a block starts on every line that can be jumped to.
+	The blocks are placed in a loop and the variable `block` contains the line of the block to execute next, this is how `SELECT`, `XY`, `AY` and `BY` jump.
+	Every Python function contains every line that can be reached from its first line without following `START`, so a jump out of a `BA` function continues with the code after it until a `AB` returns, just like in the Interpreter.
+	"""
+	def __init__(self, parsed_tokens : List[List[Union[str,int]]], cell_width : int = 32):
+		"""The init function will ask the user to supply parsed Controller Code tokens and the width of the memory cells.
+
+		Args:
+			parsed_tokens (List[List[Union[str,int]]]): A List of parsed Controller Code tokens
+			cell_width (int, optional): The width of a memory cell in bits, 8, 16 or 32. Defaults to 32 like the words of the compiled code.
+		"""
+		self.tokens = parsed_tokens
+		self.cell_width = cell_width
+		self.link_table = Linker(parsed_tokens).link()
+
+	def transpile(self) -> str:
+		"""Call this function to create the Python source code of the parsed tokens.
+
+		Returns:
+			str: A string containing Python source code with a function for every `BA` instruction and a `main(m, inputs)` function.
+		"""
+		functions = sorted(self.link_table.functions.items(), key = lambda function : function[1])
+		python_code = ""
+		for identifier, (start, _) in functions:
+			python_code += "def f_"+str(identifier)+"(m, mp, inputs):\n" + self.__create_blocks(start+1, self.__reachable(start+1), True)
+		python_code += "def main(m, inputs):\n\tmp = 1\n" + self.__create_blocks(0, self.__reachable(0), False)
+		return python_code
+
+	def load(self, output : Callable[[int], None] = print) -> Callable[[List[int], List[int]], int]:
+		"""This function transpiles the parsed tokens and lets Python compile the source code.
+
+		Args:
+			output (Callable[[int], None], optional): The function that receives every value `RB` prints. Defaults to print.
+
+		Returns:
+			Callable[[List[int], List[int]], int]: The `main(m, inputs)` function, it returns the memory pointer when the code reaches `BX`.
+		"""
+		namespace = {"Halt" : Halt, "Fault" : Fault, "output" : output, "HALF" : 1 << (self.cell_width - 1), "MASK" : (1 << self.cell_width) - 1}
+		exec(compile(self.transpile(), "<controller code>", "exec"), namespace)
+		return namespace["main"]
+
+	def run(self, input_list : List[int] = [], memory_size : int = 128, sink : OutputSink = None) -> int:
+		"""This function loads the transpiled code and runs it on a new memory stack.
+		Note that just like in the Interpreter the memory pointer starts at 1.
+
+		Args:
+			input_list (List[int], optional): The input of the Controller Code. Defaults to [].
+			memory_size (int, optional): The size of the memory stack. Defaults to 128.
+			sink (OutputSink, optional): The sink that receives every value `RB` prints. Defaults to a TextSink that writes to the standard output.
+
+		Returns:
+			int: The value the memory pointer is pointing to when the code reaches `BX`, the same value the compiled code returns in R0.
+		"""
+		sink = sink if sink is not None else TextSink()
+		main = self.load(sink.write)
+		memory = Memory(memory_size, self.cell_width).cells
+		try:
+			memory_pointer = main(memory, input_list)
+		except Halt as halt:
+			memory_pointer = halt.memory_pointer
+		except Fault as fault:
+			cError(fault.text).throw()
+		except RecursionError:
+			cError("Runtime Error: The functions call each other too deep for the Transpiler, use the Interpreter instead.").throw()
+		finally:
+			sink.flush()
+		return memory[memory_pointer]
+
+	def __reachable(self, first : int) -> List[int]:
+		"""This function finds every line that can be reached from the supplied line without following `START`, a `START` continues on the next line once the function returns.
+		The lines of a `BA` function are normally the lines until its `AB`, but a jump out of the function reaches lines after it as well.
+		When the code can run past its last line the index after it is included too, it becomes the block that raises the error.
+
+		Args:
+			first (int): The index of the first instruction.
+
+		Returns:
+			List[int]: The indexes of the reachable instructions in order.
+		"""
+		jumps = self.link_table.jumps
+		reached = set()
+		pending = [first]
+		while pending:
+			line = pending.pop()
+			if line in reached:
+				continue
+			reached.add(line)
+			if line == len(self.tokens):
+				continue
+			instruction = self.tokens[line][0]
+			if instruction in ["SELECT", "BA"]:
+				pending.append(jumps[line])
+			elif instruction in comparisonDict:
+				pending.extend([line+1, jumps[line]])
+			elif instruction not in ["AB", "BX"]:
+				pending.append(line+1)
+		return sorted(reached)
+
+	def __create_blocks(self, first : int, lines : List[int], function : bool) -> str:
+		"""This function creates the Python code of a function, the supplied lines are split in basic blocks.
+		A new block starts at the first line, at every line that is jumped to, after every line that jumps and at every line that does not follow the line before it.
+		The lines are placed in order, the function starts with the block of its first line which does not have to be the first block.
+
+		Args:
+			first (int): The index of the instruction the function starts with, a jump back can reach lines before it.
+			lines (List[int]): The indexes of the instructions the function can reach, see __reachable().
+			function (bool): Whether the lines belong to a `BA` function, a `AB` outside of a function is a error.
+
+		Returns:
+			str: The indented Python code of the function.
+		"""
+		jumps = self.link_table.jumps
+		leaders = {lines[0], first}
+		for index, line in enumerate(lines):
+			if line < len(self.tokens) and self.tokens[line][0] in ["SELECT", "BA"] + list(comparisonDict):
+				leaders.update([jumps[line], line+1])
+			elif index and lines[index-1] != line-1:
+				leaders.add(line)
+		python_code = "\tblock = "+str(first)+"\n\twhile True:\n"
+		for line in lines:
+			if line in leaders:
+				python_code += "\t\t"+("if" if line == lines[0] else "elif")+" block == "+str(line)+":\n"
+			python_code += "".join(map(lambda statement : "\t\t\t"+statement+"\n", self.__create_statements(line, leaders, function)))
+		return python_code
+
+	def __create_statements(self, line : int, leaders : set, function : bool) -> List[str]:
+		"""This function creates the Python statements of a single instruction, the index after the last instruction raises the error for running past the last line.
+
+		Args:
+			line (int): The index of the instruction.
+			leaders (set): The indexes of the instructions that start a block.
+			function (bool): Whether the instruction is part of a `BA` function.
+
+		Returns:
+			List[str]: The Python statements of the instruction, the last instruction of a block also selects the next block.
+		"""
+		if line == len(self.tokens):
+			return ["raise Fault(\"Runtime Error: The code ran past its last line without reaching `BX`, the instruction pointer is at line "+str(line+1)+".\")"]
+		instruction, *params = self.tokens[line]
+		jumps = self.link_table.jumps
+		if instruction in comparisonDict:
+			return ["block = "+str(line+1)+" if m["+str(params[0])+"] "+comparisonDict[instruction]+" m["+str(params[1])+"] else "+str(jumps[line])]
+		elif instruction in ["SELECT", "BA"]:
+			return ["block = "+str(jumps[line])]
+		elif instruction == "AB":
+			return ["return mp" if function else "raise Fault(\"Runtime Error: The `AB` instruction on line "+str(line+1)+" was reached without a `START`.\")"]
+		elif instruction == "BX":
+			return ["raise Halt(mp)"]
+		statements = [transpilerDict[instruction](*params)]
+		if line+1 in leaders:
+			statements.append("block = "+str(line+1))
+		return statements
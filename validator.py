@@ -0,0 +1,109 @@
+from typing import List, Union, Dict, Tuple, Iterable, Iterator
+
+from support import Token, cError, syntaxParametersDict
+
+#These instructions have parameters that are memory addresses or lines, they cannot be 0 or less.
+positiveParameterInstructions = ["SELECT", "XA", "XB", "ZL", "XY", "AY", "BY", "YB", "YX"]
+
+class Validator:
+	"""The Validator class checks the syntax and the structure of lexed Controller Code in a single pass over the tokens.
+	While walking over the tokens it builds indexes of the `BA`, `AB`, `START` and `SELECT` instructions, these are checked against each other once all tokens have been seen.
+	Every error contains the line it was found on and all errors are reported at once, sorted by line.
+	"""
+	def __init__(self, input_list : List[int]):
+		self.input_list = input_list
+		self.found : List[Tuple[int, cError]] = []
+		self.functions : Dict[int, int] = {}
+		self.open_functions : List[int] = []
+		self.starts : List[Tuple[int, int]] = []
+		self.selects : List[Tuple[int, int]] = []
+		self.instruction_count = 0
+
+	def check(self, tokens : Iterable[Token]) -> Iterator[Union[str,int]]:
+		"""This function walks over the tokens once and yields the value of every token, so the tokens never have to be stored.
+		A instruction is checked as soon as all of its parameters have been read, the errors are collected and can be requested with errors() afterwards.
+
+		Args:
+			tokens (Iterable[Token]): The tokens, for example from `Lexer.lex()`.
+
+		Returns:
+			Iterator[Union[str,int]]: The value of every token.
+		"""
+		instruction = None
+		parameters = []
+		for token in tokens:
+			yield token.value
+			if instruction is not None:
+				parameters.append(token.value)
+			elif token.value not in syntaxParametersDict:
+				self.__error(token.line, "The instruction `"+str(token.value)+"` is not supported.")
+				continue
+			else:
+				instruction = token
+			if len(parameters) == syntaxParametersDict[instruction.value]:
+				self.__check_instruction(instruction, parameters)
+				instruction = None
+				parameters = []
+		if instruction is not None:
+			self.__check_instruction(instruction, parameters)
+
+	def errors(self) -> List[cError]:
+		"""This function checks the indexes against each other and returns every error that has been found, sorted by line.
+		- Every `BA` that is still open at the end of the code misses its `AB`.
+		- Every `START` has to call a identifier that belongs to a `BA`.
+		- Every `SELECT` has to jump to a existing line.
+
+		Returns:
+			List[cError]: A list containing either nothing or 1 or more cErrors.
+		"""
+		for line in self.open_functions:
+			self.__error(line, "Missing a `AB` instruction to end `BA` instruction.")
+		self.open_functions = []
+		for identifier, line in self.starts:
+			if identifier not in self.functions:
+				self.__error(line, "START instruction with identifier `"+str(identifier)+"` is invalid since there is no BA with identifier `"+str(identifier)+"`.")
+		for target, line in self.selects:
+			if target > self.instruction_count:
+				self.__error(line, "SELECT jumps to instruction "+str(target)+" but the code only has "+str(self.instruction_count)+" instructions.")
+		return list(map(lambda error : error[1], sorted(self.found, key = lambda error : error[0])))
+
+	def __check_instruction(self, instruction : Token, parameters : List[Union[str,int]]):
+		"""This function checks a single instruction with its parameters and adds it to the indexes.
+
+		Args:
+			instruction (Token): The token of the instruction.
+			parameters (List[Union[str,int]]): The parameters that follow the instruction.
+		"""
+		name = instruction.value
+		line = instruction.line
+		self.instruction_count += 1
+		if len(parameters) < syntaxParametersDict[name] or not all(map(lambda parameter : isinstance(parameter, int), parameters)):
+			self.__error(line, str(name)+" parameters have to be numeric.")
+			return
+		if name in positiveParameterInstructions and min(parameters) < 1:
+			self.__error(line, str(name)+" parameters cannot be 0 or less.")
+		elif name == "ZL" and (parameters[0] > len(self.input_list) or parameters[0] > 2):
+			self.__error(line, str(name)+" cannot have more arguments than there are supplied with a maximum of 2.")
+		elif name == "BA":
+			if parameters[0] in self.functions:
+				self.__error(line, "BA with identifier `"+str(parameters[0])+"` already exists on line "+str(self.functions[parameters[0]])+".")
+			else:
+				self.functions[parameters[0]] = line
+			self.open_functions.append(line)
+		elif name == "AB":
+			for open_line in self.open_functions[:-1]:
+				self.__error(open_line, "BA has a nested BA this is not allowed.")
+			self.open_functions = []
+		elif name == "START":
+			self.starts.append((parameters[0], line))
+		elif name == "SELECT":
+			self.selects.append((parameters[0], line))
+
+	def __error(self, line : int, text : str):
+		"""Adds a error with its line number.
+
+		Args:
+			line (int): The line of the code the error was found on.
+			text (str): The description of the error.
+		"""
+		self.found.append((line, cError("Syntax Error on line "+str(line)+": "+text)))